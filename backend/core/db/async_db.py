@@ -0,0 +1,128 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.core.db import bulk
+from backend.core.db.db_connector import listen_sqlite_pragmas
+from backend.core.db.db_models import DeclBase
+from backend.core.db.repository import Repository
+from backend.quest_master import settings
+from backend.user_classes.user_profile import UserProfile
+
+
+class AsyncDBConnector:
+    """
+    Asyncio counterpart of `DBConnector` for the ASGI deployment, built on SQLAlchemy's async engine
+    (aiosqlite driver for the local SQLite database). Database work is done by the same sync code
+    (`Repository`, `bulk`), run with `run_sync`, so sync and async paths can not drift apart.
+
+    Args:
+        config (dict, optional): Engine settings, with the same keys as `SQLALCHEMY_DATABASE` settings.
+            Missing keys are taken from settings. Defaults to settings.
+
+    Attributes:
+        engine (AsyncEngine): The SQLAlchemy async engine.
+        Session (async_sessionmaker): Factory of async sessions.
+    """
+
+    def __init__(self, config: dict = None) -> None:
+        """
+        Create the async engine and the session factory.
+
+        Args:
+            config (dict, optional): Engine settings, with the same keys as `SQLALCHEMY_DATABASE` settings.
+                Missing keys are taken from settings. Defaults to settings.
+        """
+        self.config = {**settings.SQLALCHEMY_DATABASE, **(config or {})}
+        url = self.config['ASYNC_URL']
+        self.engine = create_async_engine(
+            url,
+            pool_size=self.config['POOL_SIZE'],
+            max_overflow=self.config['MAX_OVERFLOW'],
+            pool_timeout=self.config['POOL_TIMEOUT'],
+            pool_recycle=self.config['POOL_RECYCLE'],
+            pool_pre_ping=self.config['POOL_PRE_PING'],
+        )
+        if url.startswith('sqlite'):
+            listen_sqlite_pragmas(self.engine.sync_engine, self.config.get('SQLITE_PRAGMAS', {}))
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def create_all(self) -> None:
+        """
+        Create all tables of `db_models`, that do not exist yet.
+        """
+        async with self.engine.begin() as connection:
+            await connection.run_sync(DeclBase.metadata.create_all)
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[AsyncSession]:
+        """
+        Provide a session for one request. The session is committed when the block ends and rolled back if it raises.
+
+        Yields:
+            AsyncSession: The session.
+        """
+        async with self.Session() as session:
+            try:
+                yield session
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+
+    async def load_profile(self, profile_id: int, exp_buffer=None) -> UserProfile:
+        """
+        Load the profile with its stats and tasks (see `Repository.load_profile`).
+
+        Args:
+            profile_id (int): Id of the user_profiles row.
+            exp_buffer (ExpWriteBuffer, optional): Buffer with unwritten exp changes, that are added to the stored exp
+                (the one passed to `complete_task`). Waits for a running flush of the buffer. Defaults to None.
+
+        Returns:
+            UserProfile: The loaded profile.
+        """
+        async with self.session_scope() as session:
+            return await session.run_sync(lambda sync_session: Repository(sync_session).load_profile(profile_id, exp_buffer))
+
+    async def complete_task(self, task_id: int, exp_buffer=None) -> dict:
+        """
+        Complete the task and add its reward to exp of its stats (see `Repository.complete_task`).
+
+        Args:
+            task_id (int): Id of the tasks row.
+            exp_buffer (ExpWriteBuffer, optional): Buffer to add exp changes to, instead of updating stats right away.
+                A full buffer is flushed in the default executor, so the blocking write does not stall the event loop. Defaults to None.
+
+        Returns:
+            dict: A dictionary with the reward, exp changes per stat id and level-up events of the stats.
+        """
+        async with self.session_scope() as session:
+            result = await session.run_sync(lambda sync_session: Repository(sync_session).complete_task(task_id, exp_buffer, flush_exp=False))
+        if exp_buffer is not None and exp_buffer.is_full:
+            await asyncio.get_running_loop().run_in_executor(None, exp_buffer.flush)
+        return result
+
+    async def bulk_insert_tasks(self, rows: Sequence[dict], stat_weights: Sequence[Dict[int, float]] = None,
+                                chunk_size: int = bulk.CHUNK_SIZE) -> List[int]:
+        """
+        Insert many tasks, and optionally their stat weights, in one transaction (see `bulk.bulk_insert_tasks`).
+
+        Args:
+            rows (Sequence[dict]): Column values of the tasks. All rows must have the same keys.
+            stat_weights (Sequence[Dict[int, float]], optional): Stat id -> mult dictionary for every task. Defaults to no weights.
+            chunk_size (int, optional): Rows per statement. Defaults to bulk.CHUNK_SIZE.
+
+        Returns:
+            List[int]: Ids of the inserted tasks, in order of rows.
+        """
+        async with self.engine.begin() as connection:
+            return await connection.run_sync(bulk.bulk_insert_tasks, rows, stat_weights, chunk_size)
+
+    async def dispose(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        await self.engine.dispose()
@@ -0,0 +1,114 @@
+"""
+Compare requests/sec of the sync (thread pool) and async (event loop) database paths under concurrent load.
+
+Usage:
+    python -m backend.core.db.benchmark --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.core.db.async_db import AsyncDBConnector
+from backend.core.db.db_connector import DBConnector
+from backend.core.db.repository import Repository
+from backend.user_classes.stat import Stat
+from backend.user_classes.task import Task
+from backend.user_classes.user_profile import UserProfile
+
+
+def make_profile(task_count: int) -> UserProfile:
+    """
+    Create a profile with a few stats and `task_count` tasks.
+
+    Args:
+        task_count (int): The number of tasks.
+
+    Returns:
+        UserProfile: The profile.
+    """
+    stats = [Stat(name) for name in ('Strength', 'Agility', 'Wisdom', 'Charisma')]
+    tasks = [Task(f'Task {i}', {stats[i % 4]: 0.6, stats[(i + 1) % 4]: 0.4}) for i in range(task_count)]
+    return UserProfile({stat: 0 for stat in stats}, tasks)
+
+
+def run_sync(connector: DBConnector, profile_id: int, requests: int, concurrency: int) -> float:
+    """
+    Load the profile `requests` times from `concurrency` threads.
+
+    Args:
+        connector (DBConnector): The connector to use.
+        profile_id (int): Id of the profile to load.
+        requests (int): The number of requests.
+        concurrency (int): The number of threads.
+
+    Returns:
+        float: Requests per second.
+    """
+    def request(_):
+        with connector.session_scope() as session:
+            Repository(session).load_profile(profile_id)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(request, range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def run_async(connector: AsyncDBConnector, profile_id: int, requests: int, concurrency: int) -> float:
+    """
+    Load the profile `requests` times, with at most `concurrency` requests in flight.
+
+    Args:
+        connector (AsyncDBConnector): The connector to use.
+        profile_id (int): Id of the profile to load.
+        requests (int): The number of requests.
+        concurrency (int): Max number of concurrent requests.
+
+    Returns:
+        float: Requests per second.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request():
+        async with semaphore:
+            await connector.load_profile(profile_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--tasks', type=int, default=50, help='tasks in the loaded profile')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    pool = {'POOL_SIZE': args.concurrency, 'MAX_OVERFLOW': 0}
+    connector = DBConnector({'URL': f'sqlite:///{path}', **pool})
+    connector.create_all()
+    with connector.session_scope() as session:
+        profile_id = Repository(session).add_profile(make_profile(args.tasks))
+
+    sync_rps = run_sync(connector, profile_id, args.requests, args.concurrency)
+    print(f'sync:  {sync_rps:8.1f} requests/s  {connector.pool_metrics()}')
+    connector.dispose()
+
+    async_connector = AsyncDBConnector({'ASYNC_URL': f'sqlite+aiosqlite:///{path}', **pool})
+
+    async def run():
+        try:
+            return await run_async(async_connector, profile_id, args.requests, args.concurrency)
+        finally:
+            await async_connector.dispose()
+
+    print(f'async: {asyncio.run(run()):8.1f} requests/s')
+
+
+if __name__ == '__main__':
+    main()
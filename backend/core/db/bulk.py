@@ -0,0 +1,169 @@
+from typing import Dict, List, Sequence
+
+from sqlalchemy import Table, bindparam, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from backend.core.db.db_models import Stat, StatIip, Task, task_stat_association
+
+# rows per multi-row INSERT statement, so one chunk is one round trip
+CHUNK_SIZE = 1000
+
+_ADD_STAT_EXP = update(Stat.__table__).where(Stat.__table__.c.id == bindparam('stat_id')).values(exp=Stat.__table__.c.exp + bindparam('delta'))
+
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def bulk_insert_tasks(connection: Connection, rows: Sequence[dict], stat_weights: Sequence[Dict[int, float]] = None,
+                      chunk_size: int = CHUNK_SIZE) -> List[int]:
+    """
+    Insert many tasks, and optionally their stat weights, with multi-row INSERT statements.
+
+    Args:
+        connection (Connection): Connection to execute statements on (the caller owns the transaction).
+        rows (Sequence[dict]): Column values of the tasks. All rows must have the same keys.
+        stat_weights (Sequence[Dict[int, float]], optional): Stat id -> mult dictionary for every task. Defaults to no weights.
+        chunk_size (int, optional): Rows per statement. Defaults to CHUNK_SIZE.
+
+    Returns:
+        List[int]: Ids of the inserted tasks, in order of rows.
+
+    Raises:
+        ValueError: If stat_weights and rows have different lengths.
+    """
+    if stat_weights is not None and len(stat_weights) != len(rows):
+        raise ValueError(f'Expected stat weights for {len(rows)} tasks, got {len(stat_weights)}!')
+    ids = _insert_returning_ids(connection, Task.__table__, rows, chunk_size)
+    if stat_weights:
+        bulk_upsert_associations(connection, [{'task': task_id, 'stat': stat_id, 'mult': mult}
+                                              for task_id, weights in zip(ids, stat_weights)
+                                              for stat_id, mult in weights.items()], chunk_size)
+    return ids
+
+
+def bulk_insert_stats(connection: Connection, rows: Sequence[dict], chunk_size: int = CHUNK_SIZE) -> List[int]:
+    """
+    Insert many stats (e.g. starter stats of a new profile) with multi-row INSERT statements.
+
+    Args:
+        connection (Connection): Connection to execute statements on (the caller owns the transaction).
+        rows (Sequence[dict]): Column values of the stats. All rows must have the same keys.
+        chunk_size (int, optional): Rows per statement. Defaults to CHUNK_SIZE.
+
+    Returns:
+        List[int]: Ids of the inserted stats, in order of rows.
+    """
+    return _insert_returning_ids(connection, Stat.__table__, rows, chunk_size)
+
+
+def bulk_insert_stat_tips(connection: Connection, rows: Sequence[dict], chunk_size: int = CHUNK_SIZE) -> List[int]:
+    """
+    Insert many tip catalogs with multi-row INSERT statements.
+
+    Args:
+        connection (Connection): Connection to execute statements on (the caller owns the transaction).
+        rows (Sequence[dict]): Column values of the stat_tips rows. All rows must have the same keys.
+        chunk_size (int, optional): Rows per statement. Defaults to CHUNK_SIZE.
+
+    Returns:
+        List[int]: Ids of the inserted rows, in order of rows.
+    """
+    return _insert_returning_ids(connection, StatIip.__table__, rows, chunk_size)
+
+
+def bulk_upsert_stats(connection: Connection, rows: Sequence[dict], chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Insert stats or update existing ones with the same id, with multi-row INSERT ... ON CONFLICT statements.
+
+    Args:
+        connection (Connection): Connection to execute statements on (the caller owns the transaction).
+        rows (Sequence[dict]): Column values of the stats, including id. All rows must have the same keys.
+        chunk_size (int, optional): Rows per statement. Defaults to CHUNK_SIZE.
+    """
+    _upsert(connection, Stat.__table__, rows, ('id',), chunk_size)
+
+
+def bulk_upsert_associations(connection: Connection, rows: Sequence[dict], chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Insert task_stat_association rows or update mult of existing (task, stat) pairs,
+    with multi-row INSERT ... ON CONFLICT statements.
+
+    Args:
+        connection (Connection): Connection to execute statements on (the caller owns the transaction).
+        rows (Sequence[dict]): Rows with 'task', 'stat' and 'mult' keys.
+        chunk_size (int, optional): Rows per statement. Defaults to CHUNK_SIZE.
+    """
+    _upsert(connection, task_stat_association, rows, ('task', 'stat'), chunk_size)
+
+
+def bulk_add_stat_exp(connection: Connection, deltas: Dict[int, int]) -> None:
+    """
+    Add exp to many stats with one executemany of `exp = exp + :delta` updates, so concurrent changes are not lost.
+
+    Args:
+        connection (Connection): Connection to execute statements on (the caller owns the transaction).
+        deltas (Dict[int, int]): A dictionary mapping stat ids to exp changes.
+    """
+    if deltas:
+        connection.execute(_ADD_STAT_EXP, [{'stat_id': stat_id, 'delta': delta} for stat_id, delta in deltas.items()])
+
+
+def _insert_returning_ids(connection: Connection, table: Table, rows: Sequence[dict], chunk_size: int) -> List[int]:
+    """
+    Insert rows and get their ids (generated ones, or the ones given in rows). SQLAlchemy batches executemany with RETURNING into multi-row INSERTs
+    of `chunk_size` rows.
+
+    Args:
+        connection (Connection): Connection to execute statements on.
+        table (Table): The table to insert into.
+        rows (Sequence[dict]): Column values of the rows.
+        chunk_size (int): Rows per statement.
+
+    Returns:
+        List[int]: Ids of the inserted rows, in order of rows.
+    """
+    if not rows:
+        return []
+    connection = connection.execution_options(insertmanyvalues_page_size=chunk_size)
+    if connection.dialect.name == 'sqlite':
+        # SQLAlchemy can't sort RETURNING rows on SQLite and would insert row by row, but SQLite gives
+        # autoincrement ids in order of VALUES, so sorting the generated ids restores the order of rows.
+        # Explicit ids are returned as given, they can be anywhere between the generated ones
+        ids = connection.execute(insert(table).returning(table.c.id), list(rows)).scalars().all()
+        explicit_ids = [row.get('id') for row in rows]
+        generated_ids = iter(sorted(set(ids).difference(explicit_ids)))
+        return [next(generated_ids) if row_id is None else row_id for row_id in explicit_ids]
+    statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+    return list(connection.execute(statement, list(rows)).scalars())
+
+
+def _upsert(connection: Connection, table: Table, rows: Sequence[dict], keys: Sequence[str], chunk_size: int) -> None:
+    """
+    Insert rows, updating the rest of their columns on conflicting keys.
+
+    Args:
+        connection (Connection): Connection to execute statements on.
+        table (Table): The table to insert into.
+        rows (Sequence[dict]): Column values of the rows.
+        keys (Sequence[str]): Columns of the primary key or unique constraint to check.
+        chunk_size (int): Rows per statement.
+
+    Raises:
+        NotImplementedError: If the database backend has no INSERT ... ON CONFLICT.
+    """
+    if not rows:
+        return
+    try:
+        dialect_insert = _UPSERT_INSERTS[connection.dialect.name]
+    except KeyError:
+        raise NotImplementedError(f'Upsert is not supported for {connection.dialect.name} database!') from None
+    statement = dialect_insert(table)
+    updated = [column for column in rows[0] if column not in keys]
+    if updated:
+        statement = statement.on_conflict_do_update(index_elements=keys, set_={column: statement.excluded[column] for column in updated})
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=keys)
+    connection.execution_options(insertmanyvalues_page_size=chunk_size).execute(statement, list(rows))
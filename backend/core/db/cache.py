@@ -0,0 +1,421 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from backend.core.db import db_models as models
+
+
+class CacheBackend:
+    """
+    Storage of a read-through cache. A backend shared by several workers (e.g. Redis or memcached) should store
+    values in serialized form; cached values are plain dicts and lists for this reason.
+    """
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, object]:
+        """
+        Get values of keys, that are in the cache and not expired.
+
+        Args:
+            keys (Iterable[str]): Keys to look for.
+
+        Returns:
+            dict: Found keys and their values.
+        """
+        raise NotImplementedError
+
+    def set_many(self, values: Dict[str, object], ttl: float) -> None:
+        """
+        Store values.
+
+        Args:
+            values (Dict[str, object]): Keys and values to store.
+            ttl (float): Time to live of the entries in seconds.
+        """
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Drop keys from the cache. Missing keys are ignored.
+
+        Args:
+            keys (Iterable[str]): Keys to drop.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Drop all entries.
+        """
+        raise NotImplementedError
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process backend: an LRU dictionary with a deadline per entry. Least recently used entries are evicted once
+    there are more than `max_entries`, expired entries are dropped when they are read.
+
+    Args:
+        max_entries (int, optional): Max number of entries. Defaults to 1024.
+        clock (Callable[[], float], optional): Time source in seconds. Defaults to time.monotonic.
+
+    Attributes:
+        evictions (int): The number of entries, evicted to make space.
+        expirations (int): The number of entries, dropped after their ttl.
+    """
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize an empty backend.
+
+        Args:
+            max_entries (int, optional): Max number of entries. Defaults to 1024.
+            clock (Callable[[], float], optional): Time source in seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If max_entries is not positive.
+        """
+        if max_entries < 1:
+            raise ValueError(f'Max entries should be positive! Your value: {max_entries}')
+        self.max_entries = max_entries
+        self.clock = clock
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()  # key -> (deadline, value), least recently used first
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, object]:
+        """
+        Get values of keys, that are stored and not expired, marking them as recently used.
+
+        Args:
+            keys (Iterable[str]): Keys to look for.
+
+        Returns:
+            dict: Found keys and their values.
+        """
+        now = self.clock()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, values: Dict[str, object], ttl: float) -> None:
+        """
+        Store values, evicting least recently used entries if there are too many.
+
+        Args:
+            values (Dict[str, object]): Keys and values to store.
+            ttl (float): Time to live of the entries in seconds.
+        """
+        deadline = self.clock() + ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (deadline, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Drop keys from the cache. Missing keys are ignored.
+
+        Args:
+            keys (Iterable[str]): Keys to drop.
+        """
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """
+        Get the number of stored entries (including expired ones, that were not read yet).
+
+        Returns:
+            int: The number of entries.
+        """
+        return len(self._entries)
+
+
+class ReadThroughCache:
+    """
+    Read-through cache: values are taken from the backend, and missing ones are loaded with a loader and stored.
+    Loads, that began before an invalidation of their keys, are returned but not stored, so a value read just before
+    an edit can not be cached after the invalidation.
+
+    Args:
+        backend (CacheBackend, optional): Storage of the entries. Defaults to a new LocalCacheBackend.
+        ttl (float, optional): Time to live of the entries in seconds. Defaults to 300.
+
+    Attributes:
+        hits (int): The number of keys, found in the cache.
+        misses (int): The number of keys, loaded with the loader.
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttl: float = 300) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            backend (CacheBackend, optional): Storage of the entries. Defaults to a new LocalCacheBackend.
+            ttl (float, optional): Time to live of the entries in seconds. Defaults to 300.
+        """
+        self.backend = backend if backend is not None else LocalCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._generation = 0  # number of invalidations
+        self._invalidated = {}  # key -> generation of its last invalidation, kept while older loads run
+        self._loads = Counter()  # generation at the start of a running load -> number of such loads
+
+    def get_many(self, keys: Iterable[str], loader: Callable[[List[str]], Dict[str, object]], ttl: float = None) -> Dict[str, object]:
+        """
+        Get values of keys, loading missing ones with one loader call.
+
+        Args:
+            keys (Iterable[str]): Keys to get.
+            loader (Callable[[List[str]], Dict[str, object]]): Function, that gets the missing keys and returns their values.
+                Keys, that it does not return, are missing in the result and are not cached.
+            ttl (float, optional): Time to live of loaded entries in seconds. Defaults to the ttl of the cache.
+
+        Returns:
+            dict: Keys and their values.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = self.backend.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+            if not missing:
+                return found
+            start = self._generation
+            self._loads[start] += 1
+        loaded = None
+        try:
+            loaded = loader(missing)
+        finally:
+            with self._lock:  # invalidations wait, so none can run between the check and the store
+                if loaded:
+                    fresh = {key: value for key, value in loaded.items() if self._invalidated.get(key, start) <= start}
+                    if fresh:
+                        self.backend.set_many(fresh, self.ttl if ttl is None else ttl)
+                self._loads[start] -= 1
+                if not self._loads[start]:
+                    del self._loads[start]
+                oldest = min(self._loads, default=self._generation)
+                self._invalidated = {key: generation for key, generation in self._invalidated.items() if generation > oldest}
+        if loaded:
+            found.update(loaded)
+        return found
+
+    def get(self, key: str, loader: Callable[[List[str]], Dict[str, object]], ttl: float = None) -> object:
+        """
+        Get the value of the key, loading it if it is missing.
+
+        Args:
+            key (str): The key to get.
+            loader (Callable[[List[str]], Dict[str, object]]): Function, that gets the missing keys and returns their values.
+            ttl (float, optional): Time to live of the loaded entry in seconds. Defaults to the ttl of the cache.
+
+        Returns:
+            object: The value, None if the loader did not return it.
+        """
+        return self.get_many([key], loader, ttl).get(key)
+
+    def invalidate(self, *keys: str) -> None:
+        """
+        Drop keys, so the next read loads them again (e.g. after an edit). Loads of these keys, that are running, are not stored.
+
+        Args:
+            *keys (str): Keys to drop.
+        """
+        with self._lock:
+            self._generation += 1
+            if self._loads:
+                self._invalidated.update(dict.fromkeys(keys, self._generation))
+            self.backend.delete_many(keys)
+
+    def clear(self) -> None:
+        """
+        Drop all entries.
+        """
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """
+        Get the counters of the cache.
+
+        Returns:
+            dict: A dictionary with hits, misses and hit ratio, plus evictions and expirations if the backend counts them.
+        """
+        total = self.hits + self.misses
+        res = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+        for counter in ('evictions', 'expirations'):
+            if hasattr(self.backend, counter):
+                res[counter] = getattr(self.backend, counter)
+        return res
+
+
+class DefinitionCache:
+    """
+    Read-through cache of rarely changed rows: stat definitions (stats row without exp and owner) and tip catalogs
+    (stat_tips row, with tips as the raw JSON document). Edits of these rows should be followed by `invalidate_stat`
+    or `invalidate_stat_tips`. With a session, entries are dropped after it commits: dropping them earlier would let
+    another session cache the old row again before the edit is visible. A load, that read the old row before the commit,
+    is not stored by this process (see `ReadThroughCache`), but with a backend shared by several workers, a load in
+    another worker can still store it, and the old row is then served for up to the cache ttl.
+
+    Args:
+        cache (ReadThroughCache, optional): The cache to use. Defaults to a new in-process cache.
+    """
+    stat_columns = ('display_name', 'icon_base_name', 'tips_id', 'exp_requirement_mult', 'exp_requirement_flat_bonus', 'level_base_requirement')
+    stat_tips_columns = ('min_level', 'max_level', 'tips')
+    raw_json_columns = ('tips',)  # cached as JSON text, parsed lazily by TipCatalog.from_json
+
+    def __init__(self, cache: ReadThroughCache = None) -> None:
+        """
+        Initialize the definition cache.
+
+        Args:
+            cache (ReadThroughCache, optional): The cache to use. Defaults to a new in-process cache.
+        """
+        self.cache = cache if cache is not None else ReadThroughCache()
+
+    def stat_definitions(self, session: Session, stat_ids: Iterable[int]) -> Dict[int, dict]:
+        """
+        Get definitions of stats, loading missing ones in one query.
+
+        Args:
+            session (Session): Session to load missing rows with.
+            stat_ids (Iterable[int]): Ids of stats rows.
+
+        Returns:
+            dict: A dictionary mapping found stat ids to their column values.
+        """
+        return self.__get(session, models.Stat, 'stat', self.stat_columns, stat_ids)
+
+    def stat_tips(self, session: Session, tips_ids: Iterable[int]) -> Dict[int, dict]:
+        """
+        Get tip catalogs, loading missing ones in one query.
+
+        Args:
+            session (Session): Session to load missing rows with.
+            tips_ids (Iterable[int]): Ids of stat_tips rows.
+
+        Returns:
+            dict: A dictionary mapping found stat_tips ids to their column values.
+        """
+        return self.__get(session, models.StatIip, 'stat_tips', self.stat_tips_columns, tips_ids)
+
+    def invalidate_stat(self, *stat_ids: int, session: Session = None) -> None:
+        """
+        Drop cached definitions of edited stats.
+
+        Args:
+            *stat_ids (int): Ids of the edited stats rows.
+            session (Session, optional): Session, that edited the rows. Entries are dropped after it commits. Defaults to dropping them now.
+        """
+        self.__invalidate(session, [f'stat:{stat_id}' for stat_id in stat_ids])
+
+    def invalidate_stat_tips(self, *tips_ids: int, session: Session = None) -> None:
+        """
+        Drop cached tip catalogs, that were edited.
+
+        Args:
+            *tips_ids (int): Ids of the edited stat_tips rows.
+            session (Session, optional): Session, that edited the rows. Entries are dropped after it commits. Defaults to dropping them now.
+        """
+        self.__invalidate(session, [f'stat_tips:{tips_id}' for tips_id in tips_ids])
+
+    def __invalidate(self, session: Optional[Session], keys: List[str]) -> None:
+        """
+        Drop keys now, or after the session commits. Keys of a session, that rolls back, are not dropped.
+
+        Args:
+            session (Session, optional): Session, that edited the rows.
+            keys (List[str]): Keys to drop.
+        """
+        if session is None:
+            self.cache.invalidate(*keys)
+            return
+        pending = session.info.get(_PENDING_INVALIDATIONS)
+        if pending is None:
+            pending = session.info[_PENDING_INVALIDATIONS] = {}
+            event.listen(session, 'after_commit', _invalidate_pending)
+            event.listen(session, 'after_rollback', _discard_pending)
+        pending.setdefault(self, set()).update(keys)
+
+    def __get(self, session: Session, model: type, prefix: str, columns: tuple, row_ids: Iterable[int]) -> Dict[int, dict]:
+        """
+        Get column values of rows through the cache.
+
+        Args:
+            session (Session): Session to load missing rows with.
+            model (type): Model class of the rows.
+            prefix (str): Key prefix of the rows.
+            columns (tuple): Names of the cached columns.
+            row_ids (Iterable[int]): Ids of the rows.
+
+        Returns:
+            dict: A dictionary mapping found row ids to their column values.
+        """
+        def load(keys: List[str]) -> Dict[str, dict]:
+            ids = [int(key.split(':', 1)[1]) for key in keys]
+            selected = (models.raw_json(getattr(model, column)) if column in self.raw_json_columns else getattr(model, column) for column in columns)
+            rows = session.execute(select(model.id, *selected).where(model.id.in_(ids)))
+            return {f'{prefix}:{row[0]}': dict(zip(columns, row[1:])) for row in rows}
+
+        found = self.cache.get_many((f'{prefix}:{row_id}' for row_id in row_ids), load)
+        return {int(key.split(':', 1)[1]): value for key, value in found.items()}
+
+
+_PENDING_INVALIDATIONS = 'definition_cache_invalidations'  # session.info key: DefinitionCache -> keys to drop on commit
+
+
+def _invalidate_pending(session: Session) -> None:
+    """
+    Drop cache keys, that the session edited, once it commits (`after_commit` listener).
+
+    Args:
+        session (Session): The committed session.
+    """
+    pending = session.info[_PENDING_INVALIDATIONS]
+    for definitions, keys in pending.items():
+        definitions.cache.invalidate(*keys)
+    pending.clear()
+
+
+def _discard_pending(session: Session) -> None:
+    """
+    Forget cache keys of a rolled back session, its edits were not written (`after_rollback` listener).
+
+    Args:
+        session (Session): The rolled back session.
+    """
+    session.info[_PENDING_INVALIDATIONS].clear()
@@ -1,5 +1,219 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
+
+from backend.core.db.db_models import DeclBase
+from backend.quest_master import settings
+
+
+class PoolMetrics:
+    """
+    Counters of connection checkouts from a pool: how many there were, how long callers waited for a connection
+    (including opening new ones) and how many gave up after pool timeout.
+    """
+    __slots__ = ('checkouts', 'timeouts', 'total_wait', 'max_wait', '_lock')
+
+    def __init__(self) -> None:
+        """
+        Initialize empty counters.
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        """
+        Record one checkout attempt.
+
+        Args:
+            wait (float): Time spent waiting for the connection, in seconds.
+            timed_out (bool, optional): Whether the attempt ended with pool timeout. Defaults to False.
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def reset(self) -> None:
+        """
+        Set all counters to zero.
+        """
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool, that records checkout waits in `metrics`. Metrics are shared with pools created by `recreate`
+    (e.g. after `engine.dispose()`), so they cover the whole life of the engine.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Initialize the pool with empty metrics.
+
+        Args:
+            *args: Positional arguments of QueuePool.
+            **kwargs: Keyword arguments of QueuePool (pool_size, max_overflow, timeout, ...).
+        """
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        """
+        Check out a connection, recording the wait in metrics.
+
+        Returns:
+            ConnectionPoolEntry: The checked out connection record.
+
+        Raises:
+            PoolTimeoutError: If no connection was available within the pool timeout (recorded as a timeout).
+        """
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> 'MeteredQueuePool':
+        """
+        Create a new pool with the same settings, that shares metrics with this one.
+
+        Returns:
+            MeteredQueuePool: The new pool.
+        """
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def listen_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """
+    Apply SQLite pragmas to every new connection of the engine.
+
+    Args:
+        engine (Engine): The engine (`sync_engine` of an async engine).
+        pragmas (dict): Pragma names and values (e.g. {'journal_mode': 'WAL'}).
+    """
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+    event.listen(engine, 'connect', set_pragmas)
+
 
 class DBConnector:
-    pass
\ No newline at end of file
+    """
+    Owner of the SQLAlchemy engine and sessions for models in `db_models`. Engine uses a QueuePool configured from
+    `SQLALCHEMY_DATABASE` settings, and sessions are scoped per thread, so one request (handled by one thread) works
+    with one session. SQLite connections get pragmas from settings (WAL journal and NORMAL synchronous by default).
+
+    Args:
+        config (dict, optional): Engine settings, with the same keys as `SQLALCHEMY_DATABASE` settings.
+            Missing keys are taken from settings. Defaults to settings.
+
+    Attributes:
+        engine (Engine): The SQLAlchemy engine.
+        Session (scoped_session): Thread-local session registry.
+    """
+
+    def __init__(self, config: dict = None) -> None:
+        """
+        Create the engine and the session registry.
+
+        Args:
+            config (dict, optional): Engine settings, with the same keys as `SQLALCHEMY_DATABASE` settings.
+                Missing keys are taken from settings. Defaults to settings.
+        """
+        self.config = {**settings.SQLALCHEMY_DATABASE, **(config or {})}
+        url = self.config['URL']
+        is_sqlite = url.startswith('sqlite')
+        self.engine = create_engine(
+            url,
+            poolclass=MeteredQueuePool,
+            pool_size=self.config['POOL_SIZE'],
+            max_overflow=self.config['MAX_OVERFLOW'],
+            pool_timeout=self.config['POOL_TIMEOUT'],
+            pool_recycle=self.config['POOL_RECYCLE'],
+            pool_pre_ping=self.config['POOL_PRE_PING'],
+            # pooled SQLite connections are used by many threads, one at a time
+            connect_args={'check_same_thread': False} if is_sqlite else {},
+        )
+        if is_sqlite:
+            listen_sqlite_pragmas(self.engine, self.config.get('SQLITE_PRAGMAS', {}))
+        self.Session = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
+
+    def create_all(self) -> None:
+        """
+        Create all tables of `db_models`, that do not exist yet.
+        """
+        DeclBase.metadata.create_all(self.engine)
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Provide the session of the current request (thread). The session is committed when the block ends,
+        rolled back if it raises, and removed from the registry in both cases, so its connection returns to the pool.
+
+        Yields:
+            Session: The session of the current thread.
+        """
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            self.Session.remove()
+
+    def pool_metrics(self) -> dict:
+        """
+        Get the state of the connection pool and checkout counters.
+
+        Returns:
+            dict: A dictionary with pool size, checked out and overflow connections, number of checkouts and timeouts,
+                and average and maximum wait for a connection (in seconds).
+        """
+        pool = self.engine.pool
+        metrics = pool.metrics
+        attempts = metrics.checkouts + metrics.timeouts
+        return {
+            'pool_size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': pool.overflow(),
+            'checkouts': metrics.checkouts,
+            'timeouts': metrics.timeouts,
+            'average_wait': metrics.total_wait / attempts if attempts else 0.0,
+            'max_wait': metrics.max_wait,
+        }
+
+    def reset_pool_metrics(self) -> None:
+        """
+        Set checkout counters to zero (e.g. before a load test).
+        """
+        self.engine.pool.metrics.reset()
+
+    def dispose(self) -> None:
+        """
+        Remove the current session and close all pooled connections.
+        """
+        self.Session.remove()
+        self.engine.dispose()
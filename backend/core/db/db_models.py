@@ -1,12 +1,18 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import create_engine, ForeignKey, Column, String, Integer, DateTime, Float, Numeric, SmallInteger, BigInteger, JSON, Boolean, CheckConstraint, Table
+from sqlalchemy import create_engine, ForeignKey, Column, String, Integer, DateTime, Float, Numeric, SmallInteger, BigInteger, JSON, Boolean, CheckConstraint, Table, Index, literal_column, text, cast, Text
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.dialects.postgresql import JSONB
 import datetime, json, random
 
+from backend.user_classes.other.enums import TaskStatus
+
 
 DeclBase = declarative_base()
 
+# statuses of tasks, that are not completed (or dropped) yet
+OPEN_TASK_STATUSES = (TaskStatus.IN_PROGRESS, TaskStatus.PAST_DUE)
+_OPEN_TASKS_WHERE = f"status IN ({', '.join(str(status.code) for status in OPEN_TASK_STATUSES)})"
+
 class User(DeclBase):
     __tablename__ = "users"
 
@@ -37,6 +43,7 @@ class StatIip(DeclBase):
 class Stat(DeclBase):
     __tablename__ = "stats"
 
+    id = Column(Integer, primary_key=True)
     display_name = Column(String(64))
     icon_base_name = Column(String(256))
     #TODO: rework to work like get all in tips.stat_id == self.id
@@ -45,9 +52,10 @@ class Stat(DeclBase):
     exp_requirement_flat_bonus = Column(Integer, default=150)
     level_base_requirement = Column(Integer, default=100)
     exp = Column(BigInteger, default=0)
-    asociated_tasks = relationship("Task", secondary="task_stat_association", back_populates='stats')
+    asociated_tasks = relationship("Task", secondary="task_stat_association", back_populates='asociated_stats')
 
     user_profile_id = Column(Integer, ForeignKey('user_profiles.id'))
+    user_profile = relationship('UserProfile', back_populates='asociated_stats')
     
     other_data = Column(JSON, default={})
     
@@ -67,15 +75,17 @@ class Stat(DeclBase):
         CheckConstraint("level_base_requirement <= 999999", name="check_max_level_base_requirement"),
         
         CheckConstraint("exp >= 0", name="check_min_exp"),
-        CheckConstraint("exp <= 999999999999", name="check_max_exp")
+        CheckConstraint("exp <= 999999999999", name="check_max_exp"),
+
+        Index("ix_stats_user_profile_id", "user_profile_id"),
     )
 
 class UserProfile(DeclBase):
     __tablename__ = "user_profiles"
 
     id = Column(Integer, primary_key=True)
-    asociated_tasks = relationship('Task', back_populates='user_profiles')
-    asociated_stats = relationship('Stat', back_populates='user_profiles')
+    asociated_tasks = relationship('Task', back_populates='user_profile')
+    asociated_stats = relationship('Stat', back_populates='user_profile')
     #TODO: finish
 
 class Task(DeclBase):
@@ -83,15 +93,18 @@ class Task(DeclBase):
 
     id = Column(Integer, primary_key=True)
     display_name = Column(String(128), nullable=False)
-    asociated_stats = relationship("Stat", secondary="task_stat_association", back_populates='tasks')
+    asociated_stats = relationship("Stat", secondary="task_stat_association", back_populates='asociated_tasks')
     description = Column(String(30000), default='Add more info about your task')
     difficulty_modifier = Column(Float, default=1.0)
     time_modifier = Column(Float, default=1.0)
     base_exp_reward = Column(Integer, default=10)
     due_date = Column(DateTime)
+    creation_time = Column(DateTime, default=datetime.datetime.now)
     due_date_penalty = Column(Float, default=0.25)
+    status = Column(SmallInteger, nullable=False, default=TaskStatus.IN_PROGRESS.code, index=True)  # TaskStatus.code
 
     user_profile_id = Column(Integer, ForeignKey('user_profiles.id'))
+    user_profile = relationship('UserProfile', back_populates='asociated_tasks')
     other_data = Column(JSON, default={})
 
     __table_args__ = (
@@ -113,6 +126,15 @@ class Task(DeclBase):
 
         CheckConstraint("due_date_penalty >= 0", name="check_min_due_date_penalty"),
         CheckConstraint("due_date_penalty <= 1", name="check_max_due_date_penalty"),
+
+        CheckConstraint(f"status IN ({', '.join(str(status.code) for status in TaskStatus)})", name="check_status_code"),
+
+        Index("ix_tasks_user_profile_id_due_date", "user_profile_id", "due_date"),
+        Index("ix_tasks_user_profile_id_status", "user_profile_id", "status"),
+        # open tasks are a small part of all tasks, so this index stays small (on backends with partial indexes).
+        # SQLite re-checks the index condition on status, so status is stored too, to keep lookups index-only
+        Index("ix_tasks_open_user_profile_id_due_date", "user_profile_id", "due_date", "status",
+              sqlite_where=text(_OPEN_TASKS_WHERE), postgresql_where=text(_OPEN_TASKS_WHERE)),
     )
 
     # Define a foreign key relationship to the Stat table
@@ -121,7 +143,32 @@ class Task(DeclBase):
 task_stat_association = Table(
     'task_stat_association',
     DeclBase.metadata,
-    Column('task', Integer, ForeignKey('task.id')),
-    Column('stat', Integer, ForeignKey('stat.id')), 
-    Column('mult', Numeric(precision=6, scale=5))
-)
\ No newline at end of file
+    Column('task', Integer, ForeignKey('tasks.id'), primary_key=True),
+    Column('stat', Integer, ForeignKey('stats.id'), primary_key=True),
+    Column('mult', Numeric(precision=6, scale=5)),
+    # primary key covers lookups by task
+    Index('ix_task_stat_association_stat', 'stat'),
+)
+
+
+def open_tasks_condition():
+    """
+    Get the condition for tasks, that are not completed yet. Status codes are rendered as literals,
+    so the query planner can match the condition with the partial index on open tasks.
+
+    Returns:
+        ColumnElement: The condition for Task queries.
+    """
+    return Task.status.in_([literal_column(str(status.code)) for status in OPEN_TASK_STATUSES])
+
+def raw_json(column):
+    """
+    Get the JSON column as its text, so the document can be kept and parsed lazily instead of being parsed by the driver.
+
+    Args:
+        column (Column): The JSON column.
+
+    Returns:
+        ColumnElement: The column cast to text.
+    """
+    return cast(column, Text)
\ No newline at end of file
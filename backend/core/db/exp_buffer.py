@@ -0,0 +1,276 @@
+import atexit
+import threading
+from typing import Callable, Dict, Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.core.db.bulk import bulk_add_stat_exp
+from backend.core.db.db_models import Stat
+
+
+class ExpWriteBuffer:
+    """
+    Write-behind buffer for stat exp changes. Deltas are summed per stat id in memory and written as one
+    `exp = exp + :delta` UPDATE per stat, so a burst of task completions costs one write per changed stat.
+
+    Buffer is flushed when it has `max_pending` stats, when the oldest pending delta is `max_delay` seconds old,
+    on `close` and at interpreter exit. Deltas of a failed flush are kept for the next one, except deltas, that the
+    database rejects (e.g. a CHECK constraint): these are dropped and reported in `rejected`, so they can not stall
+    other stats. Reads through `read_exp` and `read_through` include deltas, that are not written yet, so users always
+    see their own changes.
+
+    Args:
+        engine (Engine): Engine to write to (e.g. `DBConnector.engine`).
+        max_pending (int, optional): Number of stats with pending deltas, that triggers a flush. Defaults to 100.
+        max_delay (float, optional): Max age of a pending delta in seconds. Defaults to 5.
+
+    Attributes:
+        rejected (Dict[int, int]): Deltas, that the database rejected, summed per stat id. Cleared by the owner.
+    """
+    def __init__(self, engine: Engine, max_pending: int = 100, max_delay: float = 5) -> None:
+        """
+        Initialize an empty buffer and register the flush at interpreter exit.
+
+        Args:
+            engine (Engine): Engine to write to.
+            max_pending (int, optional): Number of stats with pending deltas, that triggers a flush. Defaults to 100.
+            max_delay (float, optional): Max age of a pending delta in seconds. Defaults to 5.
+        """
+        self.engine = engine
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self._pending: Dict[int, int] = {}
+        self._in_flight: Dict[int, int] = {}  # deltas of the running flush, not committed yet
+        self.rejected: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.RLock()  # reentrant, so readers on one event loop thread do not block each other
+        self._timer = None
+        atexit.register(self.close)
+
+    def add(self, stat_id: int, delta: int) -> None:
+        """
+        Add the exp change for the stat.
+
+        Args:
+            stat_id (int): Id of the stats row.
+            delta (int): The exp change.
+        """
+        self.add_many({stat_id: delta})
+
+    def add_many(self, deltas: Dict[int, int], flush: bool = True) -> None:
+        """
+        Add exp changes for several stats (e.g. deltas of an ExpLedger, mapped to row ids).
+
+        Args:
+            deltas (Dict[int, int]): A dictionary mapping stat ids to exp changes.
+            flush (bool, optional): Whether to flush right away, if the buffer gets full. Callers on an event loop pass False
+                and run `flush` in an executor, when `is_full`. Defaults to True.
+        """
+        with self._lock:
+            for stat_id, delta in deltas.items():
+                self._pending[stat_id] = self._pending.get(stat_id, 0) + delta
+            self.__start_timer()
+            is_full = len(self._pending) >= self.max_pending
+        if is_full and flush:
+            self.flush()
+
+    def add_after_commit(self, session: Session, deltas: Dict[int, int], flush: bool = True) -> None:
+        """
+        Add exp changes once the session commits (e.g. together with the task status, that grants them).
+        Changes of a session, that rolls back, are dropped.
+
+        Args:
+            session (Session): Session, that makes the changes.
+            deltas (Dict[int, int]): A dictionary mapping stat ids to exp changes.
+            flush (bool, optional): Whether to flush right away, if the buffer gets full (see `add_many`). Defaults to True.
+        """
+        pending = session.info.get(_PENDING_DELTAS)
+        if pending is None:
+            pending = session.info[_PENDING_DELTAS] = []
+            event.listen(session, 'after_commit', _add_pending)
+            event.listen(session, 'after_rollback', _discard_pending)
+        pending.append((self, deltas, flush))
+
+    @property
+    def is_full(self) -> bool:
+        """
+        Check if the buffer has `max_pending` stats with pending deltas, so it should be flushed.
+
+        Returns:
+            bool: True if the buffer should be flushed, False otherwise.
+        """
+        with self._lock:
+            return len(self._pending) >= self.max_pending
+
+    def pending(self, stat_id: int) -> int:
+        """
+        Get the exp change of the stat, that is not written yet.
+
+        Args:
+            stat_id (int): Id of the stats row.
+
+        Returns:
+            int: The unwritten exp change (0 if there is none).
+        """
+        with self._lock:
+            return self._pending.get(stat_id, 0) + self._in_flight.get(stat_id, 0)
+
+    def overlay(self, stat_exp: Dict[int, int]) -> Dict[int, int]:
+        """
+        Add unwritten exp changes to exp values, read from the database. A flush may commit between the read and
+        the overlay, use `read_through` to do both consistently.
+
+        Args:
+            stat_exp (Dict[int, int]): A dictionary mapping stat ids to their stored exp.
+
+        Returns:
+            dict: A dictionary mapping stat ids to their current exp.
+        """
+        with self._lock:
+            return {stat_id: exp + self._pending.get(stat_id, 0) + self._in_flight.get(stat_id, 0) for stat_id, exp in stat_exp.items()}
+
+    def read_exp(self, stat_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Read the current exp of stats: stored exp plus unwritten changes.
+
+        Args:
+            stat_ids (Iterable[int]): Ids of the stats rows.
+
+        Returns:
+            dict: A dictionary mapping found stat ids to their current exp.
+        """
+        stat_ids = list(stat_ids)
+
+        def read() -> Dict[int, int]:
+            with self.engine.connect() as connection:
+                return dict(connection.execute(select(Stat.id, Stat.exp).where(Stat.id.in_(stat_ids))).all())
+        return self.read_through(read)
+
+    def read_through(self, read: Callable[[], Dict[int, int]]) -> Dict[int, int]:
+        """
+        Read stored exp and add unwritten exp changes to it. No flush runs between the read and the overlay,
+        so every delta is counted exactly once. The read must begin after the last flush has committed: a read in
+        a transaction, that started before it (e.g. a session, that already ran a query), can miss the written deltas.
+        Reads on one thread do not wait for each other (e.g. coroutines of an event loop), only for a running flush.
+
+        Args:
+            read (Callable[[], Dict[int, int]]): Function, that reads stored exp and returns it by stat id.
+
+        Returns:
+            dict: A dictionary mapping stat ids to their current exp.
+        """
+        with self._flush_lock:  # flushes are done under this lock, so nothing is in flight here
+            return self.overlay(read())
+
+    def flush(self) -> int:
+        """
+        Write all pending deltas in one transaction. If the database rejects the transaction with an integrity error,
+        deltas are written one by one, and the ones, it still rejects, are moved to `rejected`.
+
+        Returns:
+            int: The number of updated stats.
+
+        Raises:
+            SQLAlchemyError: If the write fails for another reason. Unwritten deltas are kept in the buffer in this case.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                self._in_flight, self._pending = self._pending, {}
+            if not self._in_flight:
+                return 0
+            try:
+                try:
+                    with self.engine.begin() as connection:
+                        bulk_add_stat_exp(connection, self._in_flight)
+                    written = len(self._in_flight)
+                except IntegrityError:
+                    written = self.__flush_one_by_one()
+            except BaseException:
+                with self._lock:
+                    for stat_id, delta in self._in_flight.items():
+                        self._pending[stat_id] = self._pending.get(stat_id, 0) + delta
+                    self._in_flight = {}
+                    self.__start_timer()
+                raise
+            with self._lock:
+                self._in_flight = {}
+            return written
+
+    def __flush_one_by_one(self) -> int:
+        """
+        Write in-flight deltas in a transaction per stat, moving rejected ones to `rejected`. Written and rejected
+        deltas are removed from the in-flight ones. Caller holds the flush lock.
+
+        Returns:
+            int: The number of updated stats.
+        """
+        written = 0
+        for stat_id, delta in list(self._in_flight.items()):
+            try:
+                with self.engine.begin() as connection:
+                    bulk_add_stat_exp(connection, {stat_id: delta})
+                written += 1
+            except IntegrityError:
+                with self._lock:
+                    self.rejected[stat_id] = self.rejected.get(stat_id, 0) + delta
+            with self._lock:
+                del self._in_flight[stat_id]
+        return written
+
+    def __start_timer(self) -> None:
+        """
+        Schedule the time triggered flush, if there are pending deltas and it is not scheduled yet. Caller holds the lock.
+        """
+        if self._pending and self._timer is None:
+            self._timer = threading.Timer(self.max_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def close(self) -> None:
+        """
+        Flush pending deltas and stop the timer. Called automatically at interpreter exit.
+        """
+        atexit.unregister(self.close)
+        self.flush()
+
+    def __len__(self) -> int:
+        """
+        Get the number of stats with pending deltas.
+
+        Returns:
+            int: The number of stats.
+        """
+        with self._lock:
+            return len(self._pending)
+
+
+_PENDING_DELTAS = 'exp_buffer_deltas'  # session.info key: (buffer, deltas, flush) to add on commit
+
+
+def _add_pending(session: Session) -> None:
+    """
+    Add exp changes of the session to their buffers, once it commits (`after_commit` listener).
+
+    Args:
+        session (Session): The committed session.
+    """
+    pending = session.info[_PENDING_DELTAS]
+    session.info[_PENDING_DELTAS] = []
+    for buffer, deltas, flush in pending:
+        buffer.add_many(deltas, flush)
+
+
+def _discard_pending(session: Session) -> None:
+    """
+    Drop exp changes of a rolled back session, the changes, that granted them, were not written (`after_rollback` listener).
+
+    Args:
+        session (Session): The rolled back session.
+    """
+    session.info[_PENDING_DELTAS].clear()
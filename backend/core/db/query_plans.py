@@ -0,0 +1,72 @@
+from typing import Dict, List
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+
+from backend.core.db.db_models import Stat, Task, open_tasks_condition, task_stat_association
+from backend.user_classes.other.enums import TaskStatus
+
+# hot query name -> (statement, names of indexes, that the query should use)
+HOT_QUERIES = {
+    'open_tasks_by_due_date': (
+        select(Task.id).where(Task.user_profile_id == 1, open_tasks_condition()).order_by(Task.due_date),
+        ('ix_tasks_open_user_profile_id_due_date',),
+    ),
+    'tasks_by_due_date': (
+        select(Task.id).where(Task.user_profile_id == 1).order_by(Task.due_date),
+        ('ix_tasks_user_profile_id_due_date',),
+    ),
+    'tasks_by_status': (
+        select(Task.id).where(Task.user_profile_id == 1, Task.status == TaskStatus.COMPLETED.code),
+        ('ix_tasks_user_profile_id_status',),
+    ),
+    'profile_stats': (
+        select(Stat.id).where(Stat.user_profile_id == 1),
+        ('ix_stats_user_profile_id',),
+    ),
+    'associations_by_task': (
+        select(task_stat_association).where(task_stat_association.c.task.in_([1, 2, 3])),
+        ('sqlite_autoindex_task_stat_association_1', 'task_stat_association_pkey'),
+    ),
+    'associations_by_stat': (
+        select(task_stat_association).where(task_stat_association.c.stat.in_([1, 2, 3])),
+        ('ix_task_stat_association_stat',),
+    ),
+}
+
+
+def query_plan(connection: Connection, statement) -> List[str]:
+    """
+    Get the query plan of the statement (EXPLAIN QUERY PLAN on SQLite, EXPLAIN on other backends).
+
+    Args:
+        connection (Connection): Connection to the database.
+        statement: The statement to explain.
+
+    Returns:
+        List[str]: Lines of the plan.
+    """
+    compiled = statement.compile(connection, compile_kwargs={'literal_binds': True})
+    if connection.dialect.name == 'sqlite':
+        return [row[-1] for row in connection.execute(text(f'EXPLAIN QUERY PLAN {compiled}'))]
+    return [row[0] for row in connection.execute(text(f'EXPLAIN {compiled}'))]
+
+
+def check_hot_queries(connection: Connection) -> Dict[str, List[str]]:
+    """
+    Check that every hot query uses its index. Plans depend on table statistics (e.g. the partial index on open tasks
+    is preferred only when statistics show that it is smaller), so run the check on a database with representative data
+    after ANALYZE.
+
+    Args:
+        connection (Connection): Connection to the database with the schema of `db_models`.
+
+    Returns:
+        dict: Plans of the queries, that do not use their indexes (empty if all of them do).
+    """
+    failed = {}
+    for name, (statement, indexes) in HOT_QUERIES.items():
+        plan = query_plan(connection, statement)
+        if not any(index in line for line in plan for index in indexes):
+            failed[name] = plan
+    return failed
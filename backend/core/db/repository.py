@@ -0,0 +1,448 @@
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.core.db import db_models as models
+from backend.core.db.bulk import bulk_add_stat_exp, bulk_insert_stat_tips, bulk_insert_stats, bulk_insert_tasks
+from backend.core.db.cache import DefinitionCache
+from backend.user_classes.exp_ledger import ExpLedger
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.stat import Stat
+from backend.user_classes.stat_tips import StatTips
+from backend.user_classes.tip_catalog import TipCatalog
+from backend.user_classes.task import Task
+from backend.user_classes.user_profile import UserProfile
+
+
+class Repository:
+    """
+    Maps rows of `db_models` to `backend.user_classes` objects and back, for one session.
+
+    Repository keeps an identity map: every row is mapped to exactly one domain object, so a Stat, shared by
+    many tasks, is one Stat object in all their asociated_stat dictionaries. Already mapped objects are reused as is,
+    without refreshing them from the database. Profiles are loaded with a fixed number of queries (stats, tip catalogs,
+    tasks and their stat weights), regardless of the number of tasks and stats. With definitions, only exp and owner
+    of stats are read from the stats table, definitions and tip catalogs come from the cache.
+
+    Args:
+        session (Session): The session to work in (e.g. from `DBConnector.session_scope`).
+        definitions (DefinitionCache, optional): Cache of tip catalogs and stat definitions, shared between sessions. Defaults to no cache.
+    """
+
+    def __init__(self, session: Session, definitions: DefinitionCache = None) -> None:
+        """
+        Initialize the repository with an empty identity map.
+
+        Args:
+            session (Session): The session to work in.
+            definitions (DefinitionCache, optional): Cache of tip catalogs and stat definitions, shared between sessions. Defaults to no cache.
+        """
+        self.session = session
+        self.definitions = definitions
+        self._objects = {}  # (model, row id) -> domain object
+        self._row_ids = {}  # id(domain object) -> (domain object, row id), objects are kept alive to keep their ids unique
+
+    def get(self, model: type, row_id: int) -> Optional[object]:
+        """
+        Get the domain object, mapped to the row.
+
+        Args:
+            model (type): Model class of the row (e.g. db_models.Stat).
+            row_id (int): Id of the row.
+
+        Returns:
+            object: The mapped object, None if the row is not mapped yet.
+        """
+        return self._objects.get((model, row_id))
+
+    def id_of(self, obj: object) -> Optional[int]:
+        """
+        Get the row id of the domain object.
+
+        Args:
+            obj (object): A Stat, StatTips or Task object.
+
+        Returns:
+            int: Id of the row, None if the object is not mapped.
+        """
+        entry = self._row_ids.get(id(obj))
+        return entry[1] if entry else None
+
+    def load_profile(self, profile_id: int, exp_buffer=None) -> UserProfile:
+        """
+        Load the profile with its stats (and their tips) and tasks (with stat weights) in four queries.
+
+        Args:
+            profile_id (int): Id of the user_profiles row.
+            exp_buffer (ExpWriteBuffer, optional): Buffer with unwritten exp changes, that are added to the stored exp. Defaults to None.
+
+        Returns:
+            UserProfile: The loaded profile. Its stat_exp has the exp of every stat of the profile.
+        """
+        association = models.task_stat_association
+        profile_task_ids = select(models.Task.id).where(models.Task.user_profile_id == profile_id)
+        stat_rows = []
+
+        def read_exp() -> Dict[int, int]:
+            # stats of the profile and stats, that its tasks are weighted by
+            stat_rows.extend(self.__select_stat_rows(or_(models.Stat.user_profile_id == profile_id,
+                                                         models.Stat.id.in_(select(association.c.stat).where(association.c.task.in_(profile_task_ids))))))
+            return {row.id: row.exp for row in stat_rows}
+
+        exp = exp_buffer.read_through(read_exp) if exp_buffer is not None else read_exp()
+        self.__map_stat_rows(stat_rows, exp)
+
+        task_rows = self.session.execute(select(models.Task).where(models.Task.user_profile_id == profile_id).order_by(models.Task.id)).scalars().all()
+        weights: Dict[int, Dict[Stat, float]] = {row.id: {} for row in task_rows}
+        for task_id, stat_id, mult in self.session.execute(select(association.c.task, association.c.stat, association.c.mult)
+                                                           .where(association.c.task.in_(profile_task_ids))):
+            weights[task_id][self.get(models.Stat, stat_id)] = float(mult)
+        tasks = []
+        for row in task_rows:
+            task = self.get(models.Task, row.id)
+            if task is None:
+                task = self.task_from_row(row, weights[row.id])
+                self.__register(models.Task, row.id, task)
+            tasks.append(task)
+
+        stat_exp = {self.get(models.Stat, row.id): exp[row.id] for row in stat_rows if row.user_profile_id == profile_id}
+        return UserProfile(stat_exp, tasks)
+
+    def load_task(self, task_id: int, exp_buffer=None) -> Task:
+        """
+        Get the task with its stat weights, loading it (with stats and their tips, that are not mapped yet) if it is not mapped.
+
+        Args:
+            task_id (int): Id of the tasks row.
+            exp_buffer (ExpWriteBuffer, optional): Buffer with unwritten exp changes, that are added to the stored exp of loaded stats. Defaults to None.
+
+        Returns:
+            Task: The task.
+
+        Raises:
+            ValueError: If there is no task with this id.
+        """
+        task = self.get(models.Task, task_id)
+        if task is not None:
+            return task
+        row = self.session.get(models.Task, task_id)
+        if row is None:
+            raise ValueError(f'Task with id {task_id} does not exist!')
+        association = models.task_stat_association
+        weights = self.session.execute(select(association.c.stat, association.c.mult).where(association.c.task == task_id)).all()
+        missing = [stat_id for stat_id, _ in weights if self.get(models.Stat, stat_id) is None]
+        if missing:
+            stat_rows = []
+
+            def read_exp() -> Dict[int, int]:
+                stat_rows.extend(self.__select_stat_rows(models.Stat.id.in_(missing)))
+                return {row.id: row.exp for row in stat_rows}
+
+            exp = exp_buffer.read_through(read_exp) if exp_buffer is not None else read_exp()
+            self.__map_stat_rows(stat_rows, exp)
+        task = self.task_from_row(row, {self.get(models.Stat, stat_id): float(mult) for stat_id, mult in weights})
+        self.__register(models.Task, task_id, task)
+        return task
+
+    def complete_task(self, task_id: int, exp_buffer=None, flush_exp: bool = True) -> dict:
+        """
+        Complete the task and add its reward, split over stat weights, to exp of the stats.
+
+        Args:
+            task_id (int): Id of the tasks row.
+            exp_buffer (ExpWriteBuffer, optional): Buffer to add exp changes to, instead of updating stats right away. Stats are
+                loaded with its unwritten changes, and the changes of this task are added once the session commits. Defaults to None.
+            flush_exp (bool, optional): Whether a full exp_buffer may be flushed in this call (see `ExpWriteBuffer.add_many`). Defaults to True.
+
+        Returns:
+            dict: A dictionary with the reward, exp changes per stat id and level-up events of the stats (see `Stat.add_exp`).
+
+        Raises:
+            ValueError: If there is no task with this id.
+            TaskAlreadyCompletedError: If the task was already completed.
+        """
+        task = self.load_task(task_id, exp_buffer)
+        reward = task.complete_task()
+        split = ExpLedger.split_reward(reward, task.asociated_stat)
+        events = []
+        for stat, delta in split.items():
+            events.extend(stat.add_exp(delta))
+        deltas = {self.id_of(stat): delta for stat, delta in split.items()}
+        self.session.execute(update(models.Task).where(models.Task.id == task_id).values(status=task.status.code))
+        if exp_buffer is not None:
+            exp_buffer.add_after_commit(self.session, deltas, flush_exp)
+        else:
+            bulk_add_stat_exp(self.session.connection(), deltas)
+        return {
+            'reward': reward,
+            'stat_exp': deltas,
+            'events': events,
+        }
+
+    def add_profile(self, profile: UserProfile) -> int:
+        """
+        Insert the profile with its stats, tip catalogs and tasks, using bulk inserts. Objects are added to the identity map.
+        Stats and tip catalogs, that are already mapped, are referenced instead of being inserted again.
+
+        Args:
+            profile (UserProfile): The profile to insert.
+
+        Returns:
+            int: Id of the new user_profiles row.
+        """
+        connection = self.session.connection()
+        profile_id = connection.execute(insert(models.UserProfile).returning(models.UserProfile.id)).scalar_one()
+
+        stats = {id(stat): stat for stat in profile.stat_exp}
+        for task in profile.tasks:
+            stats.update((id(stat), stat) for stat in task.asociated_stat)
+        new_stats = [stat for stat in stats.values() if self.id_of(stat) is None]
+
+        new_tips = list({id(stat.tips): stat.tips for stat in new_stats if self.id_of(stat.tips) is None}.values())
+        for tips, tips_id in zip(new_tips, bulk_insert_stat_tips(connection, [self.stat_tips_row(tips) for tips in new_tips])):
+            self.__register(models.StatIip, tips_id, tips)
+
+        rows = [self.stat_row(stat, profile.stat_exp.get(stat, stat.exp)) for stat in new_stats]
+        for row in rows:
+            row['user_profile_id'] = profile_id
+        for stat, stat_id in zip(new_stats, bulk_insert_stats(connection, rows)):
+            self.__register(models.Stat, stat_id, stat)
+
+        tasks = [task for task in profile.tasks if self.id_of(task) is None]
+        rows = [self.task_row(task) for task in tasks]
+        for row in rows:
+            row['user_profile_id'] = profile_id
+        task_ids = bulk_insert_tasks(connection, rows, [{self.id_of(stat): mult for stat, mult in task.asociated_stat.items()} for task in tasks])
+        for task, task_id in zip(tasks, task_ids):
+            self.__register(models.Task, task_id, task)
+        return profile_id
+
+    def update_stat(self, stat: Stat) -> None:
+        """
+        Write the definition (name, icon and level curve) of the mapped Stat to its row. Its cached definition is invalidated,
+        when the session commits.
+
+        Args:
+            stat (Stat): The edited Stat.
+
+        Raises:
+            ValueError: If the Stat is not mapped.
+        """
+        stat_id = self.__require_id(stat)
+        row = self.stat_row(stat)
+        del row['exp']
+        self.session.execute(update(models.Stat).where(models.Stat.id == stat_id).values(**row))
+        if self.definitions is not None:
+            self.definitions.invalidate_stat(stat_id, session=self.session)
+
+    def update_stat_tips(self, tips: StatTips) -> None:
+        """
+        Write the mapped StatTips to its row. Its cached catalog is invalidated, when the session commits.
+
+        Args:
+            tips (StatTips): The edited StatTips.
+
+        Raises:
+            ValueError: If the StatTips is not mapped.
+        """
+        tips_id = self.__require_id(tips)
+        self.session.execute(update(models.StatIip).where(models.StatIip.id == tips_id).values(**self.stat_tips_row(tips)))
+        if self.definitions is not None:
+            self.definitions.invalidate_stat_tips(tips_id, session=self.session)
+
+    def stat_row(self, stat: Stat, exp: int = None) -> dict:
+        """
+        Convert the Stat to column values of a stats row.
+
+        Args:
+            stat (Stat): The Stat to convert.
+            exp (int, optional): Experience to store. Defaults to exp of the Stat.
+
+        Returns:
+            dict: Column values of the row.
+        """
+        return {
+            'display_name': stat.display_name,
+            'icon_base_name': stat.icon_base_name,
+            'tips_id': self.id_of(stat.tips),
+            'exp_requirement_mult': stat.exp_requirement_mult,
+            'exp_requirement_flat_bonus': stat.exp_requirement_flat_bonus,
+            'level_base_requirement': stat.level_base_requirement,
+            'exp': stat.exp if exp is None else exp,
+        }
+
+    @staticmethod
+    def stat_tips_row(tips: StatTips) -> dict:
+        """
+        Convert the StatTips to column values of a stat_tips row.
+
+        Args:
+            tips (StatTips): The StatTips to convert.
+
+        Returns:
+            dict: Column values of the row. Tips are stored as a JSON object, levels without tips are omitted.
+        """
+        return {
+            'min_level': tips.min_level,
+            'max_level': tips.max_level,
+            'tips': {str(level): tip_list for level, tip_list in tips.tips.items() if tip_list},
+        }
+
+    @staticmethod
+    def task_row(task: Task) -> dict:
+        """
+        Convert the Task to column values of a tasks row (stat weights are stored in task_stat_association).
+
+        Args:
+            task (Task): The Task to convert.
+
+        Returns:
+            dict: Column values of the row.
+        """
+        return {
+            'display_name': task.display_name,
+            'description': task.description,
+            'difficulty_modifier': task.difficulty_modifier,
+            'time_modifier': task.time_modifier,
+            'base_exp_reward': task.base_exp_reward,
+            'due_date': task.due_date,
+            'creation_time': task.creation_time,
+            'due_date_penalty': task.due_date_penalty,
+            'status': task.status.code,
+        }
+
+    @staticmethod
+    def stat_from_row(row: models.Stat, tips: StatTips = None, exp: int = None) -> Stat:
+        """
+        Create a Stat from a stats row.
+
+        Args:
+            row (models.Stat): The row.
+            tips (StatTips, optional): Tips of the Stat. Defaults to empty tips.
+            exp (int, optional): Current exp of the Stat. Defaults to the stored exp.
+
+        Returns:
+            Stat: The created Stat.
+        """
+        return Stat.from_trusted_row(row.display_name, row.icon_base_name, tips, row.exp_requirement_mult,
+                                     row.exp_requirement_flat_bonus, row.level_base_requirement, row.exp if exp is None else exp)
+
+    @staticmethod
+    def stat_tips_from_row(row: dict) -> StatTips:
+        """
+        Create a StatTips from column values of a stat_tips row.
+
+        Args:
+            row (dict): Column values of the row (min_level, max_level and tips). Tips can be a parsed dictionary
+                or the raw JSON document, which is parsed lazily (see `TipCatalog.from_json`).
+
+        Returns:
+            StatTips: The created StatTips.
+        """
+        if isinstance(row['tips'], str):
+            return StatTips.from_catalog(TipCatalog.from_json(row['tips'], row['min_level'], row['max_level']))
+        return StatTips({int(level): tip_list for level, tip_list in (row['tips'] or {}).items()}, row['min_level'], row['max_level'])
+
+    @staticmethod
+    def task_from_row(row: models.Task, asociated_stat: Dict[Stat, float]) -> Task:
+        """
+        Create a Task from a tasks row.
+
+        Args:
+            row (models.Task): The row.
+            asociated_stat (Dict[Stat, float]): Stat weights of the task.
+
+        Returns:
+            Task: The created Task.
+        """
+        return Task.from_trusted_row(row.display_name, asociated_stat, row.description, row.difficulty_modifier, row.time_modifier,
+                                     row.base_exp_reward, row.due_date, row.due_date_penalty, row.creation_time, TaskStatus.from_code(row.status))
+
+    def __select_stat_rows(self, condition) -> list:
+        """
+        Select stats rows. With definitions, only id, exp and owner are selected, the rest is added by `__map_stat_rows`.
+
+        Args:
+            condition (ColumnElement): The WHERE condition.
+
+        Returns:
+            list: The selected rows.
+        """
+        if self.definitions is None:
+            return self.session.execute(select(models.Stat).where(condition)).scalars().all()
+        return self.session.execute(select(models.Stat.id, models.Stat.exp, models.Stat.user_profile_id).where(condition)).all()
+
+    def __map_stat_rows(self, stat_rows: list, exp: Dict[int, int] = None) -> None:
+        """
+        Map stats rows, that are not mapped yet, loading their definitions (if cached) and tip catalogs in one query each.
+
+        Args:
+            stat_rows (list): Rows of the stats table (from `__select_stat_rows`).
+            exp (Dict[int, int], optional): Current exp by stat id, if it differs from the stored one. Defaults to None.
+        """
+        if self.definitions is not None:
+            definitions = self.definitions.stat_definitions(self.session, [row.id for row in stat_rows if self.get(models.Stat, row.id) is None])
+            stat_rows = [SimpleNamespace(**row._asdict(), **definitions[row.id]) for row in stat_rows if row.id in definitions]
+        self.__load_stat_tips({row.tips_id for row in stat_rows if row.tips_id is not None and self.get(models.StatIip, row.tips_id) is None})
+        for row in stat_rows:
+            if self.get(models.Stat, row.id) is None:
+                self.__register(models.Stat, row.id, self.stat_from_row(row, self.get(models.StatIip, row.tips_id), (exp or {}).get(row.id)))
+
+    def __load_stat_tips(self, tips_ids: set) -> None:
+        """
+        Load and map tip catalogs in one query.
+
+        Args:
+            tips_ids (set): Ids of stat_tips rows, that are not mapped yet.
+        """
+        if not tips_ids:
+            return
+        if self.definitions is not None:
+            rows = self.definitions.stat_tips(self.session, tips_ids)
+        else:
+            columns = (models.StatIip.id, models.StatIip.min_level, models.StatIip.max_level, models.raw_json(models.StatIip.tips))
+            rows = {row[0]: {'min_level': row[1], 'max_level': row[2], 'tips': row[3]}
+                    for row in self.session.execute(select(*columns).where(models.StatIip.id.in_(tips_ids)))}
+        for tips_id, row in rows.items():
+            self.__register(models.StatIip, tips_id, self.stat_tips_from_row(row))
+
+    def __require_id(self, obj: object) -> int:
+        """
+        Get the row id of the mapped object.
+
+        Args:
+            obj (object): A Stat, StatTips or Task object.
+
+        Returns:
+            int: Id of the row.
+
+        Raises:
+            ValueError: If the object is not mapped.
+        """
+        row_id = self.id_of(obj)
+        if row_id is None:
+            raise ValueError(f'{type(obj).__name__} object is not mapped to a row!')
+        return row_id
+
+    def __register(self, model: type, row_id: int, obj: object) -> None:
+        """
+        Add the object to the identity map.
+
+        Args:
+            model (type): Model class of the row.
+            row_id (int): Id of the row.
+            obj (object): The domain object.
+        """
+        self._objects[(model, row_id)] = obj
+        self._row_ids[id(obj)] = (obj, row_id)
+
+    def __len__(self) -> int:
+        """
+        Get the number of mapped objects.
+
+        Returns:
+            int: The number of objects in the identity map.
+        """
+        return len(self._objects)
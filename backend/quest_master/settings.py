@@ -80,6 +80,23 @@ DATABASES = {
     }
 }
 
+# SQLAlchemy engine of core.db.DBConnector (pool sizes are per process)
+SQLALCHEMY_DATABASE = {
+    'URL': f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+    # same database for core.db.async_db.AsyncDBConnector (ASGI deployment)
+    'ASYNC_URL': f"sqlite+aiosqlite:///{BASE_DIR / 'db.sqlite3'}",
+    'POOL_SIZE': 5,
+    'MAX_OVERFLOW': 10,
+    'POOL_TIMEOUT': 30,
+    'POOL_RECYCLE': 1800,
+    'POOL_PRE_PING': True,
+    # applied to every new SQLite connection
+    'SQLITE_PRAGMAS': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
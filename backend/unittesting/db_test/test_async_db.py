@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+
+from backend.core.db.async_db import AsyncDBConnector
+from backend.user_classes.other.enums import TaskStatus
+
+@pytest.fixture
+def url(tmp_path):
+    return f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite3'}"
+
+def run(url, work):
+    async def main():
+        connector = AsyncDBConnector({'ASYNC_URL': url})
+        try:
+            await connector.create_all()
+            return await work(connector)
+        finally:
+            await connector.dispose()
+    return asyncio.run(main())
+
+def test_bulk_insert_and_load(url):
+    async def work(connector):
+        from sqlalchemy import insert
+        from backend.core.db import db_models as models
+        async with connector.engine.begin() as connection:
+            profile_id = (await connection.execute(insert(models.UserProfile).returning(models.UserProfile.id))).scalar_one()
+            stat_id = (await connection.execute(insert(models.Stat).values(display_name='Strength', user_profile_id=profile_id)
+                                                .returning(models.Stat.id))).scalar_one()
+        task_ids = await connector.bulk_insert_tasks([{'display_name': f'Task {i}', 'user_profile_id': profile_id} for i in range(5)],
+                                                     [{stat_id: 1}] * 5)
+        result = await connector.complete_task(task_ids[0])
+        profile = await connector.load_profile(profile_id)
+        return task_ids, result, profile
+    task_ids, result, profile = run(url, work)
+    assert len(task_ids) == 5
+    assert [task.display_name for task in profile.tasks] == [f'Task {i}' for i in range(5)]
+    assert profile.tasks[0].status == TaskStatus.COMPLETED
+    assert list(profile.stat_exp.values()) == [result['reward']]
+
+def test_complete_task_flushes_off_loop(url, tmp_path):
+    from sqlalchemy import create_engine
+    from backend.core.db.exp_buffer import ExpWriteBuffer
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.sqlite3'}")
+    buffer = ExpWriteBuffer(engine, max_pending=1, max_delay=60)
+    flush_threads = []
+    flush = buffer.flush
+    def record_flush():
+        flush_threads.append(threading.get_ident())
+        return flush()
+    buffer.flush = record_flush
+    async def work(connector):
+        from sqlalchemy import insert
+        from backend.core.db import db_models as models
+        async with connector.engine.begin() as connection:
+            profile_id = (await connection.execute(insert(models.UserProfile).returning(models.UserProfile.id))).scalar_one()
+            stat_id = (await connection.execute(insert(models.Stat).values(display_name='Strength', user_profile_id=profile_id)
+                                                .returning(models.Stat.id))).scalar_one()
+        task_ids = await connector.bulk_insert_tasks([{'display_name': 'Task', 'user_profile_id': profile_id}], [{stat_id: 1}])
+        result = await connector.complete_task(task_ids[0], buffer)
+        profile = await connector.load_profile(profile_id)
+        return threading.get_ident(), result, profile
+    try:
+        loop_thread, result, profile = run(url, work)
+    finally:
+        buffer.close()
+        engine.dispose()
+    assert flush_threads[0] != loop_thread
+    assert len(buffer) == 0
+    assert list(profile.stat_exp.values()) == [result['reward']]
+
+def test_load_profile_with_exp_buffer(url, tmp_path):
+    from sqlalchemy import create_engine
+    from backend.core.db.exp_buffer import ExpWriteBuffer
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.sqlite3'}")
+    buffer = ExpWriteBuffer(engine, max_delay=60)
+    async def work(connector):
+        from sqlalchemy import insert
+        from backend.core.db import db_models as models
+        async with connector.engine.begin() as connection:
+            profile_id = (await connection.execute(insert(models.UserProfile).returning(models.UserProfile.id))).scalar_one()
+            stat_id = (await connection.execute(insert(models.Stat).values(display_name='Strength', user_profile_id=profile_id)
+                                                .returning(models.Stat.id))).scalar_one()
+        task_ids = await connector.bulk_insert_tasks([{'display_name': f'Task {i}', 'user_profile_id': profile_id} for i in range(2)],
+                                                     [{stat_id: 1}] * 2)
+        rewards = [(await connector.complete_task(task_id, buffer))['reward'] for task_id in task_ids]
+        # concurrent buffered reads on the loop thread must not wait for each other
+        profiles = await asyncio.wait_for(asyncio.gather(*(connector.load_profile(profile_id, buffer) for _ in range(3))), 10)
+        unbuffered = await connector.load_profile(profile_id)
+        return rewards, profiles, unbuffered
+    try:
+        rewards, profiles, unbuffered = run(url, work)
+        assert len(buffer) == 1
+    finally:
+        buffer.close()
+        engine.dispose()
+    for profile in profiles:
+        assert list(profile.stat_exp.values()) == [sum(rewards)]
+    assert list(unbuffered.stat_exp.values()) == [0]
+
+def test_pragmas(url):
+    async def work(connector):
+        from sqlalchemy import text
+        async with connector.engine.connect() as connection:
+            return (await connection.execute(text('PRAGMA journal_mode'))).scalar()
+    assert run(url, work) == 'wal'
@@ -0,0 +1,80 @@
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import event, select
+
+from backend.core.db.bulk import bulk_insert_stats, bulk_insert_tasks, bulk_upsert_associations, bulk_upsert_stats
+from backend.core.db.db_connector import DBConnector
+from backend.core.db.db_models import Stat, Task, task_stat_association
+
+@pytest.fixture
+def connector(tmp_path):
+    connector = DBConnector({'URL': f"sqlite:///{tmp_path / 'test.sqlite3'}"})
+    connector.create_all()
+    yield connector
+    connector.dispose()
+
+@pytest.fixture
+def statements(connector):
+    executed = []
+    def count(connection, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    event.listen(connector.engine, 'before_cursor_execute', count)
+    yield executed
+    event.remove(connector.engine, 'before_cursor_execute', count)
+
+def test_insert_stats_returns_ids_in_order(connector):
+    with connector.engine.begin() as connection:
+        ids = bulk_insert_stats(connection, [{'display_name': name} for name in ['Strength', 'Agility', 'Wisdom']])
+        names = dict(connection.execute(select(Stat.id, Stat.display_name)).all())
+    assert [names[stat_id] for stat_id in ids] == ['Strength', 'Agility', 'Wisdom']
+
+def test_insert_stats_with_explicit_ids(connector):
+    with connector.engine.begin() as connection:
+        ids = bulk_insert_stats(connection, [{'display_name': 'Strength', 'id': None}, {'display_name': 'Agility', 'id': 50},
+                                             {'display_name': 'Wisdom', 'id': None}, {'display_name': 'Charisma', 'id': 7}])
+        names = dict(connection.execute(select(Stat.id, Stat.display_name)).all())
+    assert ids[1] == 50 and ids[3] == 7
+    assert [names[stat_id] for stat_id in ids] == ['Strength', 'Agility', 'Wisdom', 'Charisma']
+
+def test_insert_tasks_in_chunks(connector, statements):
+    with connector.engine.begin() as connection:
+        stat_ids = bulk_insert_stats(connection, [{'display_name': 'Strength'}, {'display_name': 'Agility'}])
+        statements.clear()
+        rows = [{'display_name': f'Task {i}', 'base_exp_reward': i} for i in range(2500)]
+        weights = [{stat_ids[0]: 0.5, stat_ids[1]: 0.5}] * 2500
+        ids = bulk_insert_tasks(connection, rows, weights, chunk_size=1000)
+        rewards = dict(connection.execute(select(Task.id, Task.base_exp_reward)).all())
+        association_count = len(connection.execute(select(task_stat_association)).all())
+    assert [rewards[task_id] for task_id in ids] == list(range(2500))
+    assert association_count == 5000
+    task_inserts = [statement for statement in statements if statement.startswith('INSERT INTO tasks')]
+    assert len(task_inserts) == 3
+
+def test_insert_tasks_checks_weights(connector):
+    with connector.engine.begin() as connection:
+        with pytest.raises(ValueError):
+            bulk_insert_tasks(connection, [{'display_name': 'Task 1'}], [])
+
+def test_upsert_associations_updates_mult(connector):
+    with connector.engine.begin() as connection:
+        stat_id, = bulk_insert_stats(connection, [{'display_name': 'Strength'}])
+        task_id, = bulk_insert_tasks(connection, [{'display_name': 'Task 1'}], [{stat_id: 0.5}])
+        bulk_upsert_associations(connection, [{'task': task_id, 'stat': stat_id, 'mult': 1}])
+        rows = connection.execute(select(task_stat_association)).all()
+    assert len(rows) == 1
+    assert rows[0].mult == 1
+
+def test_upsert_stats(connector):
+    with connector.engine.begin() as connection:
+        stat_id, = bulk_insert_stats(connection, [{'display_name': 'Strength', 'exp': 10}])
+        bulk_upsert_stats(connection, [{'id': stat_id, 'display_name': 'Strength', 'exp': 50},
+                                       {'id': stat_id + 1, 'display_name': 'Agility', 'exp': 0}])
+        rows = dict(connection.execute(select(Stat.display_name, Stat.exp)).all())
+    assert rows == {'Strength': 50, 'Agility': 0}
+
+def test_empty_rows(connector):
+    with connector.engine.begin() as connection:
+        assert bulk_insert_tasks(connection, []) == []
+        bulk_upsert_associations(connection, [])
@@ -0,0 +1,179 @@
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import event
+
+from backend.core.db.cache import DefinitionCache, LocalCacheBackend, ReadThroughCache
+from backend.core.db.db_connector import DBConnector
+from backend.core.db.repository import Repository
+from backend.user_classes.stat import Stat
+from backend.user_classes.stat_tips import StatTips
+from backend.user_classes.task import Task
+from backend.user_classes.user_profile import UserProfile
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cache(clock):
+    return ReadThroughCache(LocalCacheBackend(max_entries=2, clock=clock), ttl=10)
+
+def loader(calls):
+    def load(keys):
+        calls.append(list(keys))
+        return {key: key.upper() for key in keys if key != 'missing'}
+    return load
+
+def test_read_through(cache):
+    calls = []
+    assert cache.get_many(['a', 'b'], loader(calls)) == {'a': 'A', 'b': 'B'}
+    assert cache.get('a', loader(calls)) == 'A'
+    assert calls == [['a', 'b']]
+    assert cache.get('missing', loader(calls)) is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 3
+
+def test_lru_eviction(cache):
+    calls = []
+    cache.get_many(['a', 'b'], loader(calls))
+    cache.get('a', loader(calls))  # b is least recently used now
+    cache.get('c', loader(calls))
+    assert cache.stats()['evictions'] == 1
+    cache.get('a', loader(calls))
+    assert calls[-1] == ['c']
+    cache.get('b', loader(calls))
+    assert calls[-1] == ['b']
+
+def test_ttl(cache, clock):
+    calls = []
+    cache.get('a', loader(calls))
+    clock.now = 5
+    cache.get('a', loader(calls), ttl=1)
+    assert len(calls) == 1
+    clock.now = 10
+    cache.get('a', loader(calls))
+    assert len(calls) == 2
+    assert cache.stats()['expirations'] == 1
+
+def test_invalidate(cache):
+    calls = []
+    cache.get('a', loader(calls))
+    cache.invalidate('a', 'not cached')
+    cache.get('a', loader(calls))
+    assert len(calls) == 2
+
+def test_invalidate_during_load(cache):
+    calls = []
+    def stale_loader(keys):
+        calls.append(list(keys))
+        if len(calls) == 1:
+            cache.invalidate('a')  # the row was edited and committed, while the old value was being read
+            return {key: 'old' for key in keys}
+        return {key: 'new' for key in keys}
+    assert cache.get('a', stale_loader) == 'old'
+    assert cache.get('a', stale_loader) == 'new'
+    assert cache.get('a', stale_loader) == 'new'
+    assert len(calls) == 2
+
+def test_max_entries_validation():
+    with pytest.raises(ValueError):
+        LocalCacheBackend(max_entries=0)
+
+@pytest.fixture
+def connector(tmp_path):
+    connector = DBConnector({'URL': f"sqlite:///{tmp_path / 'test.sqlite3'}"})
+    connector.create_all()
+    yield connector
+    connector.dispose()
+
+def test_repository_uses_cached_tips(connector):
+    stat = Stat("Strength", tips=StatTips({1: ["Lift"]}))
+    definitions = DefinitionCache()
+    with connector.session_scope() as session:
+        profile_id = Repository(session).add_profile(UserProfile({stat: 0}, [Task("Sample Task", {stat: 1})]))
+
+    selects = []
+    event.listen(connector.engine, 'before_cursor_execute', lambda *args: selects.append(args[2]) if 'stat_tips' in args[2] else None)
+    for _ in range(3):
+        with connector.session_scope() as session:
+            loaded = Repository(session, definitions).load_profile(profile_id)
+    assert len(selects) == 1
+    assert next(iter(loaded.stat_exp)).tips.tips[1] == ["Lift"]
+    assert definitions.cache.stats()['hits'] == 4  # stat definition and tip catalog of the second and third load
+
+    with connector.session_scope() as session:
+        repository = Repository(session, definitions)
+        tips = next(iter(repository.load_profile(profile_id).stat_exp)).tips
+        tips.append({1: ["Squat"]})
+        repository.update_stat_tips(tips)
+    with connector.session_scope() as session:
+        loaded = Repository(session, definitions).load_profile(profile_id)
+    assert next(iter(loaded.stat_exp)).tips.tips[1] == ["Lift", "Squat"]
+
+def test_stat_definitions(connector):
+    stat = Stat("Strength")
+    definitions = DefinitionCache()
+    with connector.session_scope() as session:
+        repository = Repository(session, definitions)
+        profile_id = repository.add_profile(UserProfile({stat: 0}, []))
+        stat_id = repository.id_of(stat)
+        assert definitions.stat_definitions(session, [stat_id])[stat_id]['display_name'] == 'Strength'
+    with connector.session_scope() as session:
+        repository = Repository(session, definitions)
+        stat = next(iter(repository.load_profile(profile_id).stat_exp))
+        stat.display_name = 'Power'
+        repository.update_stat(stat)
+        with connector.session_scope() as other_session:
+            # not committed yet: other sessions still see (and cache) the old row
+            assert definitions.stat_definitions(other_session, [stat_id])[stat_id]['display_name'] == 'Strength'
+    with connector.session_scope() as session:
+        assert definitions.stat_definitions(session, [stat_id])[stat_id]['display_name'] == 'Power'
+
+def test_rolled_back_edit_keeps_cache(connector):
+    stat = Stat("Strength")
+    definitions = DefinitionCache()
+    with connector.session_scope() as session:
+        repository = Repository(session, definitions)
+        profile_id = repository.add_profile(UserProfile({stat: 0}, []))
+        stat_id = repository.id_of(stat)
+    with connector.session_scope() as session:
+        definitions.stat_definitions(session, [stat_id])
+    with pytest.raises(RuntimeError):
+        with connector.session_scope() as session:
+            repository = Repository(session, definitions)
+            stat = next(iter(repository.load_profile(profile_id).stat_exp))
+            stat.display_name = 'Power'
+            repository.update_stat(stat)
+            raise RuntimeError
+    assert definitions.cache.backend.get_many([f'stat:{stat_id}'])[f'stat:{stat_id}']['display_name'] == 'Strength'
+
+def test_load_profile_uses_cached_definitions(connector):
+    strength = Stat("Strength", tips=StatTips({1: ["Lift"]}), exp_requirement_mult=1.5)
+    definitions = DefinitionCache()
+    with connector.session_scope() as session:
+        profile_id = Repository(session).add_profile(UserProfile({strength: 30}, [Task("Sample Task", {strength: 1})]))
+
+    selects = []
+    count = lambda *args: selects.append(args[2]) if args[2].startswith('SELECT') else None
+    event.listen(connector.engine, 'before_cursor_execute', count)
+    try:
+        for _ in range(2):
+            selects.clear()
+            with connector.session_scope() as session:
+                loaded = Repository(session, definitions).load_profile(profile_id)
+        assert len(selects) == 3  # stats exp, tasks and stat weights; definitions and tips are cached
+    finally:
+        event.remove(connector.engine, 'before_cursor_execute', count)
+    stat, exp = next(iter(loaded.stat_exp.items()))
+    assert (stat.display_name, stat.exp_requirement_mult, stat.exp, exp) == ('Strength', 1.5, 30, 30)
+    assert stat.tips.tips[1] == ["Lift"]
+    assert loaded.tasks[0].asociated_stat == {stat: 1}
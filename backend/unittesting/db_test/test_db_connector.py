@@ -0,0 +1,78 @@
+import threading
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import text
+
+from backend.core.db.db_connector import DBConnector
+from backend.core.db.db_models import Stat
+
+@pytest.fixture
+def connector(tmp_path):
+    connector = DBConnector({'URL': f"sqlite:///{tmp_path / 'test.sqlite3'}", 'POOL_SIZE': 2, 'MAX_OVERFLOW': 1, 'POOL_TIMEOUT': 0.2})
+    connector.create_all()
+    yield connector
+    connector.dispose()
+
+def test_sqlite_pragmas(connector):
+    with connector.engine.connect() as connection:
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert connection.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+
+def test_pool_config(connector):
+    pool = connector.engine.pool
+    assert pool.size() == 2
+    assert pool._max_overflow == 1
+    assert pool._pre_ping
+
+def test_session_scope_commits(connector):
+    with connector.session_scope() as session:
+        session.add(Stat(display_name='Strength'))
+    with connector.session_scope() as session:
+        assert session.query(Stat).one().display_name == 'Strength'
+
+def test_session_scope_rolls_back(connector):
+    with pytest.raises(RuntimeError):
+        with connector.session_scope() as session:
+            session.add(Stat(display_name='Strength'))
+            session.flush()
+            raise RuntimeError()
+    with connector.session_scope() as session:
+        assert session.query(Stat).count() == 0
+
+def test_session_per_thread(connector):
+    sessions = []
+    def worker():
+        with connector.session_scope() as session:
+            sessions.append(session)
+    with connector.session_scope() as session:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        assert connector.Session() is session
+    assert sessions[0] is not session
+
+def test_pool_metrics(connector):
+    connector.reset_pool_metrics()
+    connections = [connector.engine.connect() for _ in range(3)]
+    metrics = connector.pool_metrics()
+    assert metrics['checked_out'] == 3
+    assert metrics['overflow'] == 1
+    assert metrics['checkouts'] == 3
+
+    with pytest.raises(sqlalchemy.exc.TimeoutError):
+        connector.engine.connect()
+    metrics = connector.pool_metrics()
+    assert metrics['timeouts'] == 1
+    assert metrics['max_wait'] >= 0.2
+    for connection in connections:
+        connection.close()
+    assert connector.pool_metrics()['checked_out'] == 0
+
+def test_metrics_survive_dispose(connector):
+    connector.engine.connect().close()
+    checkouts = connector.pool_metrics()['checkouts']
+    connector.engine.dispose()
+    connector.engine.connect().close()
+    assert connector.pool_metrics()['checkouts'] == checkouts + 1
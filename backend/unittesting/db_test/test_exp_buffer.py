@@ -0,0 +1,112 @@
+import threading
+import time
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import event, select
+
+from backend.core.db.bulk import bulk_insert_stats
+from backend.core.db.db_connector import DBConnector
+from backend.core.db.db_models import Stat
+from backend.core.db.exp_buffer import ExpWriteBuffer
+
+@pytest.fixture
+def connector(tmp_path):
+    connector = DBConnector({'URL': f"sqlite:///{tmp_path / 'test.sqlite3'}"})
+    connector.create_all()
+    yield connector
+    connector.dispose()
+
+@pytest.fixture
+def stat_ids(connector):
+    with connector.engine.begin() as connection:
+        return bulk_insert_stats(connection, [{'display_name': 'Strength', 'exp': 100}, {'display_name': 'Agility', 'exp': 0}])
+
+@pytest.fixture
+def buffer(connector):
+    buffer = ExpWriteBuffer(connector.engine, max_pending=10, max_delay=60)
+    yield buffer
+    buffer.close()
+
+def stored_exp(connector):
+    with connector.engine.connect() as connection:
+        return dict(connection.execute(select(Stat.id, Stat.exp)).all())
+
+def test_coalesced_flush(connector, stat_ids, buffer):
+    updates = []
+    event.listen(connector.engine, 'before_cursor_execute', lambda *args: updates.append(args[2]) if args[2].startswith('UPDATE') else None)
+    for _ in range(20):
+        buffer.add(stat_ids[0], 10)
+        buffer.add(stat_ids[1], 5)
+    assert len(buffer) == 2
+    assert stored_exp(connector) == {stat_ids[0]: 100, stat_ids[1]: 0}
+    assert buffer.flush() == 2
+    assert len(updates) == 1  # one executemany for all stats
+    assert stored_exp(connector) == {stat_ids[0]: 300, stat_ids[1]: 100}
+    assert len(buffer) == 0
+
+def test_read_your_writes(connector, stat_ids, buffer):
+    buffer.add_many({stat_ids[0]: 50})
+    assert buffer.pending(stat_ids[0]) == 50
+    assert buffer.read_exp(stat_ids) == {stat_ids[0]: 150, stat_ids[1]: 0}
+    buffer.flush()
+    assert buffer.read_exp(stat_ids) == {stat_ids[0]: 150, stat_ids[1]: 0}
+
+def test_size_trigger(connector, stat_ids):
+    buffer = ExpWriteBuffer(connector.engine, max_pending=2, max_delay=60)
+    buffer.add(stat_ids[0], 1)
+    assert len(buffer) == 1
+    buffer.add(stat_ids[1], 1)
+    assert len(buffer) == 0
+    assert stored_exp(connector) == {stat_ids[0]: 101, stat_ids[1]: 1}
+    buffer.close()
+
+def test_time_trigger(connector, stat_ids):
+    buffer = ExpWriteBuffer(connector.engine, max_delay=0.05)
+    buffer.add(stat_ids[0], 1)
+    for _ in range(100):
+        if not len(buffer) and stored_exp(connector)[stat_ids[0]] == 101:
+            break
+        time.sleep(0.01)
+    assert stored_exp(connector)[stat_ids[0]] == 101
+    buffer.close()
+
+def test_rejected_deltas_are_isolated(connector, stat_ids, buffer):
+    buffer.add(stat_ids[0], -1000)  # violates exp >= 0 check
+    buffer.add(stat_ids[1], 5)
+    assert buffer.flush() == 1
+    assert buffer.rejected == {stat_ids[0]: -1000}
+    assert len(buffer) == 0
+    assert stored_exp(connector) == {stat_ids[0]: 100, stat_ids[1]: 5}
+    buffer.add(stat_ids[0], 1)
+    assert buffer.flush() == 1
+    assert stored_exp(connector)[stat_ids[0]] == 101
+
+def test_failed_flush_keeps_deltas(connector, stat_ids, buffer, monkeypatch):
+    def fail(connection, deltas):
+        raise sqlalchemy.exc.OperationalError('UPDATE', {}, Exception('database is locked'))
+    buffer.add(stat_ids[0], 10)
+    with monkeypatch.context() as patch:
+        patch.setattr('backend.core.db.exp_buffer.bulk_add_stat_exp', fail)
+        with pytest.raises(sqlalchemy.exc.OperationalError):
+            buffer.flush()
+    assert buffer.pending(stat_ids[0]) == 10
+    buffer.flush()
+    assert stored_exp(connector)[stat_ids[0]] == 110
+
+def test_reads_during_flush(connector, stat_ids, buffer):
+    for _ in range(50):
+        buffer.add_many({stat_ids[0]: 1, stat_ids[1]: 2})
+        reads = []
+        reader = threading.Thread(target=lambda: reads.extend(buffer.read_exp(stat_ids) for _ in range(20)))
+        reader.start()
+        buffer.flush()
+        reader.join()
+        assert len(set(tuple(sorted(read.items())) for read in reads)) == 1  # a delta is never lost or counted twice
+
+def test_close_flushes(connector, stat_ids):
+    buffer = ExpWriteBuffer(connector.engine)
+    buffer.add(stat_ids[1], 7)
+    buffer.close()
+    assert stored_exp(connector)[stat_ids[1]] == 7
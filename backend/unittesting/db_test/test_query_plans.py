@@ -0,0 +1,43 @@
+import datetime
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import inspect, text
+
+from backend.core.db.bulk import bulk_insert_stats, bulk_insert_tasks
+from backend.core.db.db_connector import DBConnector
+from backend.core.db.query_plans import HOT_QUERIES, check_hot_queries, query_plan
+
+@pytest.fixture
+def connector(tmp_path):
+    connector = DBConnector({'URL': f"sqlite:///{tmp_path / 'test.sqlite3'}"})
+    connector.create_all()
+    # most tasks are completed, like in a long used database
+    with connector.engine.begin() as connection:
+        stat_ids = bulk_insert_stats(connection, [{'display_name': f'Stat {i}', 'user_profile_id': i % 20} for i in range(100)])
+        bulk_insert_tasks(connection, [{'display_name': f'Task {i}', 'user_profile_id': i % 20, 'status': 0 if i % 7 == 0 else 1,
+                                        'due_date': datetime.datetime(2030, 1, 1) + datetime.timedelta(hours=i)} for i in range(2000)],
+                          [{stat_ids[i % 100]: 1} for i in range(2000)])
+        connection.execute(text('ANALYZE'))
+    yield connector
+    connector.dispose()
+
+def test_indexes_created(connector):
+    inspector = inspect(connector.engine)
+    task_indexes = {index['name'] for index in inspector.get_indexes('tasks')}
+    assert {'ix_tasks_user_profile_id_due_date', 'ix_tasks_user_profile_id_status', 'ix_tasks_open_user_profile_id_due_date'} <= task_indexes
+    assert 'ix_stats_user_profile_id' in {index['name'] for index in inspector.get_indexes('stats')}
+    assert 'ix_task_stat_association_stat' in {index['name'] for index in inspector.get_indexes('task_stat_association')}
+
+def test_hot_queries_use_indexes(connector):
+    with connector.engine.connect() as connection:
+        assert check_hot_queries(connection) == {}
+
+def test_open_tasks_use_partial_index(connector):
+    statement, _ = HOT_QUERIES['open_tasks_by_due_date']
+    with connector.engine.connect() as connection:
+        plan = query_plan(connection, statement)
+    assert any('ix_tasks_open_user_profile_id_due_date' in line for line in plan)
+    # ordered by the index, no sorting step
+    assert not any('TEMP B-TREE' in line for line in plan)
@@ -0,0 +1,181 @@
+import datetime
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import event
+
+from backend.core.db import db_models as models
+from backend.core.db.db_connector import DBConnector
+from backend.core.db.exp_buffer import ExpWriteBuffer
+from backend.core.db.repository import Repository
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.stat import Stat
+from backend.user_classes.stat_tips import StatTips
+from backend.user_classes.task import Task
+from backend.user_classes.user_profile import UserProfile
+
+@pytest.fixture
+def connector(tmp_path):
+    connector = DBConnector({'URL': f"sqlite:///{tmp_path / 'test.sqlite3'}"})
+    connector.create_all()
+    yield connector
+    connector.dispose()
+
+@pytest.fixture
+def statements(connector):
+    executed = []
+    def count(connection, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    event.listen(connector.engine, 'before_cursor_execute', count)
+    yield executed
+    event.remove(connector.engine, 'before_cursor_execute', count)
+
+def make_profile(task_count):
+    strength = Stat("Strength", tips=StatTips({1: ["Lift"], 2: ["Lift more"]}), exp=250)
+    agility = Stat("Agility", exp_requirement_mult=1.5)
+    tasks = [Task(f"Sample Task {i}", {strength: 0.7, agility: 0.3}, base_exp_reward=10 + i,
+                  due_date=datetime.datetime(2030, 1, 1) + datetime.timedelta(days=i)) for i in range(task_count)]
+    tasks[0].status = TaskStatus.PAST_DUE
+    return UserProfile({strength: 250, agility: 40}, tasks)
+
+def save(connector, profile):
+    with connector.session_scope() as session:
+        return Repository(session).add_profile(profile)
+
+def test_round_trip(connector):
+    profile = make_profile(3)
+    profile_id = save(connector, profile)
+    with connector.session_scope() as session:
+        loaded = Repository(session).load_profile(profile_id)
+
+    assert {stat.display_name: exp for stat, exp in loaded.stat_exp.items()} == {'Strength': 250, 'Agility': 40}
+    strength = next(stat for stat in loaded.stat_exp if stat.display_name == 'Strength')
+    assert strength.tips.tips[2] == ["Lift more"]
+    assert strength.exp == 250
+    for task, copy in zip(profile.tasks, loaded.tasks):
+        for field in ['display_name', 'description', 'difficulty_modifier', 'time_modifier', 'base_exp_reward', 'due_date', 'creation_time', 'status']:
+            assert getattr(task, field) == getattr(copy, field)
+        assert {stat.display_name: mult for stat, mult in copy.asociated_stat.items()} == {'Strength': 0.7, 'Agility': 0.3}
+
+def test_identity_map(connector):
+    profile_id = save(connector, make_profile(3))
+    with connector.session_scope() as session:
+        repository = Repository(session)
+        loaded = repository.load_profile(profile_id)
+        stats = [{id(stat) for stat in task.asociated_stat} for task in loaded.tasks]
+        assert stats[0] == stats[1] == stats[2] == {id(stat) for stat in loaded.stat_exp}
+        again = repository.load_profile(profile_id)
+        assert [id(task) for task in again.tasks] == [id(task) for task in loaded.tasks]
+        task = loaded.tasks[0]
+        assert repository.get(models.Task, repository.id_of(task)) is task
+
+def test_fixed_number_of_queries(connector, statements):
+    for task_count in [2, 50]:
+        profile_id = save(connector, make_profile(task_count))
+        with connector.session_scope() as session:
+            statements.clear()
+            loaded = Repository(session).load_profile(profile_id)
+            assert len(loaded.tasks) == task_count
+            assert len([statement for statement in statements if statement.startswith('SELECT')]) == 4
+
+def test_add_profile_reuses_mapped_stats(connector):
+    with connector.session_scope() as session:
+        repository = Repository(session)
+        profile = make_profile(2)
+        repository.add_profile(profile)
+        stat = next(iter(profile.stat_exp))
+        stat_id = repository.id_of(stat)
+        repository.add_profile(UserProfile({}, [Task("Other Task", {stat: 1})]))
+        assert repository.id_of(stat) == stat_id
+        assert session.query(models.Stat).count() == 2
+
+def test_complete_task(connector):
+    profile = make_profile(2)
+    profile_id = save(connector, profile)
+    with connector.session_scope() as session:
+        repository = Repository(session)
+        task_id = repository.id_of(repository.load_profile(profile_id).tasks[1])
+    with connector.session_scope() as session:
+        result = Repository(session).complete_task(task_id)
+    assert result['reward'] == sum(result['stat_exp'].values())
+    with connector.session_scope() as session:
+        loaded = Repository(session).load_profile(profile_id)
+    assert loaded.tasks[1].status == TaskStatus.COMPLETED
+    levels = {stat.display_name: stat.level for stat in profile.stat_exp}
+    assert result['events'] == [{'display_name': stat.display_name, 'level': level, 'icon_name': stat.get_icon_name_from_level(level)}
+                                for stat in loaded.stat_exp for level in range(max(levels[stat.display_name], 0) + 1, stat.level + 1)]
+    assert {stat.display_name: exp for stat, exp in loaded.stat_exp.items()} == {'Strength': 250 + round(result['reward'] * 0.7), 'Agility': 40 + round(result['reward'] * 0.3)}
+    with connector.session_scope() as session:
+        with pytest.raises(ValueError):
+            Repository(session).complete_task(task_id + 100)
+
+def test_complete_tasks_with_exp_buffer(connector):
+    stat = Stat("Strength")
+    tasks = [Task(f"Sample Task {i}", {stat: 1}, base_exp_reward=80) for i in range(3)]
+    profile_id = save(connector, UserProfile({stat: 0}, tasks))
+    with connector.session_scope() as session:
+        repository = Repository(session)
+        task_ids = [repository.id_of(task) for task in repository.load_profile(profile_id).tasks]
+    reference = Stat("Strength")
+    buffer = ExpWriteBuffer(connector.engine, max_delay=60)
+    try:
+        events = []
+        for task_id in task_ids:
+            with connector.session_scope() as session:
+                result = Repository(session).complete_task(task_id, buffer)
+            assert result['events'] == reference.add_exp(result['reward'])
+            events.extend(result['events'])
+        assert len(buffer) == 1
+        with connector.session_scope() as session:
+            loaded = Repository(session).load_profile(profile_id, buffer)
+    finally:
+        buffer.close()
+    assert events and events[-1]['level'] == reference.level
+    assert list(loaded.stat_exp.values()) == [reference.exp]
+
+def test_rolled_back_completion_keeps_exp(connector):
+    profile_id = save(connector, make_profile(2))
+    with connector.session_scope() as session:
+        repository = Repository(session)
+        task_id = repository.id_of(repository.load_profile(profile_id).tasks[1])
+    buffer = ExpWriteBuffer(connector.engine, max_delay=60)
+    try:
+        with pytest.raises(RuntimeError):
+            with connector.session_scope() as session:
+                Repository(session).complete_task(task_id, buffer)
+                raise RuntimeError
+        assert len(buffer) == 0
+    finally:
+        buffer.close()
+    with connector.session_scope() as session:
+        assert Repository(session).load_task(task_id).status == TaskStatus.IN_PROGRESS
+
+def test_shared_tip_catalog(connector):
+    profile_id = save(connector, make_profile(2))
+    loaded = []
+    for _ in range(2):
+        with connector.session_scope() as session:
+            profile = Repository(session).load_profile(profile_id)
+            loaded.append(next(stat for stat in profile.stat_exp if stat.display_name == 'Strength').tips)
+    assert loaded[0] is not loaded[1]
+    assert loaded[0].catalog is loaded[1].catalog
+    assert loaded[0].get_tip_for_level(2) == 'You have reached level 2! That means that: Lift more'
+
+def test_load_profile_with_exp_buffer(connector):
+    profile_id = save(connector, make_profile(2))
+    buffer = ExpWriteBuffer(connector.engine, max_delay=60)
+    try:
+        with connector.session_scope() as session:
+            repository = Repository(session)
+            task_id = repository.id_of(repository.load_profile(profile_id).tasks[1])
+        with connector.session_scope() as session:
+            result = Repository(session).complete_task(task_id, buffer)
+        assert len(buffer) == 2
+        with connector.session_scope() as session:
+            loaded = Repository(session).load_profile(profile_id, buffer)
+        expected = {'Strength': 250 + round(result['reward'] * 0.7), 'Agility': 40 + round(result['reward'] * 0.3)}
+        assert {stat.display_name: exp for stat, exp in loaded.stat_exp.items()} == expected
+        assert {stat.display_name: stat.exp for stat in loaded.stat_exp} == expected
+    finally:
+        buffer.close()
@@ -0,0 +1,36 @@
+import datetime
+import pytest
+from backend.user_classes.due_date_scheduler import DueDateScheduler
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.stat import Stat
+from backend.user_classes.task import Task
+
+@pytest.fixture
+def now():
+    return datetime.datetime.now()
+
+@pytest.fixture
+def sample_tasks(now):
+    stat_dict = {Stat("Sample Stat"): 1}
+    return [Task(f"Sample Task {i}", stat_dict, due_date=now + datetime.timedelta(days=days)) for i, days in enumerate([3, 1, 10, 5])]
+
+def test_advance(sample_tasks, now):
+    scheduler = DueDateScheduler(sample_tasks + [Task("No Due Date", {Stat("Sample Stat"): 1})])
+    assert len(scheduler) == 4
+    assert scheduler.advance(now) == []
+    assert scheduler.advance(now + datetime.timedelta(days=4)) == [sample_tasks[1], sample_tasks[0]]
+    assert sample_tasks[0].status == sample_tasks[1].status == TaskStatus.PAST_DUE
+    assert sample_tasks[3].status == TaskStatus.IN_PROGRESS
+    assert len(scheduler) == 2
+    assert scheduler.next_due_date() == sample_tasks[3].due_date
+
+def test_due_date_change_and_completion(sample_tasks, now):
+    scheduler = DueDateScheduler(sample_tasks)
+    sample_tasks[2].due_date = now + datetime.timedelta(hours=1)
+    sample_tasks[1].complete_task()
+    assert sample_tasks[1] not in scheduler
+    assert scheduler.advance(now + datetime.timedelta(days=4)) == [sample_tasks[2], sample_tasks[0]]
+    assert sample_tasks[1].status == TaskStatus.COMPLETED
+    assert scheduler.advance(now + datetime.timedelta(days=20)) == [sample_tasks[3]]
+    assert len(scheduler) == 0
+    assert scheduler.next_due_date() is None
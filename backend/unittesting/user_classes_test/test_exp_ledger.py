@@ -0,0 +1,43 @@
+import pytest
+from backend.user_classes.exp_ledger import ExpLedger
+from backend.user_classes.stat import Stat
+from backend.user_classes.task import Task
+from backend.user_classes.user_profile import UserProfile
+
+@pytest.fixture
+def sample_stats():
+    return [Stat("Sample Stat"), Stat("Sample Stat2"), Stat("Sample Stat3")]
+
+def test_split_reward(sample_stats):
+    stat1, stat2, stat3 = sample_stats
+    assert ExpLedger.split_reward(10, {stat1: 0.7, stat2: 0.3}) == {stat1: 7, stat2: 3}
+    # remainder goes to the largest fractional part
+    assert ExpLedger.split_reward(11, {stat1: 0.7, stat2: 0.3}) == {stat1: 8, stat2: 3}
+    # ties are broken by id name, regardless of order
+    assert ExpLedger.split_reward(10, {stat2: 0.5, stat1: 0.5, }) == {stat1: 5, stat2: 5}
+    assert ExpLedger.split_reward(1, {stat2: 0.5, stat1: 0.5}) == {stat1: 1, stat2: 0}
+    assert ExpLedger.split_reward(1, {stat3: 1/3, stat2: 1/3, stat1: 1/3}) == {stat1: 1, stat2: 0, stat3: 0}
+    assert sum(ExpLedger.split_reward(10, {stat1: 0.2, stat2: 0.2}).values()) == 4
+
+def test_apply(sample_stats):
+    stat1, stat2, stat3 = sample_stats
+    profile = UserProfile({stat1: 100}, [])
+    ledger = ExpLedger()
+    for _ in range(5):
+        ledger.add_completion(Task("Sample Task", {stat1: 0.7, stat2: 0.3}), 11)
+    ledger.add(stat3, 5)
+    assert ledger.deltas == {stat1: 40, stat2: 15, stat3: 5}
+    assert ledger.apply(profile) == {stat1: 140, stat2: 15, stat3: 5}
+    assert profile.stat_exp == {stat1: 140, stat2: 15, stat3: 5}
+    assert len(ledger) == 0
+
+def test_apply_out_of_bounds(sample_stats):
+    stat1, stat2, _ = sample_stats
+    profile = UserProfile({stat1: 100, stat2: 100}, [])
+    ledger = ExpLedger()
+    ledger.add(stat1, 10)
+    ledger.add(stat2, -200)
+    with pytest.raises(ValueError):
+        ledger.apply(profile)
+    assert profile.stat_exp == {stat1: 100, stat2: 100}
+    assert len(ledger) == 2
@@ -0,0 +1,53 @@
+import pickle
+from fractions import Fraction
+import pytest
+
+from backend.user_classes.level_curve import LevelCurve
+from backend.user_classes.stat import Stat
+
+
+@pytest.fixture
+def test_curve():
+    return LevelCurve(level_base_requirement=100, exp_requirement_mult=1.2, exp_requirement_flat_bonus=100)
+
+def test_interning(test_curve):
+    assert LevelCurve(100, 1.2, 100) is test_curve
+    assert LevelCurve(100, 1.2, 101) is not test_curve
+    assert pickle.loads(pickle.dumps(test_curve)) is test_curve
+
+def test_replace(test_curve):
+    curve = test_curve.replace(exp_requirement_flat_bonus=150)
+    assert curve.exp_requirement_flat_bonus == 150
+    assert curve.exp_requirement_mult == test_curve.exp_requirement_mult
+    assert curve.replace(exp_requirement_flat_bonus=100) is test_curve
+
+def test_shared_between_stats(test_curve):
+    stat1 = Stat('Stat One', exp_requirement_mult=1.2, exp_requirement_flat_bonus=100, level_base_requirement=100)
+    stat2 = Stat('Stat Two', exp_requirement_mult=1.2, exp_requirement_flat_bonus=100, level_base_requirement=100)
+    assert stat1.level_curve is stat2.level_curve is test_curve
+    assert stat1.level_curve.thresholds is stat2.level_curve.thresholds
+
+    stat2.exp_requirement_flat_bonus = 50
+    assert stat2.level_curve is not test_curve
+    assert stat1.level_curve is test_curve
+
+def test_exp_to_level(test_curve):
+    assert test_curve.exp_to_level(10) == {'level': 0, 'min_exp': 0, 'max_exp': 99}
+    assert test_curve.exp_to_level(1620)['level'] == 11
+    assert test_curve.exp_to_level(1620)['min_exp'] == test_curve.bounds_for_level(11)[0]
+
+def test_exact_thresholds():
+    curve = LevelCurve(100, 1.3, 150)
+    for level in [60, 200, 3000]:
+        expected = round(Fraction(100) * Fraction(13, 10)**(level-1) / 10) * 10 + 150 * (level-1)
+        assert curve.min_exp(level) == expected
+
+def test_unbounded_levels():
+    curve = LevelCurve(100, 1.00001, 1)
+    for exp in [10**6, 999999999999]:
+        res = curve.exp_to_level(exp)
+        assert res['level'] > curve.table_max_level
+        assert curve.min_exp(res['level']) == res['min_exp'] <= exp <= res['max_exp'] == curve.min_exp(res['level']+1) - 1
+    # curve, that does not grow, has no levels above the first requirement
+    assert LevelCurve(100, 1, 0).exp_to_level(10**9)['level'] == -1
+    assert LevelCurve(100, 1, 10).exp_to_level(10**9)['level'] == 1 + (10**9 - 100) // 10
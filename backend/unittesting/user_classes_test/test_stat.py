@@ -43,4 +43,59 @@ def test_get_icon_name_from_level(test_stat):
     expected_results = ['magic_skill_0', 'magic_skill_0', 'magic_skill_1', 'magic_skill_1', 'magic_skill_2']
 
     for level, expected in zip(levels, expected_results):
-        assert test_stat.get_icon_name_from_level(level) == expected
\ No newline at end of file
+        assert test_stat.get_icon_name_from_level(level) == expected
+
+def test_exp_to_level_after_curve_change(test_stat):
+    assert test_stat.exp_to_level(1620) == 11
+    test_stat.level_base_requirement = 200
+    assert test_stat.exp_to_level(150) == 0
+    assert test_stat.bounds_for_level(1) == (200, 339)
+    test_stat.exp_requirement_flat_bonus = 0
+    assert test_stat.bounds_for_level(1) == (200, 239)
+    test_stat.exp_requirement_mult = 2
+    assert test_stat.bounds_for_level(2) == (400, 799)
+    assert test_stat.exp_to_level(800) == 3
+
+def test_exp_to_level_above_table(test_stat):
+    table_max_exp = test_stat.bounds_for_level(test_stat.level_curve.table_max_level)[1]
+    assert test_stat.exp_to_level(table_max_exp) == test_stat.level_curve.table_max_level
+    assert test_stat.exp_to_level(table_max_exp+1) == test_stat.level_curve.table_max_level+1
+
+    for exp in [10**6, 10**9, 999999999999]:
+        level = test_stat.exp_to_level(exp)
+        min_exp, max_exp = test_stat.bounds_for_level(level)
+        assert min_exp <= exp <= max_exp
+        assert test_stat.to_json(exp)['next_level_exp_req'] == max_exp
+
+def test_add_exp(test_stat):
+    assert test_stat.exp == 0
+    assert test_stat.add_exp(50) == []
+    assert test_stat.level == 0
+    assert test_stat.add_exp(50) == [{'display_name': ' Magic Skill_!', 'level': 1, 'icon_name': 'magic_skill_0'}]
+    assert test_stat.add_exp(10) == []
+
+    events = test_stat.add_exp(1620 - test_stat.exp)
+    assert [event['level'] for event in events] == list(range(2, 12))
+    assert events[-1]['icon_name'] == test_stat.get_icon_name_from_level(11)
+    assert test_stat.level == test_stat.exp_to_level(1620) == 11
+
+    assert test_stat.add_exp(-1000) == []
+    assert test_stat.level == test_stat.exp_to_level(620)
+    with pytest.raises(ValueError):
+        test_stat.add_exp(-1000)
+    assert test_stat.exp == 620
+
+def test_add_exp_after_curve_change(test_stat):
+    test_stat.exp = 150
+    assert test_stat.level == 1
+    test_stat.level_base_requirement = 200
+    assert test_stat.level == 0
+    assert [event['level'] for event in test_stat.add_exp(50)] == [1]
+
+def test_from_trusted_row(test_stat):
+    stat = Stat.from_trusted_row(display_name=' Magic Skill_!', exp_requirement_mult=1.2, exp_requirement_flat_bonus=100, level_base_requirement=100, exp=1620)
+    assert stat == test_stat
+    assert stat.level_curve is test_stat.level_curve
+    assert stat.icon_base_name == 'magic_skill'
+    assert stat.level == 11
+    assert not hasattr(stat, '__dict__')
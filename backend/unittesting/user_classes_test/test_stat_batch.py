@@ -0,0 +1,41 @@
+import random
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from backend.user_classes.level_curve import LevelCurve
+from backend.user_classes.stat import Stat
+from backend.user_classes.stat_batch import exp_to_level_many
+
+
+@pytest.fixture
+def test_stat():
+    return Stat(display_name=' Magic Skill_!', exp_requirement_mult=1.2, exp_requirement_flat_bonus=100, level_base_requirement=100)
+
+def assert_same_as_scalar(curve, exp_values):
+    levels, min_exp, max_exp = exp_to_level_many(curve, np.array(exp_values))
+    for i, exp in enumerate(exp_values):
+        assert curve.exp_to_level(exp) == {'level': levels[i], 'min_exp': min_exp[i], 'max_exp': max_exp[i]}
+
+def test_exp_to_level_many(test_stat):
+    levels, min_exp, max_exp = exp_to_level_many(test_stat.level_curve, [10, 210, 1619, 1620])
+    assert list(levels) == [0, 1, 10, 11]
+    assert (min_exp[3], max_exp[3]) == test_stat.bounds_for_level(11)
+    assert (min_exp[0], max_exp[0]) == (0, 99)
+
+def test_edge_cases(test_stat):
+    curve = test_stat.level_curve
+    max_exp = curve.bounds_for_level(curve.table_max_level)[1]
+    assert_same_as_scalar(curve, [0, 99, 100, max_exp, max_exp+1, 999999999999])
+    # base requirement is rounded up for level 1, so exp in between has no level
+    assert_same_as_scalar(LevelCurve(96, 1.3, 150), [95, 96, 99, 100])
+    # all levels are empty
+    assert_same_as_scalar(LevelCurve(100, 1, 0), [0, 99, 100, 101])
+
+def test_same_as_scalar():
+    random.seed(0)
+    for mult, flat_bonus, base in [(1.3, 150, 100), (1.00001, 0, 7), (9.99999, 999999, 999999), (2.5, 3, 0)]:
+        curve = LevelCurve(base, mult, flat_bonus)
+        thresholds = [t for t in curve.thresholds if t < 10**12]
+        exp_values = [random.randint(0, 10**random.randint(1, 12)) for _ in range(200)] + [t+d for t in thresholds for d in (-1, 0, 1) if t+d >= 0]
+        assert_same_as_scalar(curve, exp_values)
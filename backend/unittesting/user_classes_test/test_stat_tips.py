@@ -39,4 +39,42 @@ def test_get_tip_for_level(dictionary):
     assert any([res.find(string) != 0 for string in dictionary[3]])
     res = test_stat_tips.get_tip_for_level(2)
     assert any([res.find(string) != 0 for string in dictionary[2]])
-    
\ No newline at end of file
+    
+def test_shared_catalog(dictionary):
+    first = StatTips(dictionary)
+    second = StatTips({level: list(tip_list) for level, tip_list in dictionary.items()})
+    assert first.catalog is second.catalog
+    assert StatTips(dictionary, max_level=20).catalog is not first.catalog
+
+    first.get_tip_for_level(2)
+    assert first.previously_used_tip[2] in dictionary[2]
+    assert second.previously_used_tip[2] == ''
+    assert len(first.rotation) == 31
+
+def test_append_keeps_rotation(dictionary):
+    test_stat_tips = StatTips(dictionary)
+    catalog = test_stat_tips.catalog
+    tip = test_stat_tips.get_tip_for_level(2)
+    test_stat_tips.append({2: ['level2 tooltip4']})
+    assert test_stat_tips.catalog is not catalog
+    assert catalog.tips_for_level(2) == tuple(dictionary[2])
+    assert tip.endswith(test_stat_tips.previously_used_tip[2])
+
+def test_no_repeats(dictionary):
+    test_stat_tips = StatTips.from_catalog(StatTips(dictionary).catalog)
+    tips = [test_stat_tips.get_tip_for_level(2) for _ in range(50)]
+    assert all(previous != tip for previous, tip in zip(tips, tips[1:]))
+
+def test_rotation_validation(dictionary):
+    test_stat_tips = StatTips(dictionary)
+    with pytest.raises(ValueError):
+        test_stat_tips.rotation = [-1]
+
+def test_tips_from_lower_level(dictionary):
+    test_stat_tips = StatTips(dictionary)
+    assert test_stat_tips.get_tip_for_level(3) == 'You have reached level 3! That means that: level3 tooltip1'
+    assert test_stat_tips.get_tip_for_level(4) == 'You have passed level 3! That means that: level3 tooltip1'
+    test_stat_tips.tips = {6: ['level6 tooltip1']}
+    assert test_stat_tips.get_tip_for_level(8) == 'You have passed level 6! That means that: level6 tooltip1'
+    with pytest.raises(ValueError):
+        test_stat_tips.get_tip_for_level(4)
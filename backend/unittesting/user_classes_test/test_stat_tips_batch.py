@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from backend.user_classes.stat_tips import StatTips
+from backend.user_classes.stat_tips_batch import get_tips_for_levels, new_rotations
+
+
+@pytest.fixture
+def dictionary():
+    dictionary = {3:['level3 tooltip1'],
+                  2:['level2 tooltip1','level2 tooltip2', 'level2 tooltip3'],
+                  1:['level1 tooltip1']}
+    return dictionary
+
+def test_get_tips_for_levels(dictionary):
+    test_stat_tips = StatTips(dictionary)
+    rotations = new_rotations(test_stat_tips, 4)
+    res = get_tips_for_levels(test_stat_tips, [2, 4, 6, 3], rotations, np.random.default_rng(1))
+    assert res[0] in [f'You have reached level 2! That means that: {tip}' for tip in dictionary[2]]
+    assert res[1] == 'You have passed level 3! That means that: level3 tooltip1'
+    assert res[2] is None
+    assert res[3] == 'You have reached level 3! That means that: level3 tooltip1'
+    assert rotations[0, 2] == dictionary[2].index(res[0].rsplit(': ', 1)[1])
+    assert (rotations[2] == -1).all()
+
+    with pytest.raises(ValueError):
+        get_tips_for_levels(test_stat_tips, [2], rotations)
+
+def test_get_tips_for_levels_out_of_bounds(dictionary):
+    test_stat_tips = StatTips(dictionary, max_level=5)
+    rotations = new_rotations(test_stat_tips, 4)
+    res = get_tips_for_levels(test_stat_tips, [2, 900, -1, 6], rotations)
+    assert res[0] in [f'You have reached level 2! That means that: {tip}' for tip in dictionary[2]]
+    assert res[1:] == [None, None, None]
+    assert (rotations[1:] == -1).all()
+
+def test_get_tips_for_levels_rotation(dictionary):
+    test_stat_tips = StatTips(dictionary)
+    rotations = new_rotations(test_stat_tips, 100)
+    first = get_tips_for_levels(test_stat_tips, [2] * 100, rotations)
+    second = get_tips_for_levels(test_stat_tips, [2] * 100, rotations)
+    assert all(tip != next_tip for tip, next_tip in zip(first, second))
+
+    for _ in range(20):
+        tip = test_stat_tips.get_tip_for_level(2)
+        rotations = np.array([test_stat_tips.rotation])
+        assert get_tips_for_levels(test_stat_tips, [2], rotations)[0] != tip
+
+def test_get_tips_for_levels_seed(dictionary):
+    test_stat_tips = StatTips(dictionary)
+    levels = [2, 3, 4, 2, 2]
+    res = [get_tips_for_levels(test_stat_tips, levels, new_rotations(test_stat_tips, 5), np.random.default_rng(7)) for _ in range(2)]
+    assert res[0] == res[1]
@@ -94,3 +94,25 @@ def test_check_for_due_date(sample_task):
     sample_task.check_for_due_date(future_date)
     assert sample_task.status == TaskStatus.PAST_DUE
 
+
+def test_from_trusted_row(sample_stat_dict):
+    due_date = datetime.datetime.now() + datetime.timedelta(days=1)
+    task = Task.from_trusted_row("Sample Task", sample_stat_dict, difficulty_modifier=1.5, due_date=due_date, status=TaskStatus.PAST_DUE)
+    assert task.asociated_stat is sample_stat_dict
+    assert task.difficulty_modifier == 1.5
+    assert task.due_date == due_date
+    assert task.due_date_penalty == 0.25
+    assert isinstance(task.creation_time, datetime.datetime)
+    assert task.complete_task() == round(round(10 * 1.5 * (1-task.time_modifier_penalty) / task.exp_round_to) * task.exp_round_to * 0.75)
+    assert task.status == TaskStatus.COMPLETED_AFTER_DUE_DATE
+    assert not hasattr(task, '__dict__')
+
+def test_status_codes():
+    codes = [status.code for status in TaskStatus]
+    assert len(set(codes)) == len(codes)
+    assert TaskStatus.IN_PROGRESS.code == 0
+    assert TaskStatus.COMPLETED_AFTER_DUE_DATE.code == 2
+    for status in TaskStatus:
+        assert TaskStatus.from_code(status.code) is status
+    with pytest.raises(ValueError):
+        TaskStatus.from_code(-1)
@@ -0,0 +1,51 @@
+import datetime
+import random
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from backend.user_classes.exp_ledger import ExpLedger
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.stat import Stat
+from backend.user_classes.task import Task
+from backend.user_classes.task_batch import complete_tasks
+
+@pytest.fixture
+def sample_stat_dict():
+    return {Stat("Sample Stat"):0.7, Stat("Sample Stat2"):0.3}
+
+def random_task(stat_dict, now):
+    task = Task("Sample Task", stat_dict, difficulty_modifier=round(random.uniform(0, 10), 2), time_modifier=round(random.uniform(0, 10), 2),
+                base_exp_reward=random.randint(0, 99999), due_date=now + datetime.timedelta(hours=random.randint(1, 48)))
+    task.due_date_penalty = random.choice([0, 0.25, 0.5, 0.333, 1])
+    if random.random() < 0.2:
+        task.status = TaskStatus.PAST_DUE
+    return task
+
+def test_same_as_scalar(sample_stat_dict):
+    random.seed(0)
+    now = datetime.datetime.now()
+    complete_time = now + datetime.timedelta(hours=24)
+    tasks = [random_task(sample_stat_dict, now) for _ in range(500)]
+    copies = [Task.from_trusted_row(task.display_name, task.asociated_stat, difficulty_modifier=task.difficulty_modifier, time_modifier=task.time_modifier,
+                                    base_exp_reward=task.base_exp_reward, due_date=task.due_date, due_date_penalty=task.due_date_penalty, status=task.status) for task in tasks]
+
+    res = complete_tasks(tasks, complete_time)
+    for copy in copies:
+        copy.check_for_due_date(complete_time)
+    assert res['rewards'] == [copy.complete_task() for copy in copies]
+    assert [task.status for task in tasks] == [copy.status for copy in copies]
+
+def test_skipped_and_stat_exp(sample_stat_dict):
+    tasks = [Task("Sample Task", sample_stat_dict, base_exp_reward=100) for _ in range(3)]
+    tasks[1].complete_task()
+    res = complete_tasks(tasks + [tasks[0]])
+    assert res['rewards'] == [80, None, 80, None]
+    assert res['skipped'] == [tasks[1], tasks[0]]
+    assert res['stat_exp'] == {stat: round(160 * mult) for stat, mult in sample_stat_dict.items()}
+
+def test_ledger(sample_stat_dict):
+    ledger = ExpLedger()
+    complete_tasks([Task("Sample Task", sample_stat_dict, base_exp_reward=100) for _ in range(3)], ledger=ledger)
+    complete_tasks([Task("Sample Task", sample_stat_dict, base_exp_reward=100)], ledger=ledger)
+    assert ledger.deltas == {stat: 4 * round(80 * mult) for stat, mult in sample_stat_dict.items()}
@@ -0,0 +1,73 @@
+import datetime
+import pytest
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.stat import Stat
+from backend.user_classes.task import Task
+from backend.user_classes.task_collection import TaskCollection
+
+@pytest.fixture
+def sample_tasks():
+    stat_dict = {Stat("Sample Stat"): 1}
+    return [Task(f"Sample Task {i}", stat_dict) for i in range(5)]
+
+def test_order_and_dedup(sample_tasks):
+    collection = TaskCollection(sample_tasks[:3])
+    collection.extend([sample_tasks[1], sample_tasks[3], sample_tasks[3]])
+    assert list(collection) == sample_tasks[:4]
+    assert len(collection) == 4
+    assert collection[-1] is sample_tasks[3]
+    assert collection.add(sample_tasks[4])
+    assert not collection.add(sample_tasks[4])
+
+def test_contains_and_remove(sample_tasks):
+    collection = TaskCollection(sample_tasks)
+    collection.remove(sample_tasks[2])
+    assert sample_tasks[2] not in collection
+    assert sample_tasks[3] in collection
+    assert list(collection) == sample_tasks[:2] + sample_tasks[3:]
+    with pytest.raises(ValueError):
+        collection.remove(sample_tasks[2])
+
+def test_status_index(sample_tasks):
+    collection = TaskCollection(sample_tasks)
+    assert collection.with_status(TaskStatus.IN_PROGRESS) == sample_tasks
+    sample_tasks[1].complete_task()
+    sample_tasks[3].status = TaskStatus.ABANDONED
+    assert collection.with_status(TaskStatus.COMPLETED, TaskStatus.ABANDONED) == [sample_tasks[1], sample_tasks[3]]
+    assert collection.with_status(TaskStatus.IN_PROGRESS) == [sample_tasks[0], sample_tasks[2], sample_tasks[4]]
+    collection.remove(sample_tasks[1])
+    sample_tasks[1].status = TaskStatus.IN_PROGRESS
+    assert collection.with_status(TaskStatus.COMPLETED) == []
+    assert sample_tasks[1] not in collection.with_status(TaskStatus.IN_PROGRESS)
+
+def test_due_date_index(sample_tasks):
+    now = datetime.datetime.now()
+    for days, task in zip([3, 1, 10, 5], sample_tasks):
+        task.due_date = now + datetime.timedelta(days=days)
+    collection = TaskCollection(sample_tasks)
+    assert collection.due_between() == [sample_tasks[i] for i in [1, 0, 3, 2]]
+    assert collection.due_between(now, now + datetime.timedelta(days=7)) == [sample_tasks[i] for i in [1, 0, 3]]
+
+    sample_tasks[2].due_date = now + datetime.timedelta(days=2)
+    sample_tasks[4].due_date = now + datetime.timedelta(hours=1)
+    assert collection.due_between(end=now + datetime.timedelta(days=3)) == [sample_tasks[i] for i in [4, 1, 2]]
+
+    sample_tasks[1].check_for_due_date(now + datetime.timedelta(days=2))
+    assert collection.with_status(TaskStatus.PAST_DUE) == [sample_tasks[1]]
+
+def test_due_date_index_many_tasks(monkeypatch):
+    monkeypatch.setattr('backend.user_classes.task_collection._SortedEntries.bucket_size', 4)
+    now = datetime.datetime(2030, 1, 1)
+    stat_dict = {Stat("Sample Stat"): 1}
+    tasks = [Task(f"Sample Task {i}", stat_dict, due_date=now + datetime.timedelta(hours=(i * 37) % 100)) for i in range(100)]
+    collection = TaskCollection(tasks[:60])
+    for task in tasks[60:]:
+        collection.add(task)
+    for task in tasks[::3]:
+        collection.remove(task)
+    tasks[1].due_date = now + datetime.timedelta(hours=500)
+
+    expected = sorted((task for i, task in enumerate(tasks) if i % 3), key=lambda task: task.due_date)
+    assert collection.due_between() == expected
+    start, end = now + datetime.timedelta(hours=20), now + datetime.timedelta(hours=70)
+    assert collection.due_between(start, end) == [task for task in expected if start <= task.due_date < end]
@@ -0,0 +1,85 @@
+import datetime
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.stat import Stat
+from backend.user_classes.task import Task
+from backend.user_classes.task_table import TaskTable
+
+@pytest.fixture
+def now():
+    return datetime.datetime.now()
+
+@pytest.fixture
+def sample_tasks(now):
+    stat_dict = {Stat("Sample Stat"): 1}
+    tasks = [Task(f"Sample Task {i}", stat_dict, base_exp_reward=10 * (i+1), difficulty_modifier=1.5) for i in range(6)]
+    tasks[0].due_date = now + datetime.timedelta(hours=1)
+    tasks[1].due_date = now + datetime.timedelta(days=2)
+    tasks[2].complete_task()
+    tasks[3].status = TaskStatus.PAST_DUE
+    tasks[4].complete_task()
+    tasks[5].description = 'Sample description'
+    for task in tasks:
+        task.due_date_penalty = 0.25
+    return tasks
+
+@pytest.fixture
+def sample_table(sample_tasks):
+    return TaskTable.from_tasks(sample_tasks, [1, 1, 1, 2, 2, 3])
+
+def test_round_trip(sample_tasks, sample_table):
+    assert len(sample_table) == 6
+    for task, copy in zip(sample_tasks, sample_table.to_tasks()):
+        for field in ['display_name', 'description', 'asociated_stat', 'difficulty_modifier', 'time_modifier', 'base_exp_reward', 'due_date', 'due_date_penalty', 'creation_time', 'status']:
+            assert getattr(task, field) == getattr(copy, field)
+
+def test_filter(sample_tasks, sample_table):
+    completed = sample_table.filter(sample_table.status_mask(TaskStatus.COMPLETED))
+    assert list(completed.display_name) == [sample_tasks[2].display_name, sample_tasks[4].display_name]
+    assert list(completed.profile_id) == [1, 2]
+
+def test_aggregations(sample_table, now):
+    later = now + datetime.timedelta(days=1)
+    assert sample_table.overdue_mask(later).tolist() == [True, False, False, True, False, False]
+
+    keys, rates = sample_table.completion_rate()
+    assert keys.tolist() == [1, 2, 3]
+    assert rates.tolist() == pytest.approx([1/3, 1/2, 0])
+    assert sample_table.overdue_ratio(later)[1].tolist() == pytest.approx([1/3, 1/2, 0])
+
+    rewards = sample_table.rewards(later)
+    assert rewards.tolist() == [9, 24, 36, 36, 60, 72]
+    assert sample_table.mean_reward(later)[1].tolist() == pytest.approx([23, 48, 72])
+    assert sample_table.group_by(rewards, how='count')[1].tolist() == [3, 2, 1]
+    with pytest.raises(ValueError):
+        sample_table.group_by(rewards, how='median')
+
+def test_rewards_match_tasks(now):
+    stat_dict = {Stat("Sample Stat"): 1}
+    later = now + datetime.timedelta(days=2)
+    tasks = []
+    for status in TaskStatus:
+        for due_date in [now + datetime.timedelta(days=1), now + datetime.timedelta(days=3), None]:
+            task = Task(f"Sample Task {len(tasks)}", stat_dict, base_exp_reward=80, due_date=due_date)
+            task.due_date_penalty = 0.25
+            task.status = status
+            tasks.append(task)
+
+    expected, penalized = [], []
+    for task in tasks:
+        copy = Task(task.display_name, stat_dict, base_exp_reward=80)
+        copy.due_date_penalty = 0.25
+        if task.status == TaskStatus.COMPLETED_AFTER_DUE_DATE:  # reward, that the task got when it was completed
+            copy.status = TaskStatus.PAST_DUE
+        elif task.status != TaskStatus.COMPLETED:
+            copy.status = task.status
+            if task.due_date and task.due_date < later:  # what check_for_due_date does at completion
+                copy.status = TaskStatus.PAST_DUE
+        penalized.append(copy.status == TaskStatus.PAST_DUE)
+        expected.append(copy.complete_task())
+    assert TaskTable.from_tasks(tasks).rewards(later).tolist() == expected
+    assert TaskTable.from_tasks(tasks).penalty_mask(later).tolist() == penalized
+    assert len(set(expected)) == 2
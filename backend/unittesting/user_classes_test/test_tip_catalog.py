@@ -0,0 +1,74 @@
+import json
+import pickle
+import pytest
+
+from backend.user_classes.tip_catalog import TipCatalog
+
+
+def test_interning():
+    catalog = TipCatalog({1: ['a'], 2: ['b', 'c']}, 0, 5)
+    assert TipCatalog({2: ['b', 'c'], 1: ['a'], 9: ['ignored']}, 0, 5) is catalog
+    assert pickle.loads(pickle.dumps(catalog)) is catalog
+    assert catalog.extend({1: ['d']}) is TipCatalog({1: ['a', 'd'], 2: ['b', 'c']}, 0, 5)
+
+def test_levels():
+    catalog = TipCatalog({1: ['a'], 2: ['b', 'c']}, 1, 3)
+    assert catalog.level_count == 3
+    assert catalog.tips_for_level(2) == ('b', 'c')
+    assert catalog.tips_for_level(3) == ()
+    assert catalog.to_dict() == {1: ['a'], 2: ['b', 'c'], 3: []}
+    with pytest.raises(ValueError):
+        catalog.tips_for_level(4)
+
+@pytest.mark.parametrize('min_level, max_level', [(-1, 30), (0, 101), (10, 5)])
+def test_validation(min_level, max_level):
+    with pytest.raises(ValueError):
+        TipCatalog(None, min_level, max_level)
+
+def test_nearest_tip_level():
+    catalog = TipCatalog({1: ['a'], 4: ['b']}, 0, 10)
+    assert [catalog.nearest_tip_level(level) for level in range(11)] == [None, 1, None, 1, 4, 4, 4, None, None, None, None]
+    assert catalog.extend({8: ['c']}).nearest_tip_level(10) == 8
+    assert TipCatalog({5: ['a']}, 5, 10).nearest_tip_level(6) == 5
+    with pytest.raises(ValueError):
+        catalog.nearest_tip_level(11)
+
+@pytest.fixture
+def tips():
+    return {1: ['a'], 2: ['b ] "quoted" \\ c', 'ünïcode', ''], 4: [], 7: ['d"], "8": ["e'], 50: ['ignored']}
+
+def test_from_json(tips):
+    document = json.dumps({str(level): tip_list for level, tip_list in tips.items()})
+    catalog = TipCatalog.from_json(document, 0, 10)
+    assert TipCatalog.from_json(document, 0, 10) is catalog
+    assert catalog.tips_for_level(2) == tuple(tips[2])
+    assert catalog.nearest_tip_levels == TipCatalog(tips, 0, 10).nearest_tip_levels
+    assert catalog.to_dict() == TipCatalog(tips, 0, 10).to_dict()
+    assert catalog.extend({4: ['e']}) is TipCatalog({**tips, 4: ['e']}, 0, 10)
+
+@pytest.mark.parametrize('document, expected', [
+    (None, {}), ('null', {}), (' { } ', {}), ('{"1": []}', {}),
+    ('{"1": ["a", 5]}', {1: ['a', 5]}),
+    (' {"1" :["a"],"2":[] } ', {1: ['a']}),  # not written by json.dumps, parsed right away
+    ('{"1": ["a"], "1": ["b"]}', {1: ['b']}),
+])
+def test_from_json_other_documents(document, expected):
+    assert TipCatalog.from_json(document, 0, 10).to_dict() == TipCatalog(expected, 0, 10).to_dict()
+
+def test_binary(tips, tmp_path):
+    path = str(tmp_path / 'tips.bin')
+    TipCatalog(tips, 0, 10).dump(path)
+    catalog = TipCatalog.load(path)
+    assert TipCatalog.load(path) is catalog
+    assert (catalog.min_level, catalog.max_level) == (0, 10)
+    assert catalog.tips_for_level(2) == tuple(tips[2])
+    assert catalog.nearest_tip_levels == TipCatalog(tips, 0, 10).nearest_tip_levels
+    assert catalog.to_dict() == TipCatalog(tips, 0, 10).to_dict()
+
+    TipCatalog(None, 5, 5).dump(path)
+    assert TipCatalog.load(path).to_dict() == {5: []}
+
+    with open(path, 'wb') as file:
+        file.write(b'not a catalog')
+    with pytest.raises(ValueError):
+        TipCatalog.load(path)
@@ -0,0 +1,34 @@
+import pytest
+
+from backend.user_classes.other.validation import TEXT_RULES, TextRule, BatchValidationError, validate_batch
+
+
+@pytest.fixture
+def test_rule():
+    return TextRule('Test name', min_length=3, max_length=10, min_alnum=3)
+
+def test_check(test_rule):
+    assert test_rule.check('abc') is None
+    assert test_rule.check('a_b_c') is None
+    assert test_rule.check('ab') == 'Test name is too short(2<3)! Your name: ab'
+    assert test_rule.check('a!!b') == 'Test name has to be in English! Your name: a!!b'
+    assert test_rule.check('abcdefghijk') == 'Test name is too long(11>10)! Your name: abcdefghijk'
+    assert test_rule.check('!' * 100000).startswith('Test name is too long(100000>10)!')  # rejected before the alnum scan
+
+def test_validate(test_rule):
+    test_rule.validate('abc')
+    with pytest.raises(ValueError):
+        test_rule.validate('___')
+
+def test_description_rule():
+    assert TEXT_RULES['task.description'].check('') is None
+    assert TEXT_RULES['task.description'].check('!' * 30000) is None
+    assert TEXT_RULES['task.description'].check('!' * 30001) is not None
+
+def test_validate_batch():
+    validate_batch('task', [{'display_name': 'Task One', 'description': ''}, {'display_name': 'Task Two'}])
+
+    with pytest.raises(BatchValidationError) as exc_info:
+        validate_batch('task', [{'display_name': 'A'}, {'display_name': 'Task Two', 'description': 'A' * 30001}, {'display_name': '!!!'}])
+    assert [(index, field) for index, field, _ in exc_info.value.failures] == [(0, 'display_name'), (1, 'description'), (2, 'display_name')]
+    assert isinstance(exc_info.value, ValueError)
@@ -0,0 +1,161 @@
+import datetime
+import heapq
+import itertools
+from typing import Iterable, List
+
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.task import Task
+
+
+class DueDateScheduler:
+    """
+    A min-heap of in progress tasks, ordered by due_date. Replaces calling `check_for_due_date` on every task:
+    `advance` pops only the expired tasks and moves them to Past Due, in O(k log n) for k expired tasks.
+
+    Scheduler subscribes to its tasks, so due_date edits re-queue the task and status changes (completion, abandoning)
+    drop it, without rebuilding the heap. Outdated heap entries are skipped when popped.
+
+    Args:
+        tasks (Iterable[Task], optional): Tasks to schedule. Defaults to empty.
+    """
+    __slots__ = ('_heap', '_entries', '_entry_counter')
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        """
+        Initialize the scheduler with provided tasks.
+
+        Args:
+            tasks (Iterable[Task], optional): Tasks to schedule. Tasks without due_date or not in progress are skipped.
+        """
+        self._heap = []  # [due_date, entry number, task], task is None for outdated entries
+        self._entries = {}
+        self._entry_counter = itertools.count()
+        for task in tasks:
+            self.schedule(task)
+
+    def schedule(self, task: Task) -> bool:
+        """
+        Start tracking the due_date of the task.
+
+        Args:
+            task (Task): The task to schedule.
+
+        Returns:
+            bool: True if the task is scheduled, False if it has no due_date or is not in progress.
+        """
+        if not task.due_date or task.status != TaskStatus.IN_PROGRESS:
+            return False
+        self.__push(task)
+        task.add_observer(self)
+        return True
+
+    def unschedule(self, task: Task) -> None:
+        """
+        Stop tracking the task. Does nothing if the task is not scheduled.
+
+        Args:
+            task (Task): The task to unschedule.
+        """
+        entry = self._entries.pop(task, None)
+        if entry:
+            entry[2] = None
+            task.remove_observer(self)
+            self.__compact()
+
+    def advance(self, now: datetime.datetime = None) -> List[Task]:
+        """
+        Move tasks, which due_date is before now, to Past Due status.
+
+        Args:
+            now (datetime.datetime, optional): Current time. Defaults to datetime.now().
+
+        Returns:
+            List[Task]: Tasks, that became Past Due, ordered by due_date.
+        """
+        now = now if now else datetime.datetime.now()
+        expired = []
+        while self._heap and self._heap[0][0] < now:
+            task = heapq.heappop(self._heap)[2]
+            if task is None:
+                continue
+            del self._entries[task]
+            task.remove_observer(self)
+            task.status = TaskStatus.PAST_DUE
+            expired.append(task)
+        return expired
+
+    def next_due_date(self) -> datetime.datetime:
+        """
+        Get the earliest due_date among scheduled tasks.
+
+        Returns:
+            datetime.datetime: The earliest due_date, None if no tasks are scheduled.
+        """
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def on_status_change(self, task: Task, old_status: TaskStatus) -> None:
+        """
+        Drop the task, if it is not in progress anymore.
+
+        Args:
+            task (Task): The changed task.
+            old_status (TaskStatus): Status of the task before the change.
+        """
+        if task.status != TaskStatus.IN_PROGRESS:
+            self.unschedule(task)
+
+    def on_due_date_change(self, task: Task, old_due_date: datetime.datetime) -> None:
+        """
+        Re-queue the task with its new due_date.
+
+        Args:
+            task (Task): The changed task.
+            old_due_date (datetime.datetime): Due_date of the task before the change.
+        """
+        self.__push(task)
+        self.__compact()
+
+    def __push(self, task: Task) -> None:
+        """
+        Add heap entry for the task, replacing its previous entry.
+
+        Args:
+            task (Task): The task to add.
+        """
+        entry = self._entries.get(task)
+        if entry:
+            entry[2] = None
+        entry = [task.due_date, next(self._entry_counter), task]
+        heapq.heappush(self._heap, entry)
+        self._entries[task] = entry
+
+    def __compact(self) -> None:
+        """
+        Drop outdated entries, once they make up most of the heap.
+        """
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [entry for entry in self._heap if entry[2] is not None]
+            heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        """
+        Get the number of scheduled tasks.
+
+        Returns:
+            int: The number of scheduled tasks.
+        """
+        return len(self._entries)
+
+    def __contains__(self, task: object) -> bool:
+        """
+        Check if the task is scheduled.
+
+        Args:
+            task (object): The task to look for.
+
+        Returns:
+            bool: True if the task is scheduled.
+        """
+        return task in self._entries
@@ -0,0 +1,112 @@
+import math
+from typing import Dict
+
+from backend.user_classes.stat import Stat
+from backend.user_classes.task import Task
+from backend.user_classes.user_profile import UserProfile
+
+
+class ExpLedger:
+    """
+    A ledger of exp changes per Stat. Task rewards are split over asociated_stat weights with deterministic rounding,
+    deltas for the same Stat are coalesced, and `apply` writes them to a UserProfile with one update per Stat.
+
+    Attributes:
+        deltas (Dict[Stat, int]): Coalesced exp changes, that are not applied yet.
+    """
+    __slots__ = ('_deltas',)
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty ledger.
+        """
+        self._deltas: Dict[Stat, int] = {}
+
+    @property
+    def deltas(self) -> Dict[Stat, int]:
+        """
+        Get the coalesced exp changes, that are not applied yet.
+
+        Returns:
+            dict: A dictionary mapping Stat objects to exp changes.
+        """
+        return dict(self._deltas)
+
+    @staticmethod
+    def split_reward(reward: int, asociated_stat: Dict[Stat, float]) -> Dict[Stat, int]:
+        """
+        Split the reward over stat weights. Shares are rounded down and the rest of the rounded total goes to the stats
+        with the largest fractional parts (ties are broken by stat id name), so the result does not depend on dict order.
+
+        Args:
+            reward (int): The exp reward of the task.
+            asociated_stat (Dict[Stat, float]): Stat weights of the task.
+
+        Returns:
+            dict: A dictionary mapping Stat objects to their exp shares.
+        """
+        shares = {stat: reward * mult for stat, mult in asociated_stat.items()}
+        split = {stat: math.floor(share) for stat, share in shares.items()}
+        remainder = round(sum(shares.values())) - sum(split.values())
+        by_fraction = sorted(shares, key=lambda stat: (split[stat] - shares[stat], stat.id_name))
+        for stat in by_fraction[:remainder]:
+            split[stat] += 1
+        return split
+
+    def add(self, stat: Stat, delta: int) -> None:
+        """
+        Add the exp change for the stat.
+
+        Args:
+            stat (Stat): The changed Stat.
+            delta (int): The exp change.
+        """
+        self._deltas[stat] = self._deltas.get(stat, 0) + delta
+
+    def add_completion(self, task: Task, reward: int) -> Dict[Stat, int]:
+        """
+        Add the reward of the completed task, split over its asociated_stat weights.
+
+        Args:
+            task (Task): The completed task.
+            reward (int): The exp reward for the task (result of `complete_task`).
+
+        Returns:
+            dict: A dictionary mapping Stat objects to their exp shares of the reward.
+        """
+        split = self.split_reward(reward, task.asociated_stat)
+        for stat, delta in split.items():
+            self.add(stat, delta)
+        return split
+
+    def apply(self, profile: UserProfile) -> Dict[Stat, int]:
+        """
+        Apply all exp changes to the profile in one step and clear the ledger.
+
+        Args:
+            profile (UserProfile): The profile to update.
+
+        Returns:
+            dict: A dictionary mapping changed Stat objects to their new experience values.
+
+        Raises:
+            ValueError: If any resulting experience is outside the valid bounds. Neither profile nor ledger are changed in this case.
+        """
+        new_exp = profile.add_stat_exp(self._deltas)
+        self.clear()
+        return new_exp
+
+    def clear(self) -> None:
+        """
+        Drop all exp changes.
+        """
+        self._deltas.clear()
+
+    def __len__(self) -> int:
+        """
+        Get the number of stats with pending exp changes.
+
+        Returns:
+            int: The number of stats.
+        """
+        return len(self._deltas)
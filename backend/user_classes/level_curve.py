@@ -0,0 +1,320 @@
+import math
+import threading
+from bisect import bisect_right
+from fractions import Fraction
+from weakref import WeakValueDictionary
+
+
+class LevelCurve:
+    """
+    An immutable exp curve, that converts experience points into levels. Curves are interned: creating a curve with
+    the same parameters returns the same object, so Stats with equal parameters share one curve and one threshold table.
+
+    Args:
+        level_base_requirement (int, optional): The base experience requirement for level 1. Defaults to 100.
+        exp_requirement_mult (float, optional): The multiplier for experience required to level up. Defaults to 1.3.
+        exp_requirement_flat_bonus (int, optional): The flat amount added to experience requirement per level. Defaults to 150.
+        exp_round_to (int, optional): Experience thresholds will be rounded to this value. Defaults to 10.
+
+    Attributes:
+        table_max_level (int): Highest level, which thresholds are precomputed. Levels above it are found analytically.
+        exact_power_bits (int): Size limit (in bits) for computing powers of the multiplier as exact fractions.
+    """
+    __slots__ = ('_level_base_requirement', '_exp_requirement_mult', '_exp_requirement_flat_bonus', '_exp_round_to', '_mult_ratio', '_thresholds', '__weakref__')
+
+    table_max_level = 50  # highest level, which thresholds are precomputed
+    exact_power_bits = 4096  # bigger powers are bounded with fixed point integers instead
+
+    _registry = WeakValueDictionary()  # process-wide registry of curves in use
+    _registry_lock = threading.Lock()
+
+    def __new__(cls, level_base_requirement:int=100, exp_requirement_mult:float=1.3, exp_requirement_flat_bonus:int=150, exp_round_to:int=10):
+        """
+        Get the curve with provided parameters, creating it if no Stat uses it yet.
+
+        Args:
+            level_base_requirement (int, optional): The base experience requirement for level 1. Defaults to 100.
+            exp_requirement_mult (float, optional): The multiplier for experience required to level up. Defaults to 1.3.
+            exp_requirement_flat_bonus (int, optional): The flat amount added to experience requirement per level. Defaults to 150.
+            exp_round_to (int, optional): Experience thresholds will be rounded to this value. Defaults to 10.
+
+        Returns:
+            LevelCurve: The shared curve object.
+        """
+        key = (level_base_requirement, exp_requirement_mult, exp_requirement_flat_bonus, exp_round_to)
+        curve = cls._registry.get(key)
+        if curve is not None:
+            return curve
+        with cls._registry_lock:
+            curve = cls._registry.get(key)
+            if curve is None:
+                curve = super().__new__(cls)
+                curve._level_base_requirement = level_base_requirement
+                curve._exp_requirement_mult = exp_requirement_mult
+                curve._exp_requirement_flat_bonus = exp_requirement_flat_bonus
+                curve._exp_round_to = exp_round_to
+                curve._mult_ratio = Fraction(str(exp_requirement_mult))  # multiplier is decimal, so its string is exact
+                curve._thresholds = None
+                cls._registry[key] = curve
+        return curve
+
+    @property
+    def level_base_requirement(self) -> int:
+        """
+        Get the base experience requirement for level 1.
+
+        Returns:
+            int: The base experience requirement for level 1.
+        """
+        return self._level_base_requirement
+
+    @property
+    def exp_requirement_mult(self) -> float:
+        """
+        Get the experience requirement multiplier.
+
+        Returns:
+            float: The experience requirement multiplier.
+        """
+        return self._exp_requirement_mult
+
+    @property
+    def exp_requirement_flat_bonus(self) -> int:
+        """
+        Get the experience requirement flat bonus.
+
+        Returns:
+            int: The experience requirement flat bonus.
+        """
+        return self._exp_requirement_flat_bonus
+
+    @property
+    def exp_round_to(self) -> int:
+        """
+        Get the value, experience thresholds are rounded to.
+
+        Returns:
+            int: The value, experience thresholds are rounded to.
+        """
+        return self._exp_round_to
+
+    def replace(self, **changes) -> 'LevelCurve':
+        """
+        Get the curve with some of the parameters changed.
+
+        Args:
+            **changes: New values for the curve parameters (same names as in the constructor).
+
+        Returns:
+            LevelCurve: The shared curve object with changed parameters.
+        """
+        params = {
+            'level_base_requirement': self.level_base_requirement,
+            'exp_requirement_mult': self.exp_requirement_mult,
+            'exp_requirement_flat_bonus': self.exp_requirement_flat_bonus,
+            'exp_round_to': self.exp_round_to,
+        }
+        params.update(changes)
+        return LevelCurve(**params)
+
+    def min_exp(self, level:int) -> int:
+        """
+        Calculate minimum exp requiered for level. Calculation uses exact integer arithmetic, so it does not drift at high levels.
+        Base formula: round(Base_Requirement * Exp_Multiplier^(Level-1) / Round_Val ) * Round_Val + Flat_Bonus * (Level-1)
+
+        Args:
+            level (int): Level value to convert
+
+        Returns:
+            int: Minimum exp for the level.
+        """
+        return self.__rounded_growth(level-1)*self.exp_round_to + self.exp_requirement_flat_bonus * (level-1)
+
+    def __rounded_growth(self, power:int) -> int:
+        """
+        Calculate round(Base_Requirement * Exp_Multiplier^power / Round_Val) exactly (ties are rounded to even, like `round`).
+
+        Args:
+            power (int): Power of the multiplier.
+
+        Returns:
+            int: The rounded value.
+        """
+        numerator, denominator = self._mult_ratio.numerator, self._mult_ratio.denominator
+        growth = Fraction(self.level_base_requirement) / self.exp_round_to
+        if growth == 0 or numerator == denominator:
+            return round(growth)
+        if power < 0:
+            numerator, denominator, power = denominator, numerator, -power
+        if power * numerator.bit_length() <= self.exact_power_bits:
+            return round(growth * numerator**power / denominator**power)
+
+        # power is too big for exact fractions: bound it from both sides with fixed point integers,
+        # until both bounds round to the same value (exact ties never do, so precision is limited by the exact size)
+        precision = 128
+        while precision < power * numerator.bit_length():
+            low, high = _power_bounds(numerator, denominator, power, precision)
+            rounded = round(growth * low / (1 << precision))
+            if rounded == round(growth * high / (1 << precision)):
+                return rounded
+            precision *= 2
+        return round(growth * numerator**power / denominator**power)
+
+    @property
+    def thresholds(self) -> tuple:
+        """
+        Get the table of minimum exp for levels 0..table_max_level+1. Table is built once, on the first use of the curve.
+
+        Returns:
+            tuple (int): Minimum exp for each level, indexed by level.
+        """
+        if self._thresholds is None:
+            self._thresholds = tuple(self.min_exp(level) for level in range(self.table_max_level + 2))
+        return self._thresholds
+
+    def bounds_for_level(self, level:int):
+        """
+        Get minimum and maximum exp requiered for level.
+
+        Args:
+            level (int): Level value to convert
+
+        Returns:
+            set (int): set of integers, with lower and upper bound (lower, upper).
+        """
+        if 0 <= level <= self.table_max_level:
+            thresholds = self.thresholds
+            return (thresholds[level], thresholds[level+1] - 1)
+        return (self.min_exp(level), self.min_exp(level+1) - 1)
+
+    def exp_to_level(self, exp:int) -> dict:
+        """
+        Calculate the level based on the given experience points.
+        Levels up to `table_max_level` are searched in the threshold table, higher levels are found by inverting the exp formula.
+
+        Args:
+            exp (int): The amount of experience points.
+
+        Returns:
+            dict: A dictionary containing the calculated level and the range of experience required for that level.
+                Level is -1 if exp does not belong to any level (exp between base requirement and rounded level 1 requirement,
+                or the curve does not grow at all).
+        """
+        if exp < self.level_base_requirement:
+            return {'level': 0, 'min_exp': 0, 'max_exp': self.level_base_requirement-1}
+
+        thresholds = self.thresholds
+        if exp < thresholds[-1]:
+            # last level, which minimum exp is not bigger than exp (empty levels are skipped this way)
+            level = bisect_right(thresholds, exp, 1) - 1
+            if level < 1:
+                return {'level': -1, 'min_exp': 0, 'max_exp': 0}
+            return {'level': level, 'min_exp': thresholds[level], 'max_exp': thresholds[level+1] - 1}
+
+        level = self.__invert(exp)
+        if level < 1:
+            return {'level': -1, 'min_exp': 0, 'max_exp': 0}
+        return {'level': level, 'min_exp': self.min_exp(level), 'max_exp': self.min_exp(level+1) - 1}
+
+    def __invert(self, exp:int) -> int:
+        """
+        Find the last level, which minimum exp is not bigger than exp, by inverting the exp formula.
+        Estimate comes from the formula without rounding (logarithm, refined by a few Newton steps) and is corrected with exact thresholds.
+
+        Args:
+            exp (int): The amount of experience points (not less than the level 1 requirement).
+
+        Returns:
+            int: The level, -1 if the curve does not grow (every level above has the same requirement).
+        """
+        base = self.level_base_requirement
+        flat_bonus = self.exp_requirement_flat_bonus
+        log_mult = math.log(self._mult_ratio)
+        if base == 0 or log_mult == 0:
+            if flat_bonus == 0:
+                return -1
+            return 1 + (exp - self.min_exp(1)) // flat_bonus
+
+        # solve Base * Mult^x + Flat * x = exp, starting from the right, where Newton steps converge monotonically
+        x = math.log(exp / base) / log_mult
+        if flat_bonus:
+            x = min(x, exp / flat_bonus)
+        for _ in range(64):
+            growth = base * math.exp(x * log_mult)
+            step = (growth + flat_bonus * x - exp) / (growth * log_mult + flat_bonus)
+            x -= step
+            if step < 0.5:
+                break
+        return self.__last_level_within(exp, max(int(x) + 1, 1))
+
+    def __last_level_within(self, exp:int, guess:int) -> int:
+        """
+        Find the last level, which minimum exp is not bigger than exp, near the guessed level (galloping search from the guess).
+
+        Args:
+            exp (int): The amount of experience points (not less than the level 1 requirement).
+            guess (int): The estimated level.
+
+        Returns:
+            int: The level.
+        """
+        if self.min_exp(guess) <= exp:
+            low, step = guess, 1
+            while self.min_exp(low + step) <= exp:
+                low, step = low + step, step * 2
+            high = low + step
+        else:
+            high, step = guess, 1
+            while high - step > 1 and self.min_exp(high - step) > exp:
+                high, step = high - step, step * 2
+            low = max(high - step, 1)
+        # min_exp(low) <= exp < min_exp(high)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.min_exp(middle) <= exp:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def __reduce__(self):
+        """
+        Pickle the curve by its parameters, so unpickled curves are interned as well.
+        """
+        return (LevelCurve, (self.level_base_requirement, self.exp_requirement_mult, self.exp_requirement_flat_bonus, self.exp_round_to))
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the LevelCurve object that can be used to recreate the object.
+
+        Returns:
+            str: A string representation of the LevelCurve object.
+        """
+        return f'LevelCurve({self.level_base_requirement}, {self.exp_requirement_mult}, {self.exp_requirement_flat_bonus}, {self.exp_round_to})'
+
+
+def _power_bounds(numerator:int, denominator:int, power:int, precision:int):
+    """
+    Bound (numerator/denominator)^power from both sides with fixed point integers.
+
+    Args:
+        numerator (int): Numerator of the base.
+        denominator (int): Denominator of the base.
+        power (int): Non negative power.
+        precision (int): Number of fractional bits.
+
+    Returns:
+        set (int): Lower and upper bounds, multiplied by 2^precision (lower, upper).
+    """
+    low = high = 1 << precision
+    base_low = (numerator << precision) // denominator
+    base_high = -(-(numerator << precision) // denominator)
+    while power:
+        if power & 1:
+            low = (low * base_low) >> precision
+            high = -(-(high * base_high) >> precision)
+        power >>= 1
+        if power:
+            base_low = (base_low * base_low) >> precision
+            base_high = -(-(base_high * base_high) >> precision)
+    return low, high
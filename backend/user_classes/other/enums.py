@@ -6,4 +6,45 @@ class TaskStatus(Enum):
     FAILED = "Failed"
     IN_PROGRESS = "In Progress"
     ABANDONED = "Abandoned"
-    PAST_DUE = "Past Due"
\ No newline at end of file
+    PAST_DUE = "Past Due"
+
+    @property
+    def code(self) -> int:
+        """
+        Get the stable integer code of the status (used for storage in db and in columnar task tables).
+
+        Returns:
+            int: The status code.
+        """
+        return _TASK_STATUS_CODES[self]
+
+    @classmethod
+    def from_code(cls, code: int) -> 'TaskStatus':
+        """
+        Get the status by its integer code.
+
+        Args:
+            code (int): The status code.
+
+        Returns:
+            TaskStatus: The status.
+
+        Raises:
+            ValueError: If the code is unknown.
+        """
+        try:
+            return _TASK_STATUSES_BY_CODE[code]
+        except KeyError:
+            raise ValueError(f'Unknown task status code: {code}') from None
+
+
+# codes are stored in db, never change or reuse them, only append new ones
+_TASK_STATUS_CODES = {
+    TaskStatus.IN_PROGRESS: 0,
+    TaskStatus.COMPLETED: 1,
+    TaskStatus.COMPLETED_AFTER_DUE_DATE: 2,
+    TaskStatus.PAST_DUE: 3,
+    TaskStatus.FAILED: 4,
+    TaskStatus.ABANDONED: 5,
+}
+_TASK_STATUSES_BY_CODE = {code: status for status, code in _TASK_STATUS_CODES.items()}
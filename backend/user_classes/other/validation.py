@@ -0,0 +1,128 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class BatchValidationError(ValueError):
+    """Exception raised when one or more items of a batch fail validation. Contains all failures of the batch."""
+
+    def __init__(self, failures: List[Tuple[int, str, str]]) -> None:
+        """
+        Initialize the exception with failures of the batch.
+
+        Args:
+            failures (List[Tuple[int, str, str]]): Failures as (item index, field name, error message).
+        """
+        self.failures = failures
+        super().__init__(f'{len(failures)} validation error(s): ' + '; '.join(f'[{index}] {field}: {message}' for index, field, message in failures))
+
+
+class TextRule:
+    """
+    A precompiled validation rule for text fields.
+
+    Args:
+        label (str): Name of the field in error messages.
+        min_length (int): Minimum length of the text.
+        max_length (int): Maximum length of the text.
+        min_alnum (int): Minimum number of alphanumeric characters in the text.
+    """
+    __slots__ = ('label', 'min_length', 'max_length', 'min_alnum')
+
+    def __init__(self, label: str, min_length: int, max_length: int, min_alnum: int) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            label (str): Name of the field in error messages.
+            min_length (int): Minimum length of the text.
+            max_length (int): Maximum length of the text.
+            min_alnum (int): Minimum number of alphanumeric characters in the text.
+        """
+        self.label = label
+        self.min_length = min_length
+        self.max_length = max_length
+        self.min_alnum = min_alnum
+
+    def check(self, value: str) -> Optional[str]:
+        """
+        Check the text against the rule.
+
+        Args:
+            value (str): The text to check.
+
+        Returns:
+            Optional[str]: Error message, None if the text is valid.
+        """
+        length = len(value)
+        if length < self.min_length:
+            return f"{self.label} is too short({length}<{self.min_length})! Your name: {value}"
+        if length > self.max_length:
+            return f"{self.label} is too long({length}>{self.max_length})! Your name: {value}"
+        if self.min_alnum and not self.__has_enough_alnum(value):  # O(n) scan, so it goes after O(1) length checks
+            return f"{self.label} has to be in English! Your name: {value}"
+        return None
+
+    def validate(self, value: str) -> None:
+        """
+        Validate the text against the rule.
+
+        Args:
+            value (str): The text to validate.
+
+        Raises:
+            ValueError: If the text is too short, does not have enough alphanumeric characters, or is too long.
+        """
+        message = self.check(value)
+        if message:
+            raise ValueError(message)
+
+    def __has_enough_alnum(self, value: str) -> bool:
+        """
+        Count alphanumeric characters, stopping as soon as the minimum is reached.
+
+        Args:
+            value (str): The text to check.
+
+        Returns:
+            bool: True if the text has at least min_alnum alphanumeric characters.
+        """
+        remaining = self.min_alnum
+        for c in value:
+            if c.isalnum():
+                remaining -= 1
+                if not remaining:
+                    return True
+        return False
+
+
+# same constraints, as in core/db/db_models.py
+TEXT_RULES_SCHEMA = {
+    'stat.display_name': {'label': 'Stat name', 'min_length': 3, 'max_length': 64, 'min_alnum': 3},
+    'task.display_name': {'label': 'Task name', 'min_length': 3, 'max_length': 128, 'min_alnum': 3},
+    'task.description': {'label': 'Task description', 'min_length': 0, 'max_length': 30000, 'min_alnum': 0},
+}
+
+TEXT_RULES: Dict[str, TextRule] = {name: TextRule(**spec) for name, spec in TEXT_RULES_SCHEMA.items()}
+
+
+def validate_batch(entity: str, items: Iterable[Dict[str, str]]) -> None:
+    """
+    Validate text fields of many items at once (e.g. tasks from bulk import), reporting all failures together.
+
+    Args:
+        entity (str): Entity of the items ('stat' or 'task').
+        items (Iterable[Dict[str, str]]): Items as dictionaries of field values. Fields without rules are skipped.
+
+    Raises:
+        BatchValidationError: If any field of any item is invalid.
+    """
+    rules = [(name.split('.', 1)[1], rule) for name, rule in TEXT_RULES.items() if name.startswith(entity + '.')]
+    failures = []
+    for index, item in enumerate(items):
+        for field, rule in rules:
+            if field not in item:
+                continue
+            message = rule.check(item[field])
+            if message:
+                failures.append((index, field, message))
+    if failures:
+        raise BatchValidationError(failures)
@@ -1,5 +1,5 @@
-import math
-
+from backend.user_classes.level_curve import LevelCurve
+from backend.user_classes.other.validation import TEXT_RULES
 from backend.user_classes.stat_tips import StatTips
 
 class Stat:
@@ -12,11 +12,14 @@ class Stat:
         exp_requirement_mult (float, optional): The multiplier for experience required to level up. Defaults to 1.3.
         exp_requirement_flat_bonus (int, optional): The flat amount added to experience requirement per level. Defaults to 150.
         level_base_requirement (int, optional): The base experience requirement for level 1. Defaults to 100.
+        exp (int, optional): Experience, earned for the Stat. Defaults to 0.
 
     Attributes:
         icon_change_threshold (list): Thresholds upon reaching which the icon would change.
         exp_round_to (int): Experience thresholds will be rounded to this value.
     """
+    __slots__ = ('_display_name', '_icon_base_name', '_level_curve', '_id_name', '_exp', '_level_bracket', 'tips')
+
     icon_change_threshold = [4, 9, 13]  # thresholds, upon reaching which, the icon would change
     exp_round_to = 10  # exp thresholds will be rounded to this value
 
@@ -31,13 +34,14 @@ class Stat:
             exp_requirement_mult (float, optional): The multiplier for experience required to level up. Defaults to 1.3.
             exp_requirement_flat_bonus (int, optional): The flat amount added to experience requirement per level. Defaults to 150.
             level_base_requirement (int, optional): The base experience requirement for level 1. Defaults to 100.
+            exp (int, optional): Experience, earned for the Stat. Defaults to 0.
         """
         self._display_name = None
         self._icon_base_name = None
-        self._exp_requirement_mult = None
-        self._exp_requirement_flat_bonus = None
-        self._level_base_requirement = None
+        self._level_curve = LevelCurve(exp_round_to=self.exp_round_to)
         self._id_name = None
+        self._exp = 0
+        self._level_bracket = None  # (curve, level, min_exp, max_exp) for current exp
 
         self.display_name = display_name
         self.tips:StatTips = tips if tips else StatTips()
@@ -45,6 +49,34 @@ class Stat:
         self.exp_requirement_flat_bonus = exp_requirement_flat_bonus
         self.level_base_requirement = level_base_requirement
         self.icon_base_name = icon_base_name if icon_base_name else self.id_name
+        self.exp = exp
+
+    @classmethod
+    def from_trusted_row(cls, display_name: str, icon_base_name: str = None, tips: StatTips = None, exp_requirement_mult:float=1.3, exp_requirement_flat_bonus:int=150, level_base_requirement:int=100, exp:int=0) -> 'Stat':
+        """
+        Create a Stat from already validated values (e.g. a row from db, where the same constraints are checked), skipping the setters.
+
+        Args:
+            display_name (str): The display name of the Stat.
+            icon_base_name (str, optional): The base name for the icon associated with this Stat. Defaults to None.
+            tips (StatTips, optional): Tips for the Stat. Defaults to None.
+            exp_requirement_mult (float, optional): The multiplier for experience required to level up. Defaults to 1.3.
+            exp_requirement_flat_bonus (int, optional): The flat amount added to experience requirement per level. Defaults to 150.
+            level_base_requirement (int, optional): The base experience requirement for level 1. Defaults to 100.
+            exp (int, optional): Experience, earned for the Stat. Defaults to 0.
+
+        Returns:
+            Stat: The created Stat.
+        """
+        stat = cls.__new__(cls)
+        stat._display_name = display_name
+        stat._id_name = stat.__get_id_name__(display_name)
+        stat._icon_base_name = icon_base_name if icon_base_name else stat._id_name
+        stat._level_curve = LevelCurve(level_base_requirement, float(exp_requirement_mult), exp_requirement_flat_bonus, cls.exp_round_to)
+        stat._exp = exp
+        stat._level_bracket = None
+        stat.tips = tips if tips else StatTips()
+        return stat
 
     @property
     def display_name(self)->str:
@@ -67,15 +99,7 @@ class Stat:
         Raises:
             ValueError: If the display name does not meet length or alphanumeric criteria.
         """
-        min_display_name_length = 3
-        max_display_name_length = 64
-
-        if len(value) < min_display_name_length:
-            raise ValueError(f"Stat name is too short({len(value)}<{min_display_name_length})! Your name: {value}")
-        if len([c for c in value if c.isalnum()]) < min_display_name_length:
-            raise ValueError(f"Stat name has to be in English! Your name: {value}")
-        if len(value) > max_display_name_length:
-            raise ValueError(f"Stat name is too long({len(value)}>{max_display_name_length})! Your name: {value}")
+        TEXT_RULES['stat.display_name'].validate(value)
         self._display_name = value
         self._id_name = self.__get_id_name__(value)
 
@@ -87,7 +111,7 @@ class Stat:
         Returns:
             float: The experience requirement multiplier of the Stat.
         """
-        return self._exp_requirement_mult
+        return self.level_curve.exp_requirement_mult
 
     @exp_requirement_mult.setter
     def exp_requirement_mult(self, value:float):
@@ -105,7 +129,7 @@ class Stat:
         if value<bounds[0] or value>=bounds[1]:
             raise ValueError(f"Stat experience requirement multiplier is outside the bounds({bounds}, {bounds[1]})! Your value: {value}")
         value = round(value, digits_after_decimal)
-        self._exp_requirement_mult = value
+        self._level_curve = self.level_curve.replace(exp_requirement_mult=value)
 
     @property
     def exp_requirement_flat_bonus(self)->int:
@@ -115,7 +139,7 @@ class Stat:
         Returns:
             int: The experience requirement flat bonus of the Stat.
         """
-        return self._exp_requirement_flat_bonus
+        return self.level_curve.exp_requirement_flat_bonus
 
     @exp_requirement_flat_bonus.setter
     def exp_requirement_flat_bonus(self, value:int):
@@ -131,7 +155,7 @@ class Stat:
         bounds = (0, 999999)
         if value<bounds[0] or value>bounds[1]:
             raise ValueError(f"Stat experience requirement flat bonus is outside the bounds({bounds}, {bounds[1]})! Your value: {value}")
-        self._exp_requirement_flat_bonus = value
+        self._level_curve = self.level_curve.replace(exp_requirement_flat_bonus=value)
 
     @property
     def level_base_requirement(self):
@@ -141,7 +165,7 @@ class Stat:
         Returns:
             int: The base experience requirement for level 1 of the Stat.
         """
-        return self._level_base_requirement
+        return self.level_curve.level_base_requirement
 
     @level_base_requirement.setter
     def level_base_requirement(self, value:int):
@@ -157,7 +181,19 @@ class Stat:
         bounds = (0, 999999)
         if value<bounds[0] or value>bounds[1]:
             raise ValueError(f"Stat experience base requirements is outside the bounds({bounds}, {bounds[1]})! Your value: {value}")
-        self._level_base_requirement = value
+        self._level_curve = self.level_curve.replace(level_base_requirement=value)
+
+    @property
+    def level_curve(self) -> LevelCurve:
+        """
+        Get the exp curve of the Stat. The curve is shared between all Stats with the same curve parameters.
+
+        Returns:
+            LevelCurve: The exp curve of the Stat.
+        """
+        if self._level_curve.exp_round_to != self.exp_round_to:
+            self._level_curve = self._level_curve.replace(exp_round_to=self.exp_round_to)
+        return self._level_curve
 
     @property
     def id_name(self):
@@ -218,6 +254,7 @@ class Stat:
         if value<bounds[0] or value>bounds[1]:
             raise ValueError(f"Experience value is outside the bounds({bounds}, {bounds[1]})! Your value: {value}")
         self._exp = value
+        self._level_bracket = None
 
     def __get_id_name__(self, display_name: str = None) -> str:
         """
@@ -235,6 +272,54 @@ class Stat:
         res = ''.join(e for e in display_name if e.isalnum() or e == ' ').lower()
         return res.replace(' ', '_')
 
+    @property
+    def level(self) -> int:
+        """
+        Get the level, corresponding to the experience of the Stat.
+
+        Returns:
+            int: The level of the Stat.
+        """
+        return self.__level_bracket()[1]
+
+    def add_exp(self, delta: int) -> list:
+        """
+        Add experience to the Stat. Level is recalculated only if the new experience leaves the current level bracket.
+
+        Args:
+            delta (int): The amount of experience points to add (can be negative).
+
+        Returns:
+            list (dict): Level-up events, one for each level gained (empty if the level did not increase).
+
+        Raises:
+            ValueError: If the new experience value is outside the bounds.
+        """
+        bracket = self.__level_bracket()
+        self.exp = self._exp + delta
+        curve, level, min_exp, max_exp = bracket
+        if min_exp <= self._exp <= max_exp:
+            self._level_bracket = bracket
+            return []
+
+        exp_res = self.__exp_to_level(self._exp)
+        self._level_bracket = (curve, exp_res['level'], exp_res['min_exp'], exp_res['max_exp'])
+        return [{'display_name': self.display_name, 'level': new_level, 'icon_name': self.get_icon_name_from_level(new_level)}
+                for new_level in range(max(level, 0) + 1, exp_res['level'] + 1)]
+
+    def __level_bracket(self) -> tuple:
+        """
+        Get the level bracket for current experience, calculating it if experience or the exp curve were changed.
+
+        Returns:
+            tuple: Exp curve, level and the range of experience required for that level (curve, level, min_exp, max_exp).
+        """
+        curve = self.level_curve
+        if self._level_bracket is None or self._level_bracket[0] is not curve:
+            exp_res = self.__exp_to_level(self._exp)
+            self._level_bracket = (curve, exp_res['level'], exp_res['min_exp'], exp_res['max_exp'])
+        return self._level_bracket
+
     def get_icon_name_from_level(self, level: int):
         """
         Get the icon name associated with a given level.
@@ -277,9 +362,7 @@ class Stat:
         Returns:
             set (int): set of integers, with lower and upper bound (lower, upper).
         """
-        min_exp = round(self.level_base_requirement * math.pow(self.exp_requirement_mult, level-1)/self.exp_round_to)*self.exp_round_to + self.exp_requirement_flat_bonus * (level-1)
-        max_exp = round(self.level_base_requirement * math.pow(self.exp_requirement_mult, level)/self.exp_round_to)*self.exp_round_to + self.exp_requirement_flat_bonus * (level) - 1
-        return (min_exp, max_exp)
+        return self.level_curve.bounds_for_level(level)
 
     def __exp_to_level(self, exp: int) -> dict:
         """
@@ -291,15 +374,7 @@ class Stat:
         Returns:
             dict: A dictionary containing the calculated level and the range of experience required for that level.
         """
-        if exp < self.level_base_requirement:
-            return {'level': 0, 'min_exp': 0, 'max_exp': self.level_base_requirement-1}
-
-        for i in range(1, 51):
-            min_exp, max_exp = self.bounds_for_level(i)
-            if exp >= min_exp and exp <= max_exp:
-                return {'level': i, 'min_exp': min_exp, 'max_exp': max_exp}
-
-        return {'level': -1, 'min_exp': 0, 'max_exp': 0}
+        return self.level_curve.exp_to_level(exp)
 
     def to_json(self, exp):
         """
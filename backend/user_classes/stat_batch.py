@@ -0,0 +1,45 @@
+from typing import Tuple
+
+import numpy as np
+
+from backend.user_classes.level_curve import LevelCurve
+
+
+def exp_to_level_many(curve: LevelCurve, exp_array) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert many experience values to levels at once. Gives the same results as `LevelCurve.exp_to_level`
+    (and `Stat.exp_to_level`) for every value, including level 0 and level -1 edge cases.
+    Values inside the threshold table are searched with `searchsorted`, values above it fall back to `LevelCurve.exp_to_level`.
+
+    Args:
+        curve (LevelCurve): The exp curve to use (`Stat.level_curve`).
+        exp_array (array-like): Experience values to convert.
+
+    Returns:
+        tuple (np.ndarray): Arrays of levels, minimum and maximum exp of the level (levels, min_exp, max_exp).
+            Bounds use int64 if they fit into it, object dtype (python ints) otherwise.
+    """
+    exp = np.asarray(exp_array, dtype=np.int64)
+    thresholds = curve.thresholds
+    above_table = np.flatnonzero(exp >= thresholds[-1])
+    above_table_res = [curve.exp_to_level(int(exp[i])) for i in above_table]
+    max_bound = max([thresholds[-1]] + [res['max_exp'] for res in above_table_res])
+    thresholds = np.array(thresholds, dtype=np.int64 if max_bound <= np.iinfo(np.int64).max else object)
+
+    # last level, which minimum exp is not bigger than exp (empty levels are skipped this way)
+    levels = np.searchsorted(thresholds, exp, side='right') - 1
+    below_base = exp < curve.level_base_requirement
+    no_level = ~below_base & (levels < 1)
+    levels[below_base] = 0
+    levels[no_level] = -1
+
+    table_index = np.clip(levels, 1, curve.table_max_level)
+    min_exp = thresholds[table_index]
+    max_exp = thresholds[table_index + 1] - 1
+    min_exp[below_base | no_level] = 0
+    max_exp[below_base] = curve.level_base_requirement - 1
+    max_exp[no_level] = 0
+
+    for i, res in zip(above_table, above_table_res):
+        levels[i], min_exp[i], max_exp[i] = res['level'], res['min_exp'], res['max_exp']
+    return levels, min_exp, max_exp
@@ -1,9 +1,13 @@
+from array import array
 from typing import Dict, Optional, List
-from random import choice
+from random import randrange
+
+from backend.user_classes.tip_catalog import TipCatalog
 
 class StatTips:
     """
-    A class to manage tips associated with different levels. 
+    A class to manage tips associated with different levels. Tip text is kept in a shared, immutable TipCatalog,
+    while the StatTips only holds the rotation state of one user: the index of the last used tip for every level.
 
     Args:
         tips (Optional[Dict[int, List[str]]]): Dictionary containing tips for specific levels. Default is None.
@@ -15,7 +19,10 @@ class StatTips:
         tips (dict): Dictionary containing tips for each level.
         min_level (int): Minimum level bound.
         max_level (int): Maximum level bound.
+        catalog (TipCatalog): The shared catalog of tips.
+        rotation (array): Index of the last used tip for every level in min_level..max_level, -1 if none was used.
     """
+    __slots__ = ('_catalog', '_rotation', 'show_lower_level_tips')
 
     def __init__(self, tips: Optional[Dict[int, List[str]]]=None, min_level=0, max_level=30, show_lower_level_tips=True) -> None:
         """
@@ -30,31 +37,35 @@ class StatTips:
         Raises:
             ValueError: if min_level or max_level is outside the bounds, if max_level is smaller than min_level
         """
-        level_bounds = (0, 100)
-        if min_level<level_bounds[0] or min_level>level_bounds[1]:
-            raise ValueError(f"Minimum level is outside the bounds({level_bounds[0]}-{level_bounds[1]})! Your value: {min_level}.")
-        if max_level<level_bounds[0] or max_level>level_bounds[1]:
-            raise ValueError(f"Max level is outside the bounds({level_bounds[0]}-{level_bounds[1]})! Your value: {max_level}.")
-        if max_level<min_level: 
-            raise ValueError(f'Max_level cannot be smaller than min_level!')
-        #TODO: add test for constraints
-
-        self._min_level = min_level
-        self._max_level = max_level
         self.show_lower_level_tips = show_lower_level_tips
+        self.catalog = TipCatalog(tips, min_level, max_level)
+
+    @classmethod
+    def from_catalog(cls, catalog: TipCatalog, show_lower_level_tips=True) -> 'StatTips':
+        """
+        Create a StatTips with fresh rotation state over an existing catalog (e.g. one per user of a Stat).
 
-        self.tips = tips
-        self.previously_used_tip = {level: '' for level in range(min_level, max_level+1)}
+        Args:
+            catalog (TipCatalog): The shared catalog of tips.
+            show_lower_level_tips (bool): Whether to show tips from lower levels. Default is True.
+
+        Returns:
+            StatTips: The created StatTips.
+        """
+        stat_tips = cls.__new__(cls)
+        stat_tips.show_lower_level_tips = show_lower_level_tips
+        stat_tips.catalog = catalog
+        return stat_tips
 
     @property
     def tips(self) -> dict:
         """
-        Get the dictionary of tips for each level.
+        Get the dictionary of tips for each level. The dictionary is a copy, use `append` or the setter to change tips.
 
         Returns:
             dict: A dictionary containing tips for each level. Structure is Dict[level, List[tip]]
         """
-        return self._tips
+        return self._catalog.to_dict()
     
     @property
     def min_level(self) -> int:
@@ -64,7 +75,7 @@ class StatTips:
         Returns:
             int: The minimum level bound.
         """
-        return self._min_level
+        return self._catalog.min_level
     
     @property
     def max_level(self) -> int:
@@ -74,7 +85,7 @@ class StatTips:
         Returns:
             int: The maximum level bound.
         """
-        return self._max_level
+        return self._catalog.max_level
     
     @tips.setter
     def tips(self, value: Dict[int, List[str]]):
@@ -84,9 +95,64 @@ class StatTips:
         Args:
             value (Dict[int, List[str]]): Dictionary containing tips for specific levels.
         """
-        self._tips = {level: [] for level in range(self.min_level, self.max_level + 1)}
-        if value:
-            self.append(value)
+        self.catalog = TipCatalog(value, self.min_level, self.max_level)
+
+    @property
+    def catalog(self) -> TipCatalog:
+        """
+        Get the shared catalog of tips.
+
+        Returns:
+            TipCatalog: The catalog of tips.
+        """
+        return self._catalog
+
+    @catalog.setter
+    def catalog(self, value: TipCatalog):
+        """
+        Set the catalog of tips and reset the rotation state.
+
+        Args:
+            value (TipCatalog): The catalog of tips.
+        """
+        self._catalog = value
+        self._rotation = array('i', [-1]) * value.level_count
+
+    @property
+    def rotation(self) -> array:
+        """
+        Get the rotation state: index of the last used tip for every level in min_level..max_level, -1 if none was used.
+
+        Returns:
+            array: The rotation state.
+        """
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value: array):
+        """
+        Set the rotation state (e.g. restore one, that was stored for the user).
+
+        Args:
+            value (array): Index of the last used tip for every level in min_level..max_level, -1 if none was used.
+
+        Raises:
+            ValueError: If the length of the value does not match the number of levels.
+        """
+        if len(value) != self._catalog.level_count:
+            raise ValueError(f'Rotation state should have {self._catalog.level_count} levels! Your value: {len(value)}')
+        self._rotation = array('i', value)
+
+    @property
+    def previously_used_tip(self) -> Dict[int, str]:
+        """
+        Get the last used tip for each level.
+
+        Returns:
+            dict: A dictionary containing the last used tip for each level, empty string if none was used.
+        """
+        return {level: self._catalog.tips_for_level(level)[index] if index >= 0 else ''
+                for level, index in zip(range(self.min_level, self.max_level + 1), self._rotation)}
 
     def append(self, value:Dict[int, str]):
         """
@@ -95,10 +161,7 @@ class StatTips:
         Args:
             value (Dict[int, List[str]]): Dictionary containing tips for specific levels.
         """
-        for level, tip_list in value.items():
-            if level < self.min_level or level > self.max_level:
-                continue
-            self._tips[level] += tip_list
+        self._catalog = self._catalog.extend(value)  # tips are only added at the end, so used indices stay valid
 
     def get_tip_for_level(self, level)->str:
         """
@@ -113,49 +176,37 @@ class StatTips:
         Raises:
             ValueError: If the provided level is outside the valid level bounds.
         """
-        if level < self.min_level or level > self.max_level:
-            raise ValueError(f'Level({level}) exceeds level bounds({self.min_level}, {self.max_level})')
-        
-        previous_levels_search_depth = 2 # func can return level-previous_levels_search_depth level tips. show_lower_level_tips must be true
-
-        actual_search_depth = previous_levels_search_depth if level-previous_levels_search_depth > 0 else 0
-
-        res = None
-        for i in range(actual_search_depth+1):
-            text = self.__get_tip_for_level(level-i)
-            if text != '':
-                res = f'You have {"reached" if level-i == level else "passed"} level {level-i}! That means that: '
-                res += text
-                break
-        
-        if not res:
+        tip_level = self._catalog.nearest_tip_level(level)  # lower levels are searched up to TipCatalog.search_depth
+        if tip_level is None:
             raise ValueError(f'No tips available for level {level}')
 
-        return res
+        return f'You have {"reached" if tip_level == level else "passed"} level {tip_level}! That means that: ' + self.__get_tip_for_level(tip_level)
     
     def __get_tip_for_level(self, level):
         """
-        Get a tip associated with the given level (actual calculation).
+        Get a tip associated with the given level (actual calculation). A random tip is picked by index, skipping
+        the last used one.
 
         Args:
-            level (int): The level for which to get the tip.
+            level (int): The level for which to get the tip, must have tips.
 
         Returns:
             str: The tip associated with the given level.
         """
-        res = ''
-        if len(self.tips[level]) == 0:
-            return res
-        elif len(self.tips[level]) == 1:
-            res = self.tips[level][0]
+        tip_list = self._catalog.tips_for_level(level)
+        offset = level - self._catalog.min_level
+        if len(tip_list) == 1:
+            index = 0
         else:
-            tip_list = self.tips[level][:]
-            if self.previously_used_tip[level] in tip_list:
-                tip_list.remove(self.previously_used_tip[level])
-            res = choice(tip_list)
-        
-        self.previously_used_tip[level] = res
-        return res
+            last = self._rotation[offset]
+            if last < 0:
+                index = randrange(len(tip_list))
+            else:
+                index = randrange(len(tip_list) - 1)
+                index += index >= last
+
+        self._rotation[offset] = index
+        return tip_list[index]
     
     def __str__(self) -> str:
         """
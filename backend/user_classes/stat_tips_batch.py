@@ -0,0 +1,72 @@
+from typing import List, Optional
+
+import numpy as np
+
+from backend.user_classes.stat_tips import StatTips
+
+
+def new_rotations(stat_tips: StatTips, count: int) -> np.ndarray:
+    """
+    Create rotation states, where no tip was used yet, for `get_tips_for_levels`.
+
+    Args:
+        stat_tips (StatTips): Tips, the rotation states are for.
+        count (int): The number of rotation states (rows).
+
+    Returns:
+        np.ndarray: An int32 array of shape (count, number of levels) filled with -1.
+    """
+    return np.full((count, stat_tips.catalog.level_count), -1, dtype=np.int32)
+
+
+def get_tips_for_levels(stat_tips: StatTips, levels, rotations: np.ndarray, rng: np.random.Generator = None) -> List[Optional[str]]:
+    """
+    Get tips for many levels at once (e.g. a level-up notification for every user of the Stat). Gives the same
+    messages as `StatTips.get_tip_for_level`, but uses the rotation state row of every level instead of the own one.
+    Levels outside the level bounds get None instead of failing the whole batch.
+
+    Args:
+        stat_tips (StatTips): Tips to pick from.
+        levels (array-like): Levels to get tips for.
+        rotations (np.ndarray): Rotation state of every level, an integer array of shape (len(levels), number of levels),
+            see `new_rotations` and `StatTips.rotation`. Rows are updated in place with the picked tips.
+        rng (np.random.Generator, optional): Random generator, pass a seeded one for reproducible tips. Defaults to a new generator.
+
+    Returns:
+        List[Optional[str]]: The tip for every level, None for levels without tips and levels outside the level bounds.
+
+    Raises:
+        ValueError: If the shape of rotations does not match.
+    """
+    levels = np.asarray(levels, dtype=np.int64)
+    catalog = stat_tips.catalog
+    if rotations.shape != (len(levels), catalog.level_count):
+        raise ValueError(f'Rotations should have shape {(len(levels), catalog.level_count)}! Your value: {rotations.shape}')
+    rng = rng if rng is not None else np.random.default_rng()
+
+    tip_offsets = np.array([-1 if tip_level is None else tip_level - catalog.min_level for tip_level in catalog.nearest_tip_levels], dtype=np.int64)
+    level_tips = [catalog.tips_for_level(level) for level in range(catalog.min_level, catalog.max_level + 1)]
+    tip_counts = np.array([len(tip_list) for tip_list in level_tips], dtype=np.int64)
+
+    offsets = np.full(len(levels), -1, dtype=np.int64)
+    in_bounds = (levels >= catalog.min_level) & (levels <= catalog.max_level)
+    offsets[in_bounds] = tip_offsets[levels[in_bounds] - catalog.min_level]
+    rows = np.flatnonzero(offsets >= 0)
+    offsets = offsets[rows]
+    counts = tip_counts[offsets]
+    last = rotations[rows, offsets]
+    skip_last = (last >= 0) & (counts > 1)  # same rule as StatTips.get_tip_for_level: random index, that skips the last one
+    indexes = rng.integers(0, counts - skip_last)
+    indexes += skip_last & (indexes >= last)
+    rotations[rows, offsets] = indexes
+
+    res = [None] * len(levels)
+    prefixes = {}
+    level_list = levels.tolist()
+    for row, offset, index in zip(rows.tolist(), offsets.tolist(), indexes.tolist()):
+        key = (offset + catalog.min_level, level_list[row])
+        prefix = prefixes.get(key)
+        if prefix is None:
+            prefix = prefixes[key] = f'You have {"reached" if key[0] == key[1] else "passed"} level {key[0]}! That means that: '
+        res[row] = prefix + level_tips[offset][index]
+    return res
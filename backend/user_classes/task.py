@@ -2,6 +2,7 @@ import datetime
 from typing import Dict, Optional, List
 
 from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.other.validation import TEXT_RULES
 from backend.user_classes.stat import Stat
 
 
@@ -34,6 +35,9 @@ class Task:
         creation_time (datetime.datetime): The time when the task was created.
         status (TaskStatus): The status of the task (IN_PROGRESS, COMPLETED, etc.).
     """
+    __slots__ = ('_display_name', '_asociated_stat', '_description', '_difficulty_modifier', '_time_modifier', '_base_exp_reward',
+                 '_due_date', '_creation_time', '_status', '_due_date_penalty', '_observers')
+
     exp_round_to = 2
     time_modifier_penalty = 0.2
 
@@ -65,8 +69,9 @@ class Task:
         self._base_exp_reward = None
         self._due_date: datetime.datetime = None
         self._creation_time = datetime.datetime.now()
-        self.status = TaskStatus.IN_PROGRESS
+        self._status = TaskStatus.IN_PROGRESS
         self._due_date_penalty = 0
+        self._observers = ()
         
         self.display_name = display_name
         self.asociated_stat = asociated_stat 
@@ -77,6 +82,42 @@ class Task:
         if due_date:
             self.due_date = due_date
 
+    @classmethod
+    def from_trusted_row(cls, display_name: str, asociated_stat: Dict[Stat, float], description: str = 'Add more info about your task', difficulty_modifier: float = 1,
+                         time_modifier: float = 1, base_exp_reward: int = 10, due_date: datetime.datetime = None, due_date_penalty: float = 0.25,
+                         creation_time: datetime.datetime = None, status: TaskStatus = TaskStatus.IN_PROGRESS) -> 'Task':
+        """
+        Create a Task from already validated values (e.g. a row from db, where the same constraints are checked), skipping the setters.
+
+        Args:
+            display_name (str): The display name of the task.
+            asociated_stat (Dict[Stat, float]): Dictionary of the associated Stat objects for the task with values, representing significane of stat for the task. Used as is, without copying.
+            description (str, optional): A description of the task. Defaults to 'Add more info about your task'.
+            difficulty_modifier (float, optional): An exp modifier, representing task difficulty. Defaults to 1.
+            time_modifier (float, optional): An exp modifier, representing task time consumption. Defaults to 1.
+            base_exp_reward (int, optional): The base exp reward for completing the task. Defaults to 10.
+            due_date (datetime.datetime, optional): The due_date for completing the task. Defaults to None.
+            due_date_penalty (float, optional): Exp penalty for missing the due_date. Defaults to 0.25.
+            creation_time (datetime.datetime, optional): The time when the task was created. Defaults to now.
+            status (TaskStatus, optional): The status of the task. Defaults to IN_PROGRESS.
+
+        Returns:
+            Task: The created Task.
+        """
+        task = cls.__new__(cls)
+        task._display_name = display_name
+        task._asociated_stat = asociated_stat
+        task._description = description
+        task._difficulty_modifier = difficulty_modifier
+        task._time_modifier = time_modifier
+        task._base_exp_reward = base_exp_reward
+        task._due_date = due_date
+        task._due_date_penalty = due_date_penalty
+        task._creation_time = creation_time if creation_time else datetime.datetime.now()
+        task._status = status
+        task._observers = ()
+        return task
+
     @property
     def display_name(self) -> str:
         """
@@ -98,15 +139,7 @@ class Task:
         Raises:
             ValueError: If the provided display name is too short, not in English, or too long.
         """
-        min_display_name_length = 3
-        max_display_name_length = 128
-
-        if len(value) < min_display_name_length:
-            raise ValueError(f"Task name is too short({len(value)}<{min_display_name_length})! Your name: {value}")
-        if len([c for c in value if c.isalnum()]) < min_display_name_length:
-            raise ValueError(f"Task name has to be in English! Your name: {value}")
-        if len(value) > max_display_name_length:
-            raise ValueError(f"Task name is too long({len(value)}>{max_display_name_length})! Your name: {value}")
+        TEXT_RULES['task.display_name'].validate(value)
         self._display_name = value
 
     @property
@@ -160,15 +193,7 @@ class Task:
         Raises:
             ValueError: If the provided description is too short, not in English, or too long.
         """
-        min_description_length = 0
-        max_description_length = 30000
-
-        if len(value) < min_description_length:
-            raise ValueError(f"Task description is too short({len(value)}<{min_description_length})! Your name: {value}")
-        if len([c for c in value if c.isalnum()]) < min_description_length:
-            raise ValueError(f"Task description has to be in English! Your name: {value}")
-        if len(value) > max_description_length:
-            raise ValueError(f"Task description is too long({len(value)}>{max_description_length})! Your name: {value}")
+        TEXT_RULES['task.description'].validate(value)
         self._description = value
 
     @property
@@ -282,7 +307,35 @@ class Task:
         """
         if value < self.creation_time:
             raise ValueError(f"Task due_date cannot be set in the past! Your value: {value}")
+        old_value = self._due_date
         self._due_date = value
+        if value != old_value:
+            for observer in self._observers:
+                observer.on_due_date_change(self, old_value)
+
+    @property
+    def status(self) -> TaskStatus:
+        """
+        Get the status of the task.
+
+        Returns:
+            TaskStatus: The status of the task.
+        """
+        return self._status
+
+    @status.setter
+    def status(self, value: TaskStatus):
+        """
+        Set the status of the task and notify observers about the change.
+
+        Args:
+            value (TaskStatus): The new status for the task.
+        """
+        old_value = self._status
+        self._status = value
+        if value != old_value:
+            for observer in self._observers:
+                observer.on_status_change(self, old_value)
 
     @property
     def due_date_penalty(self) -> float:
@@ -310,6 +363,25 @@ class Task:
             raise ValueError(f"Task due_date penalty is outside the bounds({bounds[0]}, {bounds[1]})! Your value: {value}")
         self._due_date_penalty = value
 
+    def add_observer(self, observer) -> None:
+        """
+        Subscribe an observer (e.g. a task index) to status and due_date changes of the task.
+
+        Args:
+            observer: Object with `on_status_change(task, old_status)` and `on_due_date_change(task, old_due_date)` methods.
+        """
+        if observer not in self._observers:
+            self._observers += (observer,)
+
+    def remove_observer(self, observer) -> None:
+        """
+        Unsubscribe the observer from changes of the task.
+
+        Args:
+            observer: Previously added observer.
+        """
+        self._observers = tuple(o for o in self._observers if o is not observer)
+
     def complete_task(self) -> int:
         """
         Calculate reward based on modifiers and due_date penalty if status is past due. Changes status to Completed after Due Date or Completed afterwards.
@@ -0,0 +1,78 @@
+import datetime
+from typing import List
+
+import numpy as np
+
+from backend.user_classes.exp_ledger import ExpLedger
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.task import Task
+
+
+def calculate_rewards(base_exp_reward, difficulty_modifier, time_modifier, due_date_penalty, past_due) -> np.ndarray:
+    """
+    Calculate task completion rewards for arrays of task values, with the same rounding as `Task.complete_task`.
+
+    Args:
+        base_exp_reward (array-like): Base exp rewards of the tasks.
+        difficulty_modifier (array-like): Difficulty modifiers of the tasks.
+        time_modifier (array-like): Time modifiers of the tasks.
+        due_date_penalty (array-like): Due_date penalties of the tasks.
+        past_due (array-like): Whether each task is completed after its due_date.
+
+    Returns:
+        np.ndarray: Exp rewards (int64).
+    """
+    base_exp_reward = np.asarray(base_exp_reward, dtype=np.float64)
+    # same order of operations as in Task.complete_task, so float results are identical
+    reward = np.round(base_exp_reward * difficulty_modifier * time_modifier * (1-Task.time_modifier_penalty) / Task.exp_round_to) * Task.exp_round_to
+    penalized = np.round((1-np.asarray(due_date_penalty, dtype=np.float64)) * reward)
+    return np.where(past_due, penalized, reward).astype(np.int64)
+
+
+def complete_tasks(tasks: List[Task], now: datetime.datetime = None, ledger: ExpLedger = None) -> dict:
+    """
+    Complete many tasks at once (e.g. offline sync). Rewards are calculated in one vectorized pass and match `Task.complete_task`.
+    Already completed tasks are skipped instead of raising TaskAlreadyCompletedError.
+
+    Args:
+        tasks (List[Task]): Tasks to complete.
+        now (datetime.datetime, optional): Completion time, used for due_date checks. Defaults to datetime.now().
+        ledger (ExpLedger, optional): Ledger to record split rewards in (e.g. to apply them to a UserProfile later). Defaults to a new ledger.
+
+    Returns:
+        dict: A dictionary with rewards for each task (None for skipped tasks), skipped (already completed) tasks,
+            and exp of this batch, split over asociated_stat weights and aggregated per Stat.
+    """
+    now = now if now else datetime.datetime.now()
+    completed_statuses = (TaskStatus.COMPLETED, TaskStatus.COMPLETED_AFTER_DUE_DATE)
+    positions = {}  # task -> position in tasks, repeated tasks are completed only once
+    skipped = []
+    for position, task in enumerate(tasks):
+        if task.status in completed_statuses or task in positions:
+            skipped.append(task)
+        else:
+            positions[task] = position
+    to_complete = list(positions)
+
+    past_due = [task.status == TaskStatus.PAST_DUE or (task.due_date is not None and task.due_date < now) for task in to_complete]
+    rewards = calculate_rewards([task.base_exp_reward for task in to_complete],
+                                [task.difficulty_modifier for task in to_complete],
+                                [task.time_modifier for task in to_complete],
+                                [task.due_date_penalty for task in to_complete],
+                                past_due).tolist()
+
+    task_rewards = [None] * len(tasks)
+    batch_ledger = ExpLedger()
+    for task, reward, is_past_due in zip(to_complete, rewards, past_due):
+        task.status = TaskStatus.COMPLETED_AFTER_DUE_DATE if is_past_due else TaskStatus.COMPLETED
+        task_rewards[positions[task]] = reward
+        batch_ledger.add_completion(task, reward)
+
+    if ledger is not None:
+        for stat, delta in batch_ledger.deltas.items():
+            ledger.add(stat, delta)
+    return {
+        'rewards': task_rewards,
+        'skipped': skipped,
+        'stat_exp': batch_ledger.deltas,
+    }
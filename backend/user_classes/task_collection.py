@@ -0,0 +1,339 @@
+import datetime
+import itertools
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator, List
+
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.task import Task
+
+
+class TaskCollection:
+    """
+    An insertion-ordered collection of unique tasks. Tasks are indexed by identity, so add, remove and membership checks are O(1).
+    Collection also keeps secondary indexes by status and by due_date, which are updated whenever a task in it changes
+    (e.g. in `complete_task` or `check_for_due_date`), so filtered views cost time proportional to the result size.
+
+    Args:
+        tasks (Iterable[Task], optional): Tasks to add to the collection. Defaults to empty.
+    """
+    __slots__ = ('_index', '_by_status', '_by_due_date', '_due_date_entries', '_entry_counter')
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        """
+        Initialize the collection with provided tasks.
+
+        Args:
+            tasks (Iterable[Task], optional): Tasks to add to the collection. Defaults to empty.
+        """
+        self._index = {}  # dict keeps insertion order, values are unused
+        self._by_status = {status: {} for status in TaskStatus}
+        self._by_due_date = _SortedEntries()  # (due_date, entry number, task), entry number keeps tasks out of comparisons
+        self._due_date_entries = {}
+        self._entry_counter = itertools.count()
+        self.extend(tasks)
+
+    def add(self, task: Task) -> bool:
+        """
+        Add the task to the end of the collection, if it is not in the collection yet.
+
+        Args:
+            task (Task): The Task object to add.
+
+        Returns:
+            bool: True if the task was added, False if it was already in the collection.
+        """
+        entry = self.__add(task)
+        if entry is False:
+            return False
+        if entry:
+            self._by_due_date.add(entry)
+        return True
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        """
+        Add tasks to the end of the collection, skipping tasks that are already in it. The due_date index is updated once
+        for all tasks.
+
+        Args:
+            tasks (Iterable[Task]): Tasks to add.
+        """
+        entries = [entry for entry in map(self.__add, tasks) if entry]
+        self._by_due_date.update(entries)
+
+    def __add(self, task: Task):
+        """
+        Add the task to the collection and its status index, if it is not in the collection yet.
+        The due_date index is left to the caller.
+
+        Args:
+            task (Task): The Task object to add.
+
+        Returns:
+            tuple: The due_date index entry of the task, None if it has no due_date, False if it was already in the collection.
+        """
+        if task in self._index:
+            return False
+        self._index[task] = None
+        self._by_status[task.status][task] = None
+        task.add_observer(self)
+        if not task.due_date:
+            return None
+        entry = (task.due_date, next(self._entry_counter), task)
+        self._due_date_entries[task] = entry
+        return entry
+
+    def remove(self, task: Task) -> None:
+        """
+        Remove the task from the collection.
+
+        Args:
+            task (Task): The Task object to be removed.
+
+        Raises:
+            ValueError: If the task is not in the collection.
+        """
+        try:
+            del self._index[task]
+        except KeyError:
+            raise ValueError(f'Task ({task.display_name}) is not in the collection') from None
+        del self._by_status[task.status][task]
+        self.__unindex_due_date(task)
+        task.remove_observer(self)
+
+    def with_status(self, *statuses: TaskStatus) -> List[Task]:
+        """
+        Get tasks with any of the provided statuses.
+
+        Args:
+            *statuses (TaskStatus): Statuses to look for.
+
+        Returns:
+            List[Task]: Tasks with the statuses (in order of statuses, then in order of status changes).
+        """
+        return [task for status in statuses for task in self._by_status[status]]
+
+    def due_between(self, start: datetime.datetime = None, end: datetime.datetime = None) -> List[Task]:
+        """
+        Get tasks with due_date in the range [start, end), ordered by due_date.
+
+        Args:
+            start (datetime.datetime, optional): Start of the range (inclusive). Defaults to no lower bound.
+            end (datetime.datetime, optional): End of the range (exclusive). Defaults to no upper bound.
+
+        Returns:
+            List[Task]: Tasks, which due_date is in the range.
+        """
+        return [entry[2] for entry in self._by_due_date.irange((start,) if start else None, (end,) if end else None)]
+
+    def on_status_change(self, task: Task, old_status: TaskStatus) -> None:
+        """
+        Move the task to the index of its new status.
+
+        Args:
+            task (Task): The changed task.
+            old_status (TaskStatus): Status of the task before the change.
+        """
+        del self._by_status[old_status][task]
+        self._by_status[task.status][task] = None
+
+    def on_due_date_change(self, task: Task, old_due_date: datetime.datetime) -> None:
+        """
+        Move the task to the position of its new due_date.
+
+        Args:
+            task (Task): The changed task.
+            old_due_date (datetime.datetime): Due_date of the task before the change.
+        """
+        self.__unindex_due_date(task)
+        self.__index_due_date(task)
+
+    def __index_due_date(self, task: Task) -> None:
+        """
+        Add the task to the due_date index, if it has due_date.
+
+        Args:
+            task (Task): The task to index.
+        """
+        if task.due_date:
+            entry = (task.due_date, next(self._entry_counter), task)
+            self._by_due_date.add(entry)
+            self._due_date_entries[task] = entry
+
+    def __unindex_due_date(self, task: Task) -> None:
+        """
+        Remove the task from the due_date index, if it is there.
+
+        Args:
+            task (Task): The task to remove.
+        """
+        entry = self._due_date_entries.pop(task, None)
+        if entry:
+            self._by_due_date.remove(entry)
+
+    def __contains__(self, task: object) -> bool:
+        """
+        Check if the task is in the collection.
+
+        Args:
+            task (object): The task to look for.
+
+        Returns:
+            bool: True if the task is in the collection.
+        """
+        return task in self._index
+
+    def __len__(self) -> int:
+        """
+        Get the number of tasks in the collection.
+
+        Returns:
+            int: The number of tasks.
+        """
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Task]:
+        """
+        Iterate over tasks in insertion order.
+
+        Returns:
+            Iterator[Task]: Iterator over tasks.
+        """
+        return iter(self._index)
+
+    def __getitem__(self, position: int) -> Task:
+        """
+        Get the task by its position in insertion order. O(n), use iteration for sequential access.
+
+        Args:
+            position (int): Position of the task (negative values count from the end).
+
+        Returns:
+            Task: The task at the position.
+
+        Raises:
+            IndexError: If the position is outside the collection.
+        """
+        return list(self._index)[position]
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the TaskCollection object.
+
+        Returns:
+            str: A string representation of the TaskCollection object.
+        """
+        return f'TaskCollection({list(self._index)})'
+
+
+class _SortedEntries:
+    """
+    A sorted list of index entries, split into buckets of up to 2 * `bucket_size` entries. Add and remove shift entries
+    of one bucket only, instead of the whole list.
+
+    Attributes:
+        bucket_size (int): Usual number of entries in a bucket.
+    """
+    __slots__ = ('_buckets', '_maxes', '_len')
+
+    bucket_size = 512
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty list.
+        """
+        self._buckets: List[list] = []
+        self._maxes: list = []  # last entry of every bucket
+        self._len = 0
+
+    def add(self, entry: tuple) -> None:
+        """
+        Insert the entry.
+
+        Args:
+            entry (tuple): The entry to insert.
+        """
+        if not self._buckets:
+            self._buckets.append([entry])
+            self._maxes.append(entry)
+        else:
+            i = min(bisect_left(self._maxes, entry), len(self._buckets) - 1)
+            bucket = self._buckets[i]
+            insort(bucket, entry)
+            self._maxes[i] = bucket[-1]
+            if len(bucket) > 2 * self.bucket_size:
+                self._buckets[i:i + 1] = [bucket[:self.bucket_size], bucket[self.bucket_size:]]
+                self._maxes[i:i + 1] = [bucket[self.bucket_size - 1], bucket[-1]]
+        self._len += 1
+
+    def update(self, entries: List[tuple]) -> None:
+        """
+        Insert many entries. Big batches are sorted together with existing entries once.
+
+        Args:
+            entries (List[tuple]): Entries to insert.
+        """
+        if len(entries) * 8 < self._len:
+            for entry in entries:
+                self.add(entry)
+            return
+        merged = list(self)
+        merged += entries
+        merged.sort()
+        self._buckets = [merged[i:i + self.bucket_size] for i in range(0, len(merged), self.bucket_size)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(merged)
+
+    def remove(self, entry: tuple) -> None:
+        """
+        Remove the entry, that is in the list.
+
+        Args:
+            entry (tuple): The entry to remove.
+        """
+        i = bisect_left(self._maxes, entry)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, entry)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+        self._len -= 1
+
+    def irange(self, start: tuple = None, end: tuple = None) -> Iterator[tuple]:
+        """
+        Iterate over entries in the range [start, end).
+
+        Args:
+            start (tuple, optional): Start of the range (inclusive). Defaults to no lower bound.
+            end (tuple, optional): End of the range (exclusive). Defaults to no upper bound.
+
+        Returns:
+            Iterator[tuple]: Iterator over entries in the range, in order.
+        """
+        first = bisect_left(self._maxes, start) if start is not None else 0
+        for i in range(first, len(self._buckets)):
+            bucket = self._buckets[i]
+            low = bisect_left(bucket, start) if start is not None and i == first else 0
+            if end is not None and bucket[-1] >= end:
+                yield from itertools.islice(bucket, low, bisect_left(bucket, end))
+                return
+            yield from itertools.islice(bucket, low, None)
+
+    def __len__(self) -> int:
+        """
+        Get the number of entries.
+
+        Returns:
+            int: The number of entries.
+        """
+        return self._len
+
+    def __iter__(self) -> Iterator[tuple]:
+        """
+        Iterate over entries in order.
+
+        Returns:
+            Iterator[tuple]: Iterator over entries.
+        """
+        return itertools.chain.from_iterable(self._buckets)
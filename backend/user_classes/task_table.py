@@ -0,0 +1,264 @@
+import datetime
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from backend.user_classes.other.enums import TaskStatus
+from backend.user_classes.task import Task
+from backend.user_classes.task_batch import calculate_rewards
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class TaskTable:
+    """
+    A columnar (struct-of-arrays) store of tasks for analytics over many tasks. Every task field is kept in its own
+    NumPy array, so filters and aggregations are vectorized, and a task costs tens of bytes instead of a Task object.
+    Display names, descriptions and asociated_stat dictionaries are kept as references, shared with the source tasks.
+
+    Args:
+        columns (dict): Arrays for every column in `columns`, all of the same length.
+
+    Attributes:
+        columns (tuple): Names of the columns.
+        no_due_date (int): Value of due_date column for tasks without due_date.
+    """
+    columns = ('status', 'difficulty_modifier', 'time_modifier', 'base_exp_reward', 'due_date_penalty', 'due_date', 'creation_time',
+               'profile_id', 'display_name', 'description', 'asociated_stat')
+    __slots__ = columns
+    no_due_date = np.iinfo(np.int64).min
+
+    def __init__(self, columns: dict) -> None:
+        """
+        Initialize the table from column arrays.
+
+        Args:
+            columns (dict): Arrays for every column in `columns`, all of the same length.
+
+        Raises:
+            ValueError: If a column is missing or columns have different lengths.
+        """
+        if set(columns) != set(self.columns):
+            raise ValueError(f'Columns do not match! Expected: {self.columns}, your columns: {tuple(columns)}')
+        if len({len(column) for column in columns.values()}) > 1:
+            raise ValueError(f'Columns have different lengths!')
+        for name in self.columns:
+            setattr(self, name, columns[name])
+
+    @classmethod
+    def from_tasks(cls, tasks: Sequence[Task], profile_ids: Union[int, Sequence[int]] = -1) -> 'TaskTable':
+        """
+        Create a table from Task objects.
+
+        Args:
+            tasks (Sequence[Task]): Tasks to store.
+            profile_ids (Union[int, Sequence[int]], optional): Profile id for every task, or one id for all of them. Defaults to -1.
+
+        Returns:
+            TaskTable: The table with tasks.
+        """
+        display_name = np.empty(len(tasks), dtype=object)
+        display_name[:] = [task.display_name for task in tasks]
+        description = np.empty(len(tasks), dtype=object)
+        description[:] = [task.description for task in tasks]
+        asociated_stat = np.empty(len(tasks), dtype=object)
+        asociated_stat[:] = [task.asociated_stat for task in tasks]
+        return cls({
+            'status': np.array([task.status.code for task in tasks], dtype=np.int8),
+            'difficulty_modifier': np.array([task.difficulty_modifier for task in tasks], dtype=np.float64),
+            'time_modifier': np.array([task.time_modifier for task in tasks], dtype=np.float64),
+            'base_exp_reward': np.array([task.base_exp_reward for task in tasks], dtype=np.int32),
+            'due_date_penalty': np.array([task.due_date_penalty for task in tasks], dtype=np.float64),
+            'due_date': np.array([to_epoch(task.due_date) for task in tasks], dtype=np.int64),
+            'creation_time': np.array([to_epoch(task.creation_time) for task in tasks], dtype=np.int64),
+            'profile_id': np.broadcast_to(np.asarray(profile_ids, dtype=np.int64), (len(tasks),)).copy(),
+            'display_name': display_name,
+            'description': description,
+            'asociated_stat': asociated_stat,
+        })
+
+    def to_tasks(self) -> List[Task]:
+        """
+        Convert the table back to Task objects.
+
+        Returns:
+            List[Task]: Tasks of the table, in table order.
+        """
+        return [Task.from_trusted_row(display_name, asociated_stat, description=description, difficulty_modifier=difficulty_modifier, time_modifier=time_modifier,
+                                      base_exp_reward=base_exp_reward, due_date=from_epoch(due_date), due_date_penalty=due_date_penalty,
+                                      creation_time=from_epoch(creation_time), status=TaskStatus.from_code(status))
+                for status, difficulty_modifier, time_modifier, base_exp_reward, due_date_penalty, due_date, creation_time, display_name, description, asociated_stat
+                in zip(self.status.tolist(), self.difficulty_modifier.tolist(), self.time_modifier.tolist(), self.base_exp_reward.tolist(),
+                       self.due_date_penalty.tolist(), self.due_date.tolist(), self.creation_time.tolist(), self.display_name, self.description,
+                       self.asociated_stat)]
+
+    def filter(self, mask: np.ndarray) -> 'TaskTable':
+        """
+        Get rows of the table, selected by a boolean mask (or an array of row indices).
+
+        Args:
+            mask (np.ndarray): Boolean mask or row indices.
+
+        Returns:
+            TaskTable: A new table with selected rows.
+        """
+        return TaskTable({name: getattr(self, name)[mask] for name in self.columns})
+
+    def status_mask(self, *statuses: TaskStatus) -> np.ndarray:
+        """
+        Get a mask of tasks with any of the provided statuses.
+
+        Args:
+            *statuses (TaskStatus): Statuses to look for.
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        return np.isin(self.status, [status.code for status in statuses])
+
+    def overdue_mask(self, now: datetime.datetime = None) -> np.ndarray:
+        """
+        Get a mask of overdue tasks: Past Due ones and in progress ones, which due_date is before now.
+
+        Args:
+            now (datetime.datetime, optional): Current time. Defaults to datetime.now().
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        now = to_epoch(now if now else datetime.datetime.now())
+        expired = (self.due_date != self.no_due_date) & (self.due_date < now)
+        return self.status_mask(TaskStatus.PAST_DUE) | (self.status_mask(TaskStatus.IN_PROGRESS) & expired)
+
+    def penalty_mask(self, now: datetime.datetime = None) -> np.ndarray:
+        """
+        Get a mask of tasks, which reward has the due_date penalty (same rule as `Task.complete_task`): tasks completed
+        after due_date, Past Due ones and not completed ones, which due_date is before now.
+
+        Args:
+            now (datetime.datetime, optional): Current time. Defaults to datetime.now().
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        now = to_epoch(now if now else datetime.datetime.now())
+        expired = (self.due_date != self.no_due_date) & (self.due_date < now)
+        completed = self.status_mask(TaskStatus.COMPLETED, TaskStatus.COMPLETED_AFTER_DUE_DATE)
+        return self.status_mask(TaskStatus.COMPLETED_AFTER_DUE_DATE, TaskStatus.PAST_DUE) | (~completed & expired)
+
+    def rewards(self, now: datetime.datetime = None) -> np.ndarray:
+        """
+        Calculate completion rewards for all tasks: the reward of completed tasks, and the reward of other tasks
+        as if they were completed now.
+
+        Args:
+            now (datetime.datetime, optional): Completion time. Defaults to datetime.now().
+
+        Returns:
+            np.ndarray: Exp rewards (int64).
+        """
+        return calculate_rewards(self.base_exp_reward, self.difficulty_modifier, self.time_modifier, self.due_date_penalty, self.penalty_mask(now))
+
+    def group_by(self, values, by: str = 'profile_id', how: str = 'sum') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aggregate values by groups of a column.
+
+        Args:
+            values (array-like): A value for every row (e.g. a mask or rewards).
+            by (str, optional): Name of the column to group by. Defaults to 'profile_id'.
+            how (str, optional): Aggregation: 'sum', 'mean' or 'count'. Defaults to 'sum'.
+
+        Returns:
+            tuple (np.ndarray): Sorted group keys and aggregated values (keys, values).
+
+        Raises:
+            ValueError: If aggregation is unknown.
+        """
+        keys, inverse = np.unique(getattr(self, by), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(keys))
+        if how == 'count':
+            return keys, counts
+        sums = np.bincount(inverse, weights=np.asarray(values, dtype=np.float64), minlength=len(keys))
+        if how == 'sum':
+            return keys, sums
+        if how == 'mean':
+            return keys, sums / counts
+        raise ValueError(f"Unknown aggregation: {how}! Use 'sum', 'mean' or 'count'.")
+
+    def completion_rate(self, by: str = 'profile_id') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the share of completed tasks (on time or after due_date) per group.
+
+        Args:
+            by (str, optional): Name of the column to group by. Defaults to 'profile_id'.
+
+        Returns:
+            tuple (np.ndarray): Group keys and completion rates (keys, rates).
+        """
+        return self.group_by(self.status_mask(TaskStatus.COMPLETED, TaskStatus.COMPLETED_AFTER_DUE_DATE), by, 'mean')
+
+    def overdue_ratio(self, now: datetime.datetime = None, by: str = 'profile_id') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the share of overdue tasks per group.
+
+        Args:
+            now (datetime.datetime, optional): Current time. Defaults to datetime.now().
+            by (str, optional): Name of the column to group by. Defaults to 'profile_id'.
+
+        Returns:
+            tuple (np.ndarray): Group keys and overdue ratios (keys, ratios).
+        """
+        return self.group_by(self.overdue_mask(now), by, 'mean')
+
+    def mean_reward(self, now: datetime.datetime = None, by: str = 'profile_id') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the average completion reward per group.
+
+        Args:
+            now (datetime.datetime, optional): Completion time. Defaults to datetime.now().
+            by (str, optional): Name of the column to group by. Defaults to 'profile_id'.
+
+        Returns:
+            tuple (np.ndarray): Group keys and average rewards (keys, rewards).
+        """
+        return self.group_by(self.rewards(now), by, 'mean')
+
+    def __len__(self) -> int:
+        """
+        Get the number of tasks in the table.
+
+        Returns:
+            int: The number of tasks.
+        """
+        return len(self.status)
+
+
+def to_epoch(value: datetime.datetime) -> int:
+    """
+    Convert a datetime to microseconds since 1970-01-01 (timezone is not converted).
+
+    Args:
+        value (datetime.datetime): The datetime to convert, None for no date.
+
+    Returns:
+        int: Microseconds since epoch, `TaskTable.no_due_date` for None.
+    """
+    if value is None:
+        return TaskTable.no_due_date
+    return (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+
+def from_epoch(value: int) -> datetime.datetime:
+    """
+    Convert microseconds since 1970-01-01 back to a datetime.
+
+    Args:
+        value (int): Microseconds since epoch.
+
+    Returns:
+        datetime.datetime: The datetime, None for `TaskTable.no_due_date`.
+    """
+    if value == TaskTable.no_due_date:
+        return None
+    return _EPOCH + value * _MICROSECOND
@@ -0,0 +1,496 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from weakref import WeakValueDictionary
+
+_BINARY_MAGIC = b'QMTC'
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct('<4sHHHxx')  # magic, version, min_level, max_level
+
+
+class TipCatalog:
+    """
+    An immutable set of tips for levels in min_level..max_level. Catalogs are interned: creating a catalog with the same
+    levels and tips returns the same object, so all users of a Stat share one copy of the tip text.
+    Catalogs can also be created from a stat_tips JSON document (`from_json`) or a compiled catalog file (`load`),
+    these keep the source and parse tips of a level when the level is first used.
+
+    Args:
+        tips (Optional[Dict[int, List[str]]]): Dictionary containing tips for specific levels. Tips for levels outside the bounds are ignored. Default is None.
+        min_level (int): Minimum level bound (inclusive). Default is 0.
+        max_level (int): Maximum level bound (inclusive). Default is 30.
+
+    Attributes:
+        level_bounds (Tuple[int, int]): Allowed range of min_level and max_level.
+        search_depth (int): How many lower levels are searched for tips, if a level has none.
+    """
+    __slots__ = ('_min_level', '_max_level', '_levels', '_tip_levels', '__weakref__')
+
+    level_bounds = (0, 100)
+    search_depth = 2  # levels up to search_depth only search themselves
+
+    _registry = WeakValueDictionary()  # process-wide registry of catalogs in use
+    _registry_lock = threading.Lock()
+
+    def __new__(cls, tips: Optional[Dict[int, List[str]]]=None, min_level:int=0, max_level:int=30):
+        """
+        Get the catalog with provided tips, creating it if no StatTips uses it yet.
+
+        Args:
+            tips (Optional[Dict[int, List[str]]]): Dictionary containing tips for specific levels. Default is None.
+            min_level (int): Minimum level bound (inclusive). Default is 0.
+            max_level (int): Maximum level bound (inclusive). Default is 30.
+
+        Returns:
+            TipCatalog: The shared catalog object.
+
+        Raises:
+            ValueError: if min_level or max_level is outside the bounds, if max_level is smaller than min_level
+        """
+        cls.__check_bounds(min_level, max_level)
+        return cls.__intern_levels(min_level, max_level, _parsed_levels(tips, min_level, max_level))
+
+    @classmethod
+    def from_json(cls, document:Optional[str], min_level:int=0, max_level:int=30) -> 'TipCatalog':
+        """
+        Get the catalog of a stat_tips JSON document (`{"level": [tips]}`, as stored in the tips column).
+        The document is kept and only scanned for level entries, tips of a level are parsed when it is first used.
+        Documents of other shape are parsed right away.
+
+        Args:
+            document (Optional[str]): The JSON document. None or "null" means no tips.
+            min_level (int): Minimum level bound (inclusive). Default is 0.
+            max_level (int): Maximum level bound (inclusive). Default is 30.
+
+        Returns:
+            TipCatalog: The shared catalog object.
+
+        Raises:
+            ValueError: if min_level or max_level is outside the bounds, if max_level is smaller than min_level
+        """
+        cls.__check_bounds(min_level, max_level)
+
+        def build():
+            spans = _scan_json_levels(document or 'null', min_level, max_level)
+            if spans is None:
+                tips = json.loads(document or 'null') or {}
+                levels = _parsed_levels({int(level): tip_list for level, tip_list in tips.items()}, min_level, max_level)
+                return levels, [bool(tip_list) for tip_list in levels]
+
+            def parse(offset):
+                span = spans[offset]
+                return tuple(json.loads(document[span[0]:span[1]])) if span else ()
+            return _LazyLevels(parse, len(spans)), [bool(span) for span in spans]
+
+        return cls.__intern(('json', min_level, max_level, document), min_level, max_level, build)
+
+    @classmethod
+    def load(cls, path:str) -> 'TipCatalog':
+        """
+        Get the catalog of a compiled catalog file (see `dump`). The file is memory-mapped read-only, so worker
+        processes share its pages, and tips of a level are decoded when it is first used.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            TipCatalog: The shared catalog object.
+
+        Raises:
+            ValueError: If the file is not a compiled catalog.
+        """
+        with open(path, 'rb') as file:
+            file_stat = os.fstat(file.fileno())
+            key = ('file', os.path.realpath(path), file_stat.st_mtime_ns, file_stat.st_size)
+            catalog = cls._registry.get(key)
+            if catalog is not None:
+                return catalog
+            if file_stat.st_size < _BINARY_HEADER.size:
+                raise ValueError(f'{path} is not a compiled tip catalog!')
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, min_level, max_level = _BINARY_HEADER.unpack_from(buffer)
+        if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+            raise ValueError(f'{path} is not a compiled tip catalog (version {_BINARY_VERSION})!')
+        cls.__check_bounds(min_level, max_level)
+
+        def build():
+            level_count = max_level - min_level + 1
+            first_tips = struct.unpack_from(f'<{level_count + 1}I', buffer, _BINARY_HEADER.size)
+            offsets_start = _BINARY_HEADER.size + 4 * (level_count + 1)
+            data_start = offsets_start + 4 * (first_tips[-1] + 1)
+
+            def parse(offset):
+                first, last = first_tips[offset], first_tips[offset + 1]
+                offsets = struct.unpack_from(f'<{last - first + 1}I', buffer, offsets_start + 4 * first)
+                return tuple(str(buffer[data_start + start:data_start + end], 'utf-8') for start, end in zip(offsets, offsets[1:]))
+            return _LazyLevels(parse, level_count), [first < last for first, last in zip(first_tips, first_tips[1:])]
+
+        return cls.__intern(key, min_level, max_level, build)
+
+    def dump(self, path:str) -> None:
+        """
+        Write the catalog to a compiled catalog file, that can be loaded with `load`. The file is replaced atomically,
+        so processes, that mapped the old file, keep reading it.
+
+        Layout (little-endian): header (magic, version, min_level, max_level), index of the first tip of every level
+        (plus the total), end offset of every tip in the data (plus 0 at the start), UTF-8 data of the tips.
+
+        Args:
+            path (str): Path of the file.
+        """
+        tips = [tip.encode('utf-8') for tip_list in self._levels for tip in tip_list]
+        first_tips = [0]
+        for tip_list in self._levels:
+            first_tips.append(first_tips[-1] + len(tip_list))
+        offsets = [0]
+        for tip in tips:
+            offsets.append(offsets[-1] + len(tip))
+
+        tmp_path = f'{path}.tmp{os.getpid()}'
+        with open(tmp_path, 'wb') as file:
+            file.write(_BINARY_HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, self.min_level, self.max_level))
+            file.write(struct.pack(f'<{len(first_tips)}I', *first_tips))
+            file.write(struct.pack(f'<{len(offsets)}I', *offsets))
+            file.write(b''.join(tips))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def __check_bounds(cls, min_level:int, max_level:int) -> None:
+        """
+        Check the level bounds of a catalog.
+
+        Args:
+            min_level (int): Minimum level bound (inclusive).
+            max_level (int): Maximum level bound (inclusive).
+
+        Raises:
+            ValueError: if min_level or max_level is outside the bounds, if max_level is smaller than min_level
+        """
+        level_bounds = cls.level_bounds
+        if min_level<level_bounds[0] or min_level>level_bounds[1]:
+            raise ValueError(f"Minimum level is outside the bounds({level_bounds[0]}-{level_bounds[1]})! Your value: {min_level}.")
+        if max_level<level_bounds[0] or max_level>level_bounds[1]:
+            raise ValueError(f"Max level is outside the bounds({level_bounds[0]}-{level_bounds[1]})! Your value: {max_level}.")
+        if max_level<min_level:
+            raise ValueError(f'Max_level cannot be smaller than min_level!')
+
+    @classmethod
+    def __intern_levels(cls, min_level:int, max_level:int, levels:Tuple[Tuple[str, ...], ...]) -> 'TipCatalog':
+        """
+        Get the catalog with provided parsed levels from the registry, registering it if it is not there.
+
+        Args:
+            min_level (int): Minimum level bound.
+            max_level (int): Maximum level bound.
+            levels (Tuple[Tuple[str, ...], ...]): Tips of every level in min_level..max_level.
+
+        Returns:
+            TipCatalog: The shared catalog object.
+        """
+        return cls.__intern((min_level, max_level, levels), min_level, max_level, lambda: (levels, [bool(tip_list) for tip_list in levels]))
+
+    @classmethod
+    def __intern(cls, key:tuple, min_level:int, max_level:int, build:Callable[[], tuple]) -> 'TipCatalog':
+        """
+        Get the catalog with provided key from the registry, registering it if it is not there.
+
+        Args:
+            key (tuple): Registry key of the catalog.
+            min_level (int): Minimum level bound.
+            max_level (int): Maximum level bound.
+            build (Callable[[], tuple]): Function, that returns tips of every level in min_level..max_level
+                and whether every level has tips. Called only if the catalog is not registered.
+
+        Returns:
+            TipCatalog: The shared catalog object.
+        """
+        catalog = cls._registry.get(key)
+        if catalog is not None:
+            return catalog
+        with cls._registry_lock:
+            catalog = cls._registry.get(key)
+            if catalog is None:
+                levels, non_empty = build()
+                catalog = super().__new__(cls)
+                catalog._min_level = min_level
+                catalog._max_level = max_level
+                catalog._levels = levels
+                catalog._tip_levels = catalog.__nearest_tip_levels(non_empty)
+                cls._registry[key] = catalog
+        return catalog
+
+    @property
+    def min_level(self) -> int:
+        """
+        Get the minimum level bound.
+
+        Returns:
+            int: The minimum level bound.
+        """
+        return self._min_level
+
+    @property
+    def max_level(self) -> int:
+        """
+        Get the maximum level bound.
+
+        Returns:
+            int: The maximum level bound.
+        """
+        return self._max_level
+
+    @property
+    def level_count(self) -> int:
+        """
+        Get the number of levels in min_level..max_level.
+
+        Returns:
+            int: The number of levels.
+        """
+        return len(self._levels)
+
+    def tips_for_level(self, level:int) -> Tuple[str, ...]:
+        """
+        Get tips of the level.
+
+        Args:
+            level (int): The level, must be within the bounds.
+
+        Returns:
+            Tuple[str, ...]: Tips of the level, empty if there are none.
+
+        Raises:
+            ValueError: If the provided level is outside the level bounds.
+        """
+        if level < self.min_level or level > self.max_level:
+            raise ValueError(f'Level({level}) exceeds level bounds({self.min_level}, {self.max_level})')
+        return self._levels[level - self.min_level]
+
+    def nearest_tip_level(self, level:int) -> Optional[int]:
+        """
+        Get the level, whose tips are shown for the level: the level itself or the nearest lower one with tips,
+        at most search_depth levels lower.
+
+        Args:
+            level (int): The level, must be within the bounds.
+
+        Returns:
+            Optional[int]: The level with tips, None if there is none.
+
+        Raises:
+            ValueError: If the provided level is outside the level bounds.
+        """
+        if level < self._min_level or level > self._max_level:
+            raise ValueError(f'Level({level}) exceeds level bounds({self._min_level}, {self._max_level})')
+        return self._tip_levels[level - self._min_level]
+
+    @property
+    def nearest_tip_levels(self) -> Tuple[Optional[int], ...]:
+        """
+        Get `nearest_tip_level` of every level in min_level..max_level.
+
+        Returns:
+            Tuple[Optional[int], ...]: The level with tips (or None) for every level.
+        """
+        return self._tip_levels
+
+    def __nearest_tip_levels(self, non_empty:Sequence[bool]) -> Tuple[Optional[int], ...]:
+        """
+        Precompute `nearest_tip_level` for every level in min_level..max_level.
+
+        Args:
+            non_empty (Sequence[bool]): Whether every level in min_level..max_level has tips.
+
+        Returns:
+            Tuple[Optional[int], ...]: The level with tips (or None) for every level.
+        """
+        res = []
+        for level in range(self._min_level, self._max_level + 1):
+            depth = self.search_depth if level - self.search_depth > 0 else 0
+            lowest = max(level - depth, self._min_level)
+            res.append(next((tip_level for tip_level in range(level, lowest - 1, -1) if non_empty[tip_level - self._min_level]), None))
+        return tuple(res)
+
+    def extend(self, tips:Dict[int, List[str]]) -> 'TipCatalog':
+        """
+        Get the catalog with tips appended to the tips of this one. Tips for levels outside the bounds are ignored.
+
+        Args:
+            tips (Dict[int, List[str]]): Dictionary containing tips for specific levels.
+
+        Returns:
+            TipCatalog: The shared catalog object with appended tips.
+        """
+        levels = list(self._levels)
+        for level, tip_list in tips.items():
+            if level < self.min_level or level > self.max_level:
+                continue
+            levels[level - self.min_level] += tuple(tip_list)
+        return TipCatalog.__intern_levels(self.min_level, self.max_level, tuple(levels))
+
+    def to_dict(self) -> Dict[int, List[str]]:
+        """
+        Get a copy of the tips as a dictionary.
+
+        Returns:
+            dict: A dictionary containing tips for each level. Structure is Dict[level, List[tip]]
+        """
+        return {level: list(tip_list) for level, tip_list in zip(range(self.min_level, self.max_level + 1), self._levels)}
+
+    def __reduce__(self):
+        """
+        Pickle the catalog by its tips, so unpickled catalogs are interned as well.
+        """
+        return (TipCatalog, (self.to_dict(), self.min_level, self.max_level))
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the TipCatalog object that can be used to recreate the object.
+
+        Returns:
+            str: A string representation of the TipCatalog object.
+        """
+        return f'TipCatalog(tips={self.to_dict()}, min_level={self.min_level}, max_level={self.max_level})'
+
+
+class _LazyLevels:
+    """
+    Tips of every level of a catalog, that are parsed from the source of the catalog when the level is first used.
+
+    Args:
+        parse (Callable[[int], Tuple[str, ...]]): Function, that parses tips of the level with provided offset from min_level.
+        level_count (int): The number of levels.
+    """
+    __slots__ = ('_parse', '_parsed')
+
+    def __init__(self, parse:Callable[[int], Tuple[str, ...]], level_count:int) -> None:
+        """
+        Initialize levels, that are not parsed yet.
+
+        Args:
+            parse (Callable[[int], Tuple[str, ...]]): Function, that parses tips of the level with provided offset from min_level.
+            level_count (int): The number of levels.
+        """
+        self._parse = parse
+        self._parsed = [None] * level_count
+
+    def __getitem__(self, offset:int) -> Tuple[str, ...]:
+        """
+        Get tips of the level, parsing them if the level was not used yet.
+
+        Args:
+            offset (int): Offset of the level from min_level.
+
+        Returns:
+            Tuple[str, ...]: Tips of the level.
+        """
+        tips = self._parsed[offset]
+        if tips is None:
+            tips = self._parsed[offset] = self._parse(offset)  # parsing twice from two threads gives equal tuples
+        return tips
+
+    def __len__(self) -> int:
+        """
+        Get the number of levels.
+
+        Returns:
+            int: The number of levels.
+        """
+        return len(self._parsed)
+
+    def __iter__(self):
+        """
+        Iterate over tips of every level, parsing all of them.
+        """
+        return (self[offset] for offset in range(len(self._parsed)))
+
+
+def _parsed_levels(tips:Optional[Dict[int, List[str]]], min_level:int, max_level:int) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Convert a tips dictionary to tips of every level in min_level..max_level. Tips for levels outside the bounds are ignored.
+
+    Args:
+        tips (Optional[Dict[int, List[str]]]): Dictionary containing tips for specific levels.
+        min_level (int): Minimum level bound (inclusive).
+        max_level (int): Maximum level bound (inclusive).
+
+    Returns:
+        Tuple[Tuple[str, ...], ...]: Tips of every level.
+    """
+    levels = [[] for _ in range(max_level - min_level + 1)]
+    for level, tip_list in (tips or {}).items():
+        if level < min_level or level > max_level:
+            continue
+        levels[level - min_level] += tip_list
+    return tuple(tuple(tip_list) for tip_list in levels)
+
+
+def _scan_json_levels(document:str, min_level:int, max_level:int) -> Optional[List[Optional[Tuple[int, int]]]]:
+    """
+    Find the JSON array of every level in a stat_tips JSON document without parsing the tips. Entries are found by
+    the '": [' separator, that json.dumps writes. Quotes inside JSON strings are escaped, so in a valid document
+    only separators of entries are preceded by a quoted level number.
+
+    Args:
+        document (str): The JSON document, must be valid JSON.
+        min_level (int): Minimum level bound (inclusive).
+        max_level (int): Maximum level bound (inclusive).
+
+    Returns:
+        Optional[list]: (start, end) of the array of every level in min_level..max_level, None for levels without tips.
+            None if the document is not an object of arrays written this way.
+    """
+    spans = [None] * (max_level - min_level + 1)
+    first, last = _skip_space(document, 0, 1), _skip_space(document, len(document) - 1, -1)
+    if first > last or document[first] != '{' or document[last] != '}':
+        return None
+
+    keys = []  # (level, start of the array, end of the previous array)
+    pos = document.find('": [', first)
+    while pos >= 0:
+        digits_start = pos
+        while document[digits_start - 1].isdigit():
+            digits_start -= 1
+        if digits_start < pos and document[digits_start - 1] == '"':
+            before = _skip_space(document, digits_start - 2, -1)
+            if document[before] == ',':
+                previous_end = _skip_space(document, before - 1, -1)
+                if document[previous_end] != ']':
+                    return None
+            elif before == first and not keys:
+                previous_end = None
+            else:
+                return None
+            keys.append((int(document[digits_start:pos]), pos + 3, previous_end))
+        pos = document.find('": [', pos + 4)
+
+    if not keys:
+        return spans if _skip_space(document, first + 1, 1) == last else None
+    end = _skip_space(document, last - 1, -1)
+    if keys[0][2] is not None or document[end] != ']':
+        return None
+    for (level, array_start, _), array_end in zip(keys, [key[2] for key in keys[1:]] + [end]):
+        if min_level <= level <= max_level:
+            spans[level - min_level] = (array_start, array_end + 1) if _skip_space(document, array_start + 1, 1) < array_end else None
+    return spans
+
+
+def _skip_space(document:str, pos:int, step:int) -> int:
+    """
+    Skip JSON whitespace.
+
+    Args:
+        document (str): The JSON document.
+        pos (int): Position to start from.
+        step (int): 1 to skip forward, -1 to skip backward.
+
+    Returns:
+        int: Position of the first character, that is not whitespace (may be outside the document).
+    """
+    while 0 <= pos < len(document) and document[pos] in ' \t\r\n':
+        pos += step
+    return pos
@@ -1,7 +1,8 @@
-from typing import List, Dict
+from typing import Iterable, Dict
 
 from backend.user_classes.stat import Stat
 from backend.user_classes.task import Task
+from backend.user_classes.task_collection import TaskCollection
 
 #TODO: test
 class UserProfile:
@@ -10,23 +11,23 @@ class UserProfile:
 
     Args:
         stat_exp (Dict[Stat, int]): A dictionary mapping Stat objects to user corresponding experience values.
-        tasks (List[Task]): A list of Task objects.
+        tasks (Iterable[Task]): Task objects of the user.
 
     Attributes:
         stat_exp (dict): A dictionary mapping Stat objects to user corresponding experience values.
-        tasks (list): A list of Task objects.
+        tasks (TaskCollection): An ordered collection of unique Task objects.
     """
 
-    def __init__(self, stat_exp: Dict[Stat, int], tasks: List[Task]) -> None:
+    def __init__(self, stat_exp: Dict[Stat, int], tasks: Iterable[Task]) -> None:
         """
         Initialize a Profile instance with provided stat experience and tasks.
 
         Args:
             stat_exp (Dict[Stat, int]): A dictionary mapping Stat objects to user corresponding experience values.
-            tasks (List[Task]): A list of Task objects.
+            tasks (Iterable[Task]): Task objects of the user.
         """
         self._stat_exp = {}
-        self._tasks = []
+        self._tasks = TaskCollection()
 
         self.stat_exp = stat_exp
         self.tasks = tasks
@@ -50,43 +51,54 @@ class UserProfile:
             value (Dict[Stat, int]): A dictionary mapping Stat objects to user corresponding experience values.
 
         Raises:
-            ValueError: If the provided experience is outside the valid bounds.
+            ValueError: If the provided experience is outside the valid bounds. Nothing is changed in this case.
         """
         exp_bounds = (0, 999999999)
         for stat, exp in value.items():
             if exp < exp_bounds[0] or exp > exp_bounds[1]:
                 raise ValueError(f"Experience for stat \'{stat.display_name}\' is outside the exp_bounds({exp_bounds}, {exp_bounds[1]})! Your value: {exp}")
             # TODO: probably add check for is stat a placeholder
-            self._stat_exp[stat] = exp
+        self._stat_exp.update(value)
+
+    def add_stat_exp(self, deltas: Dict[Stat, int]) -> Dict[Stat, int]:
+        """
+        Add experience to several stats in one step. Stats, missing in stat_exp, start from 0.
+
+        Args:
+            deltas (Dict[Stat, int]): A dictionary mapping Stat objects to experience, that should be added.
+
+        Returns:
+            dict: A dictionary mapping changed Stat objects to their new experience values.
+
+        Raises:
+            ValueError: If any resulting experience is outside the valid bounds. Nothing is changed in this case.
+        """
+        new_exp = {stat: self._stat_exp.get(stat, 0) + delta for stat, delta in deltas.items()}
+        self.stat_exp = new_exp
+        return new_exp
     
     @property
-    def tasks(self) -> List[Task]:
+    def tasks(self) -> TaskCollection:
         """
-        Get the list of Task objects.
+        Get the collection of Task objects.
 
         Returns:
-            list: A list of Task objects.
+            TaskCollection: An ordered collection of unique Task objects.
         """
         return self._tasks
 
     @tasks.setter
-    def tasks(self, value: List[Task]):
+    def tasks(self, value: Iterable[Task]):
         """
-        Add values to the list of Task objects.
+        Add values to the collection of Task objects.
 
         Args:
-            value (List[Task]): A list of Task objects.
+            value (Iterable[Task]): Task objects to add.
 
         Notes:
-            This works like appending tasks to the existing list.
-
-        Raises:
-            ValueError: If the task is already in the tasks list.
+            This works like appending tasks to the existing collection. Tasks, that are already in the collection, are skipped.
         """
-        if not self._tasks:
-            self._tasks = []
-        value = [v for v in value if v not in self._tasks]
-        self._tasks += value
+        self._tasks.extend(value)
 
     def remove_stat_exp(self, stat: Stat):
         """
@@ -104,12 +116,12 @@ class UserProfile:
 
     def remove_task(self, task: Task):
         """
-        Remove the provided task from the tasks list.
+        Remove the provided task from the tasks collection.
 
         Args:
             task (Task): The Task object to be removed.
 
         Raises:
-            ValueError: If the task is not in the tasks list.
+            ValueError: If the task is not in the tasks collection.
         """
         self._tasks.remove(task)